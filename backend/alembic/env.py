@@ -8,7 +8,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import Base
-from app.models import Company, Filing
+from app import models  # noqa: F401 — registers every table on Base.metadata
 from app.config import get_settings
 
 config = context.config
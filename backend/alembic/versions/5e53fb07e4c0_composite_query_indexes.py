@@ -0,0 +1,46 @@
+"""composite indexes for timeline, sync and exec comp queries
+
+Revision ID: 5e53fb07e4c0
+Revises:
+Create Date: 2026-10-19 00:00:00.000000
+
+Tables are created with Base.metadata.create_all at startup, which creates
+indexes only for tables it creates. This adds the indexes to databases whose
+tables already existed; every index is guarded so it is a no-op where
+create_all already made it. On PostgreSQL the indexes are built
+CONCURRENTLY so writes are not blocked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e53fb07e4c0"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_filings_company_filed_date", "filings", ["company_id", sa.text("filed_date DESC")]),
+    ("ix_filings_company_form_filed_date", "filings", ["company_id", "form_type", "filed_date"]),
+    ("ix_press_releases_company_published_at", "press_releases", ["company_id", sa.text("published_at DESC")]),
+    ("ix_executive_compensation_company_year", "executive_compensation", ["company_id", "fiscal_year"]),
+    ("ix_interest_log_searched_at", "interest_log", ["searched_at"]),
+]
+
+
+def upgrade() -> None:
+    postgres = op.get_context().dialect.name == "postgresql"
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=postgres)
+
+
+def downgrade() -> None:
+    postgres = op.get_context().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=postgres)
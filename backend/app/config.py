@@ -21,6 +21,60 @@ class Settings(BaseSettings):
     # Finnhub
     finnhub_api_key: str = ""
 
+    # Sync pipeline: workers per stage and upstream request budgets
+    sync_discover_concurrency: int = 4
+    sync_fetch_concurrency: int = 4
+    sync_clean_concurrency: int = 2
+    sync_summarize_concurrency: int = 1
+    sec_requests_per_second: float = 8.0  # SEC allows 10 req/sec
+    groq_seconds_per_request: float = 22.0  # Groq free tier TPM limit
+    finnhub_requests_per_minute: int = 60  # Finnhub free tier
+    finnhub_concurrency: int = 8
+
+    # Distributed sync: replicas lease batches of companies from the running sync
+    sync_poll_seconds: int = 15
+    sync_batch_companies: int = 5
+    sync_lease_seconds: int = 900
+    sync_max_attempts: int = 3
+
+    # Tiered scheduling: how often due companies are checked, and how many
+    # company syncs (EDGAR + Finnhub requests, summaries) may start per hour
+    sync_schedule_minutes: int = 5
+    sync_budget_per_hour: int = 300
+
+    # Summary queue: background workers that generate filing headlines
+    summary_workers: int = 2
+    summary_max_attempts: int = 5
+    summary_lease_seconds: int = 900
+    summary_backoff_seconds: int = 60  # doubles after each failed attempt
+
+    # Exec comp extraction: a DEF 14A whose extraction failed is retried on
+    # later syncs, backing off from exec_comp_backoff_hours, up to this many times
+    exec_comp_max_attempts: int = 3
+    exec_comp_backoff_hours: int = 6
+
+    # Response cache for read endpoints; other replicas' changes are seen
+    # within response_cache_poll_seconds
+    response_cache_entries: int = 2000
+    response_cache_poll_seconds: float = 5.0
+
+    # Response compression (gzip, or brotli when installed); smaller bodies are sent as-is
+    compression_min_bytes: int = 1024
+
+    # Cleaned filing text kept for full-text search, per filing (0 keeps none)
+    search_text_chars: int = 20000
+    # Relevance ranks at most this many of the newest matches per query
+    search_rank_candidates: int = 5000
+
+    # Daily candles are stored in price_candles and cached in memory per ticker
+    # (price_cache_entries tickers, ~60 KB each for 5y). They are refreshed every
+    # price_ttl_open_seconds while the market is open, otherwise kept until the
+    # next session; failed refreshes keep serving the stored candles and retry
+    # after price_error_retry_seconds
+    price_cache_entries: int = 1000
+    price_ttl_open_seconds: int = 300
+    price_error_retry_seconds: int = 60
+
     # CORS
     allowed_origins: str = "http://localhost:5173,http://localhost:3000,https://*.vercel.app,https://tickerclaw.com,https://www.tickerclaw.com"
 
@@ -0,0 +1,124 @@
+"""Time /api/filings/search queries against a large synthetic corpus.
+
+Fills search_documents in a throwaway SQLite database (or `--database-url`,
+e.g. a scratch PostgreSQL database) with N documents drawn from a Zipf-like
+vocabulary, so there are both very common and rare words, then times
+search_page for each query shape and reports the median and worst latency:
+
+    python -m app.devtools.bench_search
+    python -m app.devtools.bench_search --docs 1000000 --repeat 20
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+WORDS = [f"w{i}" for i in range(20000)]
+# Real words mixed in so the query shapes read naturally
+COMMON = ["revenue", "guidance", "quarter", "dividend", "shares"]
+RARE = ["spinoff", "restatement", "delisting"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--companies", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--database-url", help="Scratch database to fill (default: a temporary SQLite file)")
+    return parser.parse_args(argv)
+
+
+def text(rng: random.Random, n: int) -> str:
+    words = [WORDS[min(int(rng.paretovariate(1.1)), len(WORDS) - 1)] for _ in range(n)]
+    words += rng.sample(COMMON, 2)
+    if rng.random() < 0.001:
+        words.append(rng.choice(RARE))
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def seed(docs: int, companies: int) -> None:
+    from app.database import session_scope
+    from app.models import Company, SearchDocument
+    from app.services.search import sort_key
+
+    rng = random.Random(42)
+    with session_scope() as db:
+        db.bulk_insert_mappings(Company, [
+            {"id": i + 1, "ticker": f"C{i:03d}", "name": f"Company {i}", "cik": str(i)} for i in range(companies)
+        ])
+    batch = 10_000
+    for start in range(0, docs, batch):
+        with session_scope() as db:
+            db.bulk_insert_mappings(SearchDocument, [
+                {
+                    "id": sort_key(date(2015, 1, 1) + timedelta(days=i % 3650), "filing", i),
+                    "event_type": "filing",
+                    "source_id": i,
+                    "company_id": i % companies + 1,
+                    "ticker": f"C{i % companies:03d}",
+                    "company_name": f"Company {i % companies}",
+                    "form_type": ("8-K", "10-Q", "10-K", "4")[i % 4],
+                    "form_type_description": "Filing",
+                    "event_date": date(2015, 1, 1) + timedelta(days=i % 3650),
+                    "headline": text(rng, 15),
+                    "document_url": f"https://example.com/{i}",
+                    "summary": text(rng, 60),
+                    "body": None,
+                }
+                for i in range(start, min(start + batch, docs))
+            ])
+        print(f"  seeded {min(start + batch, docs)}/{docs}", end="\r", flush=True)
+    print()
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        path = Path(tempfile.mkdtemp()) / "bench_search.db"
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+    from app import models  # noqa: F401 — registers the tables
+    from app.database import Base, engine, session_scope
+    from app.services.search import SORT_DATE, SORT_RELEVANCE, search_page
+    from app.services.timeline import TimelineFilters
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    seed(args.docs, args.companies)
+    print(f"Seeded {args.docs} documents in {time.perf_counter() - started:.1f}s")
+
+    shapes = [
+        ("common word, relevance", "revenue", TimelineFilters(), SORT_RELEVANCE),
+        ("common word, newest first", "revenue", TimelineFilters(), SORT_DATE),
+        ("two common words, relevance", "revenue guidance", TimelineFilters(), SORT_RELEVANCE),
+        ("rare word, relevance", "restatement", TimelineFilters(), SORT_RELEVANCE),
+        ("common word, one ticker", "dividend", TimelineFilters(ticker="C007"), SORT_RELEVANCE),
+        ("common word, ticker + form", "dividend", TimelineFilters(ticker="C007", form_type="4"), SORT_DATE),
+        ("prefix", "restate*", TimelineFilters(), SORT_RELEVANCE),
+    ]
+    print(f"{'query':<32}{'results':>8}{'median ms':>11}{'max ms':>9}")
+    slow = False
+    for name, q, filters, sort in shapes:
+        timings = []
+        for _ in range(args.repeat):
+            with session_scope() as db:
+                t = time.perf_counter()
+                results, _ = search_page(db, q, filters, 20, sort)
+                timings.append((time.perf_counter() - t) * 1000)
+        median = statistics.median(timings)
+        slow |= median > 100
+        print(f"{name:<32}{len(results):>8}{median:>11.1f}{max(timings):>9.1f}")
+    return 1 if slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
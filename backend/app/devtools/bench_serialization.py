@@ -0,0 +1,221 @@
+"""Compare response serialization before and after the orjson fast path.
+
+"before" is what FastAPI does for a route with a response_model when the
+handler returns Pydantic objects: build the models, validate them again
+against response_model, dump to JSON-compatible Python and json.dumps.
+"after" encodes the plain dicts the handlers now build, with orjson.
+Prices start from a DataFrame "before" (the original iterrows loop) and
+from the stored NumPy columns "after", in both response shapes.
+Both must decode to the same JSON (columns transposed back into rows);
+the script fails otherwise.
+
+    python -m app.devtools.bench_serialization
+    python -m app.devtools.bench_serialization --rows 500 --repeat 200
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Optional
+from unittest import mock
+
+from pydantic import TypeAdapter
+
+from app.services.fast_json import dumps
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="Timeline events / arguments per response")
+    parser.add_argument("--candles", type=int, default=1260, help="Candles per price response (5y daily)")
+    parser.add_argument("--repeat", type=int, default=100)
+    return parser.parse_args(argv)
+
+
+def fastapi_render(model, content) -> bytes:
+    """FastAPI's response_model path: validate, serialize, JSONResponse.render."""
+    adapter = TypeAdapter(model)
+    value = adapter.validate_python(content, from_attributes=True)
+    return json.dumps(
+        adapter.dump_python(value, mode="json"),
+        ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def timeline_case(rows: int):
+    from app.routers.filings import timeline_response
+    from app.schemas import TimelineResponse
+    from app.schemas.filing import TimelineEvent
+
+    db_rows = [
+        SimpleNamespace(
+            id=i,
+            ticker="AAPL",
+            company_name="Apple Inc.",
+            form_type="8-K",
+            form_type_description="Current Report",
+            event_date=date(2025, 1, 1) - timedelta(days=i // 3),
+            headline="Apple reports quarterly results and announces a dividend increase",
+            document_url=f"https://www.sec.gov/Archives/edgar/data/320193/{i:018d}/doc.htm",
+            event_type="filing",
+        )
+        for i in range(rows)
+    ]
+
+    def before():
+        events = [
+            TimelineEvent(
+                id=r.id, ticker=r.ticker, company_name=r.company_name, form_type=r.form_type,
+                form_type_description=r.form_type_description, filed_date=r.event_date,
+                headline=r.headline, document_url=r.document_url, event_type=r.event_type,
+            )
+            for r in db_rows
+        ]
+        return fastapi_render(TimelineResponse, TimelineResponse(events=events, total=rows))
+
+    def after():
+        # The real timeline_response, fed the prepared rows instead of a query
+        with mock.patch("app.routers.filings.timeline_page", return_value=(db_rows, None)), \
+                mock.patch("app.routers.filings.timeline_total", return_value=(rows, True)):
+            return dumps(timeline_response(None, None, rows, None, "exact"))
+
+    return before, after
+
+
+def bear_vs_bull_case(rows: int):
+    from app.schemas import BearVsBullResponse
+
+    def item(i: int, stance: str, user_generated: bool) -> dict:
+        return {
+            "id": i,
+            "entry_type": "post" if user_generated else "argument",
+            "ticker": "TSLA",
+            "company_name": "Tesla, Inc.",
+            "stance": stance,
+            "source_type": "community" if user_generated else "reddit",
+            "source_name": "TickerClaw member" if user_generated else "Reddit",
+            "author_handle": f"member-{i}",
+            "title": "The bull case focuses on multiple growth drivers",
+            "summary": "Long theses usually highlight expanding addressable markets and improving fundamentals. " * 3,
+            "url": None,
+            "as_of_date": date(2026, 3, 1),
+            "confidence_score": None if user_generated else 0.75,
+            "vote_score": i % 7,
+            "upvotes": i % 11,
+            "downvotes": i % 4,
+            "has_voted": False,
+            "is_user_generated": user_generated,
+            "can_delete": False,
+        }
+
+    payload = {
+        "ticker": "TSLA",
+        "bull_arguments": [item(i, "bull", i % 3 == 0) for i in range(rows // 2)],
+        "bear_arguments": [item(i, "bear", i % 3 == 0) for i in range(rows // 2)],
+    }
+    return (lambda: fastapi_render(BearVsBullResponse, payload)), (lambda: dumps(payload))
+
+
+def exec_comp_case(rows: int):
+    from fastapi.encoders import jsonable_encoder
+
+    payload = [
+        {
+            "id": i, "ticker": "NVDA", "company_name": "NVIDIA Corporation",
+            "executive_name": f"Executive {i}", "position": "Chief Executive Officer",
+            "total_compensation": 34168699.0, "salary": 996514.0, "bonus": None,
+            "stock_awards": 26708687.0, "option_awards": None, "other_compensation": 32838.0,
+            "fiscal_year": 2025, "filed_date": "2025-05-12",
+            "document_url": "https://www.sec.gov/Archives/edgar/data/1045810/000104581025000101/def14a.htm",
+        }
+        for i in range(rows)
+    ]
+
+    def before():
+        # No response_model: jsonable_encoder then JSONResponse.render
+        return json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+        ).encode("utf-8")
+
+    return before, (lambda: dumps(payload))
+
+
+def prices_case(candles: int, shape: str):
+    import numpy as np
+    import pandas as pd
+
+    from app.routers.prices import Candle, PriceResponse
+    from app.services.candles import Candles
+
+    days = pd.bdate_range("2021-01-04", periods=candles, tz="America/New_York")
+    base = 100 + np.arange(candles) * 0.1003
+    hist = pd.DataFrame(
+        {"Open": base, "High": base + 1.0071, "Low": base - 0.9923, "Close": base + 0.5017,
+         "Volume": 1_000_000 + np.arange(candles)},
+        index=days,
+    )
+    # What price_candles hands back for the same history
+    stored = Candles.from_rows(zip(
+        days.date, hist["Open"], hist["High"], hist["Low"], hist["Close"], hist["Volume"],
+    ))
+
+    def before():
+        # The original handler: iterrows, a Candle per row, round per cell, response_model validation
+        models = [
+            Candle(date=d.strftime("%Y-%m-%d"), open=round(float(row["Open"]), 2), high=round(float(row["High"]), 2),
+                   low=round(float(row["Low"]), 2), close=round(float(row["Close"]), 2), volume=int(row["Volume"]))
+            for d, row in hist.iterrows()
+        ]
+        return fastapi_render(PriceResponse, PriceResponse(ticker="AAPL", candles=models))
+
+    if shape == "columns":
+        return before, (lambda: dumps({"ticker": "AAPL", **stored.columns()}))
+    return before, (lambda: dumps({"ticker": "AAPL", "candles": stored.rows()}))
+
+
+def rows_from_columns(payload: dict) -> dict:
+    """A format=columns price response reshaped into the default one, for comparison."""
+    fields = ("open", "high", "low", "close", "volume")
+    return {"ticker": payload["ticker"], "candles": [
+        {"date": d, **dict(zip(fields, values))}
+        for d, *values in zip(payload["dates"], *(payload[f] for f in fields))
+    ]}
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def main(argv=None) -> Optional[int]:
+    args = parse_args(argv)
+    cases = {
+        f"timeline ({args.rows} events)": timeline_case(args.rows),
+        f"bear vs bull ({args.rows} items)": bear_vs_bull_case(args.rows),
+        f"exec comp ({args.rows // 5} rows)": exec_comp_case(args.rows // 5),
+        f"prices ({args.candles} candles)": prices_case(args.candles, "rows"),
+        f"prices, columns ({args.candles})": prices_case(args.candles, "columns"),
+    }
+    # Responses whose fast path has a different shape, and how to compare them
+    reshape = {f"prices, columns ({args.candles})": rows_from_columns}
+
+    failed = False
+    print(f"{'response':<32}{'bytes':>9}{'before ms':>12}{'after ms':>11}{'speedup':>9}")
+    for name, (before, after) in cases.items():
+        old, new = before(), after()
+        if json.loads(old) != reshape.get(name, lambda payload: payload)(json.loads(new)):
+            print(f"{name}: fast path output differs from the response_model output", file=sys.stderr)
+            failed = True
+            continue
+        t_before, t_after = timed(before, args.repeat), timed(after, args.repeat)
+        print(f"{name:<32}{len(new):>9}{t_before * 1000:>12.3f}{t_after * 1000:>11.3f}{t_before / t_after:>8.1f}x")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""Benchmark the sync entry points against recorded upstream traffic.
+
+Record a cassette once (needs network, GROQ_API_KEY and FINNHUB_API_KEY):
+
+    python -m app.devtools.bench_sync record --cassette cassettes/sync.json.gz --tickers AAPL,MSFT,NVDA
+
+Replay it as often as needed, offline, optionally with injected faults:
+
+    python -m app.devtools.bench_sync replay --cassette cassettes/sync.json.gz \\
+        --latency-ms 80 --jitter-ms 40 --rate-limit-rate 0.05 --unthrottled
+
+Each run starts from an empty SQLite database and runs the entry points in
+order (later ones see what earlier ones stored). For each entry point it
+reports wall time, then per pipeline stage: items, busy seconds, upstream
+requests, bytes, LLM tokens, injected 429s and DB statements.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+ENTRY_POINTS = ("scheduled", "full", "filings", "news", "exec-comp", "summaries")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--cassette", type=Path, required=True)
+    parser.add_argument("--tickers", default="AAPL,MSFT,NVDA", help="Comma-separated tickers to track")
+    parser.add_argument(
+        "--entry",
+        action="append",
+        choices=ENTRY_POINTS,
+        help="Entry point to run; repeat for several (default: scheduled, summaries)",
+    )
+    parser.add_argument("--limit", type=int, default=20, help="Filings per company for filings/scheduled")
+    parser.add_argument("--database", type=Path, help="SQLite file to use (default: a temp file)")
+    parser.add_argument("--latency-ms", type=float, default=None, help="Replay latency; default is as recorded")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of replayed requests answered 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--unthrottled", action="store_true", help="Lift SEC/Finnhub/Groq client-side rate limits")
+    parser.add_argument("--json", type=Path, help="Also write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args) -> Path:
+    """Point the app at a fresh database; must run before any app module reads settings."""
+    database = args.database or Path(tempfile.mkdtemp(prefix="bench-sync-")) / "bench.db"
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{database}{suffix}").unlink(missing_ok=True)
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    if args.unthrottled:
+        os.environ["SEC_REQUESTS_PER_SECOND"] = "1000"
+        os.environ["FINNHUB_REQUESTS_PER_MINUTE"] = "60000"
+        os.environ["GROQ_SECONDS_PER_REQUEST"] = "0.001"
+    if args.mode == "replay":
+        # Keys are stripped from cassettes; services only need them to be set
+        os.environ.setdefault("GROQ_API_KEY", "replay")
+        os.environ.setdefault("FINNHUB_API_KEY", "replay")
+    return database
+
+
+class StatementCounter:
+    """Counts SQL statements per pipeline stage."""
+
+    def __init__(self, engine, current_stage):
+        from sqlalchemy import event
+
+        self.by_stage = defaultdict(int)
+        self._lock = threading.Lock()
+        self._current_stage = current_stage
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.by_stage[self._current_stage.get() or "-"] += 1
+
+
+async def seed_companies(tickers):
+    from app.database import session_scope
+    from app.models import Company
+    from app.services import TickerLookup
+
+    lookup = TickerLookup.get_instance()
+    with session_scope() as db:
+        for ticker in tickers:
+            info = await lookup.lookup(ticker)
+            if info is None:
+                print(f"Unknown ticker {ticker}, skipping", file=sys.stderr)
+                continue
+            db.add(Company(ticker=info.ticker, name=info.name, cik=info.cik))
+
+
+async def drain_summary_queue(poll_seconds: float = 0.2) -> None:
+    """Run the summary workers until no job is due (jobs backing off after a failure are left)."""
+    from datetime import datetime
+
+    from sqlalchemy import func
+
+    from app.database import session_scope
+    from app.models import SummaryJob
+    from app.services.summary_worker import SummaryWorkerPool
+
+    pool = SummaryWorkerPool()
+    pool.start()
+    try:
+        while True:
+            await asyncio.sleep(poll_seconds)
+            with session_scope() as db:
+                open_jobs = db.query(func.count(SummaryJob.id)).filter(
+                    SummaryJob.status.in_(["pending", "running"]),
+                    SummaryJob.next_run_at <= datetime.utcnow(),
+                ).scalar()
+            if not open_jobs and pool.running:
+                break
+    finally:
+        await pool.stop()
+
+
+async def run_scheduled() -> dict:
+    """One tiered scheduling round, worked through by a single in-process SyncWorker."""
+    from app.config import get_settings
+    from app.database import session_scope
+    from app.services.sync_runs import run_status, start_run
+    from app.services.sync_tiers import due_companies
+    from app.services.sync_worker import SyncWorker
+
+    with session_scope() as db:
+        due = due_companies(db, get_settings().sync_budget_per_hour)
+        start_run(db, "Scheduled sync", limit=20, incremental=True, company_ids=[p.company_id for p in due])
+    worker = SyncWorker()
+    while await worker._claim_and_sync():
+        pass
+    with session_scope() as db:
+        return run_status(db)
+
+
+async def run_entry(entry: str, args) -> dict:
+    from app.services.sync import (
+        extract_exec_comp,
+        load_companies,
+        new_sync_state,
+        sync_companies,
+        sync_filings,
+        sync_news,
+    )
+
+    companies = load_companies()
+    state = new_sync_state()
+    if entry == "scheduled":
+        state = await run_scheduled()
+    elif entry == "full":
+        await sync_companies(companies, state, limit=200, since_date=date.today() - timedelta(days=365))
+    elif entry == "filings":
+        await sync_filings(companies, state, limit=args.limit)
+    elif entry == "news":
+        await sync_news(companies, state)
+    elif entry == "exec-comp":
+        await extract_exec_comp(companies, {"extracted": 0, "skipped": 0, "errors": state["errors"]})
+    elif entry == "summaries":
+        await drain_summary_queue()
+    return state
+
+
+def stage_report(pipelines, traffic, statements) -> dict:
+    stages = {}
+    for pipeline in pipelines:
+        for name, s in pipeline.stats.items():
+            row = stages.setdefault(f"{pipeline.name}.{name}", {
+                "items": 0, "failed": 0, "busy_seconds": 0.0,
+            })
+            row["items"] += s.processed
+            row["failed"] += s.failed
+            row["busy_seconds"] = round(row["busy_seconds"] + s.busy_seconds, 3)
+    for name in set(traffic.by_stage) | set(statements):
+        row = stages.setdefault(name, {"items": 0, "failed": 0, "busy_seconds": 0.0})
+        t = traffic.by_stage.get(name)
+        row.update({
+            "requests": t.requests if t else 0,
+            "bytes": t.bytes if t else 0,
+            "tokens": t.tokens if t else 0,
+            "rate_limited": t.rate_limited if t else 0,
+            "cassette_misses": t.misses if t else 0,
+            "db_statements": statements.get(name, 0),
+        })
+    return stages
+
+
+def print_report(report: list) -> None:
+    columns = ("items", "failed", "busy_seconds", "requests", "bytes", "tokens", "rate_limited", "db_statements")
+    for entry in report:
+        print(f"\n== {entry['entry']}: {entry['wall_seconds']:.2f}s wall, "
+              f"{entry['fetched']} filings, {entry['pr_fetched']} press releases, {len(entry['errors'])} errors")
+        print(f"{'stage':<28}" + "".join(f"{c:>14}" for c in columns))
+        for name, row in sorted(entry["stages"].items()):
+            print(f"{name:<28}" + "".join(f"{row.get(c, 0):>14}" for c in columns))
+
+
+async def main(args) -> list:
+    from app import models  # noqa: F401 — registers the tables for create_all
+    from app.database import Base, engine
+    from app.devtools.cassettes import Cassette, FaultProfile, RecordingTransport, ReplayTransport, TrafficStats
+    from app.services.http_clients import install_transports
+    from app.services.pipeline import current_stage, pipeline_listeners
+
+    Base.metadata.create_all(bind=engine)
+    traffic = TrafficStats()
+    if args.mode == "record":
+        cassette = Cassette(args.cassette)
+        transport = RecordingTransport(cassette, traffic)
+    else:
+        cassette = Cassette.load(args.cassette)
+        faults = FaultProfile(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            rate_limit_rate=args.rate_limit_rate,
+            seed=args.seed,
+        )
+        transport = ReplayTransport(cassette, faults, traffic)
+    install_transports(transport, transport)
+
+    statements = StatementCounter(engine, current_stage)
+    await seed_companies([t.strip().upper() for t in args.tickers.split(",") if t.strip()])
+
+    report = []
+    for entry in args.entry or ["scheduled", "summaries"]:
+        pipelines = []
+        pipeline_listeners.append(pipelines.append)
+        traffic.by_stage.clear()
+        statements.by_stage.clear()
+        started = time.perf_counter()
+        try:
+            state = await run_entry(entry, args)
+        finally:
+            pipeline_listeners.remove(pipelines.append)
+        report.append({
+            "entry": entry,
+            "wall_seconds": round(time.perf_counter() - started, 3),
+            "fetched": state["fetched"],
+            "pr_fetched": state["pr_fetched"],
+            "errors": state["errors"],
+            "stages": stage_report(pipelines, traffic, statements.by_stage),
+        })
+
+    if args.mode == "record":
+        cassette.save()
+        print(f"Recorded {len(cassette)} responses to {args.cassette}")
+    return report
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    database = configure_environment(args)
+    report = asyncio.run(main(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps({"database": str(database), "entries": report}, indent=2, default=str))
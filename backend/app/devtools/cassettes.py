@@ -0,0 +1,252 @@
+"""Record/replay of upstream HTTP traffic (EDGAR, Finnhub, Groq) for offline benchmarks.
+
+A cassette is a gzipped JSON file mapping a request key to the responses
+recorded for it. Install the transports with
+`app.services.http_clients.install_transports`; every service client then
+goes through them.
+"""
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from ..services.pipeline import current_stage
+
+# Never written to a cassette or used in its keys
+SECRET_PARAMS = {"token", "api_key", "apikey"}
+# Request headers that change the upstream response, so they are part of the key
+KEY_HEADERS = ("if-modified-since", "if-none-match")
+# Per-hop headers that must not be replayed
+DROP_RESPONSE_HEADERS = {"transfer-encoding", "connection", "keep-alive", "set-cookie"}
+
+
+class CassetteMissError(httpx.TransportError):
+    """Replay found no recorded response for a request."""
+
+
+def request_key(request: httpx.Request) -> str:
+    params = sorted((k, v) for k, v in request.url.params.multi_items() if k.lower() not in SECRET_PARAMS)
+    url = request.url.copy_with(query=urlencode(params).encode() if params else None)
+    parts = [request.method, str(url)]
+    for header in KEY_HEADERS:
+        if header in request.headers:
+            parts.append(f"{header}={request.headers[header]}")
+    body = request.content
+    if body:
+        # LLM calls differ only in their body (model, prompt)
+        parts.append(hashlib.sha256(body).hexdigest()[:20])
+    return " ".join(parts)
+
+
+@dataclass
+class RecordedResponse:
+    status: int
+    headers: List[List[str]]
+    body: str  # base64 of the bytes as sent on the wire (possibly gzip-encoded)
+    elapsed_ms: float
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status,
+            headers=self.headers,
+            content=base64.b64decode(self.body),
+            request=request,
+        )
+
+
+class Cassette:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.interactions: Dict[str, List[RecordedResponse]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        cassette = cls(path)
+        with gzip.open(cassette.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        for key, responses in data["interactions"].items():
+            cassette.interactions[key] = [RecordedResponse(**r) for r in responses]
+        return cassette
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {
+                "version": 1,
+                "interactions": {k: [asdict(r) for r in v] for k, v in self.interactions.items()},
+            }
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def record(self, key: str, response: RecordedResponse) -> None:
+        with self._lock:
+            self.interactions[key].append(response)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.interactions.values())
+
+
+@dataclass
+class StageTraffic:
+    requests: int = 0
+    bytes: int = 0
+    tokens: int = 0
+    rate_limited: int = 0
+    misses: int = 0
+
+
+class TrafficStats:
+    """Upstream traffic per pipeline stage (see `current_stage`)."""
+
+    def __init__(self):
+        self.by_stage: Dict[str, StageTraffic] = defaultdict(StageTraffic)
+        self._lock = threading.Lock()
+
+    def observe(self, response: httpx.Response, wire_bytes: int) -> None:
+        tokens = 0
+        if response.request.url.host == "api.groq.com" and response.status_code == 200:
+            try:
+                tokens = response.json().get("usage", {}).get("total_tokens", 0)
+            except ValueError:
+                pass
+        with self._lock:
+            stats = self.by_stage[current_stage.get() or "-"]
+            stats.requests += 1
+            stats.bytes += wire_bytes
+            stats.tokens += tokens
+            if response.status_code == 429:
+                stats.rate_limited += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self.by_stage[current_stage.get() or "-"].misses += 1
+
+
+def _recorded(response: httpx.Response, body: bytes, elapsed_ms: float) -> RecordedResponse:
+    return RecordedResponse(
+        status=response.status_code,
+        headers=[
+            [k, v] for k, v in response.headers.multi_items()
+            if k.lower() not in DROP_RESPONSE_HEADERS
+        ],
+        body=base64.b64encode(body).decode("ascii"),
+        elapsed_ms=round(elapsed_ms, 1),
+    )
+
+
+class RecordingTransport(httpx.AsyncBaseTransport, httpx.BaseTransport):
+    """Sends requests to the network and stores every response in the cassette."""
+
+    def __init__(self, cassette: Cassette, stats: Optional[TrafficStats] = None):
+        self.cassette = cassette
+        self.stats = stats or TrafficStats()
+        self._async = httpx.AsyncHTTPTransport()
+        self._sync = httpx.HTTPTransport()
+
+    def _store(self, request: httpx.Request, response: httpx.Response, body: bytes, started: float) -> httpx.Response:
+        recorded = _recorded(response, body, (time.perf_counter() - started) * 1000)
+        self.cassette.record(request_key(request), recorded)
+        replayed = recorded.to_response(request)
+        self.stats.observe(replayed, len(body))
+        return replayed
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self._async.handle_async_request(request)
+        body = await response.aread()
+        await response.aclose()
+        return self._store(request, response, body, started)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = self._sync.handle_request(request)
+        body = response.read()
+        response.close()
+        return self._store(request, response, body, started)
+
+
+@dataclass
+class FaultProfile:
+    """What replay injects on top of the recorded responses.
+
+    `latency_ms` None replays each response's recorded latency.
+    """
+
+    latency_ms: Optional[float] = 0.0
+    jitter_ms: float = 0.0
+    rate_limit_rate: float = 0.0  # probability of answering 429 instead
+    retry_after_seconds: int = 1
+    seed: Optional[int] = None
+    rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+
+
+class ReplayTransport(httpx.AsyncBaseTransport, httpx.BaseTransport):
+    """Answers from the cassette, with injected latency, jitter and 429s.
+
+    Repeated requests for the same key get the recorded responses in order,
+    then the last one again.
+    """
+
+    def __init__(self, cassette: Cassette, faults: Optional[FaultProfile] = None, stats: Optional[TrafficStats] = None):
+        self.cassette = cassette
+        self.faults = faults or FaultProfile()
+        self.stats = stats or TrafficStats()
+        self._served: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _respond(self, request: httpx.Request):
+        key = request_key(request)
+        with self._lock:
+            recorded = self.cassette.interactions.get(key)
+            if not recorded:
+                self.stats.miss()
+                raise CassetteMissError(f"No recorded response for {key}", request=request)
+            index = min(self._served[key], len(recorded) - 1)
+            self._served[key] += 1
+            throttled = self.faults.rng.random() < self.faults.rate_limit_rate
+            jitter = self.faults.rng.uniform(-1, 1) * self.faults.jitter_ms
+
+        entry = recorded[index]
+        base = entry.elapsed_ms if self.faults.latency_ms is None else self.faults.latency_ms
+        delay = max(base + jitter, 0) / 1000
+
+        if throttled:
+            response = httpx.Response(
+                429,
+                headers={"Retry-After": str(self.faults.retry_after_seconds)},
+                json={"error": "rate limited (injected)"},
+                request=request,
+            )
+            self.stats.observe(response, 0)
+            return delay, response
+
+        response = entry.to_response(request)
+        self.stats.observe(response, len(base64.b64decode(entry.body)))
+        return delay, response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay, response = self._respond(request)
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay, response = self._respond(request)
+        if delay:
+            time.sleep(delay)
+        return response
@@ -0,0 +1,193 @@
+"""EXPLAIN the app's hot queries and flag full table scans and sorts.
+
+Runs the real query code paths (timeline pages, exec comp, sync scheduling,
+summary queue claims), captures the SQL they issue and prints the plan of
+each statement. Full table scans are flagged; sorts that could not use an
+index are noted (sorting a merged, already-limited page is expected).
+
+By default a temporary SQLite database is seeded and analyzed first:
+
+    python -m app.devtools.index_advisor
+    python -m app.devtools.index_advisor --size 200 --verbose
+
+Or point it at an existing database (not modified; every scenario runs in
+a transaction that is rolled back). Small tables are scanned whatever the
+indexes, so use one with realistic data and ANALYZE it first:
+
+    python -m app.devtools.index_advisor --database-url postgresql://...
+
+Exits 1 if any full table scan was flagged.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+SQLITE_SCAN = re.compile(r"\bSCAN (\w+)(?! USING)")
+SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT)")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+POSTGRES_SORT = re.compile(r"\bSort\b")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Explain against this database instead of a seeded SQLite file")
+    parser.add_argument("--size", type=int, default=50, help="Seeded companies, and rows per company and table")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan, not only flagged ones")
+    return parser.parse_args(argv)
+
+
+def scenarios():
+    """(name, fn(db)) pairs exercising the query shapes that run per request or per sync."""
+    from app.config import get_settings
+    from app.models import ExecCompAttempt, ExecutiveCompensation, Filing
+    from app.routers.exec_comp import executive_compensation_rows
+    from app.services.summary_queue import claim_jobs
+    from app.services.sync_tiers import company_priorities
+    from app.services.timeline import TimelineCursor, TimelineFilters, timeline_facets, timeline_page, timeline_total
+
+    def timeline(**filters):
+        def run(db):
+            f = TimelineFilters(**filters)
+            rows, cursor = timeline_page(db, f, 100)
+            timeline_total(db, f)
+            if cursor:
+                timeline_page(db, f, 100, cursor)
+        return run
+
+    def cursor_deep(db):
+        timeline_page(db, TimelineFilters(ticker="C000"), 50, TimelineCursor(date(2025, 1, 10), "filing", 1))
+
+    def latest_proxy(db):
+        # Mirrors extract_exec_comp's discover stage
+        db.query(Filing.id, Filing.accession_number, Filing.document_url, Filing.filed_date).filter(
+            Filing.company_id == 1,
+            Filing.form_type == "DEF 14A",
+        ).order_by(Filing.filed_date.desc()).first()
+        db.query(ExecutiveCompensation.id).filter(
+            ExecutiveCompensation.company_id == 1, ExecutiveCompensation.filing_id == 1,
+        ).first()
+        db.query(ExecCompAttempt.status, ExecCompAttempt.next_attempt_at).filter(
+            ExecCompAttempt.accession_number == "0000000000-25-000001"
+        ).first()
+
+    settings = get_settings()
+    return [
+        ("timeline: all companies", timeline()),
+        ("timeline: one ticker", timeline(ticker="C000")),
+        ("timeline: ticker + form type", timeline(ticker="C000", form_type="8-K")),
+        ("timeline: ticker + date range", timeline(ticker="C000", start_date=date(2025, 1, 5), end_date=date(2025, 2, 1))),
+        ("timeline: ticker, cursor page", cursor_deep),
+        ("timeline: watchlist", timeline(tickers=("C000", "C001", "C002"))),
+        ("timeline facets: one ticker", lambda db: timeline_facets(db, TimelineFilters(ticker="C000", form_type="8-K"))),
+        ("exec comp: one ticker", lambda db: executive_compensation_rows(db, "C000")),
+        ("exec comp: latest proxy", latest_proxy),
+        ("sync: company priorities", company_priorities),
+        ("summary queue: claim", lambda db: claim_jobs(
+            db, "advisor", 5, settings.summary_lease_seconds, settings.summary_max_attempts,
+        )),
+    ]
+
+
+class Capture:
+    """Collects the statements a scenario issues, for explaining afterwards."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany and not statement.lstrip().upper().startswith(("EXPLAIN", "PRAGMA", "SAVEPOINT", "RELEASE")):
+            self.statements.append((statement, parameters))
+
+    def take(self) -> list:
+        statements, self.statements = self.statements, []
+        return statements
+
+
+def explain(connection, statement: str, parameters) -> list:
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        return [row[-1] for row in rows]
+    return [row[0] for row in connection.exec_driver_sql("EXPLAIN " + statement, parameters).all()]
+
+
+def findings(dialect: str, plan: list, tables: set) -> tuple:
+    """Full table scans and index-less sorts in a plan."""
+    scan, sort = (SQLITE_SCAN, SQLITE_SORT) if dialect == "sqlite" else (POSTGRES_SCAN, POSTGRES_SORT)
+    scans, sorts = [], []
+    for line in plan:
+        for match in scan.finditer(line):
+            # Scans of subqueries and CTEs are fine; only real tables matter
+            if match.group(1) in tables:
+                scans.append(f"full scan of {match.group(1)}")
+        if sort.search(line):
+            sorts.append("sort without an index")
+    return scans, sorts
+
+
+def seed_database(size: int) -> None:
+    from app.database import engine, session_scope
+    from app.devtools.query_counts import reset_database, seed
+    from app.services.summary_queue import enqueue_missing_summaries
+
+    reset_database(engine)
+    seed(size)
+    with session_scope() as db:
+        enqueue_missing_summaries(db)
+    with engine.connect() as connection:
+        connection.exec_driver_sql("ANALYZE")
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        database = Path(tempfile.mkdtemp(prefix="index-advisor-")) / "advisor.db"
+        os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+
+    from app import models  # noqa: F401 — registers the tables
+    from app.database import Base, SessionLocal, engine
+
+    if not args.database_url:
+        seed_database(args.size)
+
+    tables = set(Base.metadata.tables)
+    capture = Capture(engine)
+    flagged_total = 0
+    for name, run in scenarios():
+        db = SessionLocal()
+        try:
+            run(db)
+            statements = capture.take()
+            connection = db.connection()
+            print(f"\n== {name} ({len(statements)} statements)")
+            for statement, parameters in statements:
+                plan = explain(connection, statement, parameters)
+                capture.take()
+                scans, sorts = findings(engine.dialect.name, plan, tables)
+                flagged_total += len(scans)
+                if scans or sorts or args.verbose:
+                    print("  " + " ".join(statement.split())[:200])
+                    for line in plan:
+                        print(f"      {line}")
+                    for finding in scans:
+                        print(f"    !! {finding}")
+                    for finding in sorts:
+                        print(f"    ~~ {finding}")
+        finally:
+            db.rollback()
+            db.close()
+
+    print(f"\n{flagged_total} full table scan(s)")
+    return 1 if flagged_total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Check that list endpoints run a constant number of SQL statements.
+
+Seeds a fresh SQLite database at two sizes (N companies with N rows each
+per table), calls each list endpoint and counts the statements it
+executes. A count that grows with the size means a relationship is being
+lazy-loaded per row (N+1). Exits 1 if any endpoint's count differs between
+the two sizes:
+
+    python -m app.devtools.query_counts
+    python -m app.devtools.query_counts --sizes 5,50 --verbose
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Endpoints whose statement count must not depend on the number of rows
+ENDPOINTS = (
+    "/api/companies",
+    "/api/filings/timeline?limit=500",
+    "/api/filings/timeline?limit=500&ticker=C000",
+    "/api/filings/timeline?limit=500&count=none",
+    "/api/filings/timeline?limit=500&tickers=C000,C001,C002",
+    "/api/filings/timeline/facets?ticker=C000",
+    "/api/exec-comp/",
+    "/api/bear-vs-bull/",
+    "/api/bear-vs-bull/?ticker=C000",
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="3,30", help="Two comma-separated seed sizes")
+    parser.add_argument("--verbose", action="store_true", help="Print every statement of the larger run")
+    return parser.parse_args(argv)
+
+
+class StatementLog:
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.statements = []
+        self._lock = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.statements.append(statement)
+
+    def take(self) -> list:
+        with self._lock:
+            statements, self.statements = self.statements, []
+        return statements
+
+
+def reset_database(engine) -> None:
+    from app import models  # noqa: F401 — registers the tables
+    from app.database import Base
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def seed(size: int) -> None:
+    from app.database import session_scope
+    from app.models import (
+        BearVsBullArgument,
+        BearVsBullPost,
+        Company,
+        ExecutiveCompensation,
+        Filing,
+        PressRelease,
+        User,
+    )
+    from app.services.search import rebuild_search
+    from app.services.timeline import rebuild_timeline
+
+    with session_scope() as db:
+        user = User(email="bench@example.com", password_hash="x")
+        db.add(user)
+        for c in range(size):
+            company = Company(ticker=f"C{c:03d}", name=f"Company {c}", cik=str(1000 + c))
+            db.add(company)
+            db.flush()
+            for i in range(size):
+                filing = Filing(
+                    company_id=company.id,
+                    accession_number=f"{c}-{i}",
+                    form_type="DEF 14A" if i % 3 == 0 else "8-K",
+                    filed_date=date(2025, 1, 1) + timedelta(days=i),
+                    document_url=f"https://example.com/{c}/{i}",
+                    headline=f"Filing {i}",
+                )
+                db.add(filing)
+                db.flush()
+                db.add(PressRelease(
+                    company_id=company.id,
+                    finnhub_id=c * 100000 + i,
+                    headline=f"News {i}",
+                    source="test",
+                    url=f"https://example.com/news/{c}/{i}",
+                    published_at=datetime(2025, 1, 1) + timedelta(hours=i * 7),
+                ))
+                db.add(ExecutiveCompensation(
+                    filing_id=filing.id,
+                    company_id=company.id,
+                    executive_name=f"Exec {i}",
+                    total_compensation=float(i),
+                    fiscal_year=2025,
+                    filed_date=filing.filed_date,
+                ))
+                db.add(BearVsBullArgument(
+                    company_id=company.id,
+                    stance="bull" if i % 2 else "bear",
+                    source_type="reddit",
+                    source_name="Reddit",
+                    title=f"Argument {i}",
+                    summary="...",
+                    as_of_date=date(2025, 1, 1),
+                ))
+                db.add(BearVsBullPost(
+                    company_id=company.id,
+                    user_id=user.id,
+                    stance="bull" if i % 2 else "bear",
+                    title=f"Post {i}",
+                    summary="...",
+                ))
+        db.flush()
+        # Rows were added directly, not through ingest
+        rebuild_timeline(db)
+        rebuild_search(db)
+
+
+def measure(client, log, size: int, engine) -> dict:
+    from app.services.response_cache import response_cache
+
+    reset_database(engine)
+    seed(size)
+    # Seed data written by ensure_seed_data on a first request is not part of the steady state
+    for path in ENDPOINTS:
+        client.get(path)
+    log.take()
+
+    counts = {}
+    for path in ENDPOINTS:
+        # Measure the endpoint itself, not a response cache hit
+        response_cache.clear()
+        log.take()
+        response = client.get(path)
+        if response.status_code != 200:
+            raise SystemExit(f"{path} returned {response.status_code}: {response.text[:200]}")
+        counts[path] = log.take()
+    return counts
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    small, large = (int(n) for n in args.sizes.split(","))
+    database = Path(tempfile.mkdtemp(prefix="query-counts-")) / "counts.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+
+    from fastapi.testclient import TestClient
+
+    from app.database import engine
+    from app.main import app
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    log = StatementLog(engine)
+    # Without the context manager the lifespan (scheduler, workers) does not start
+    client = TestClient(app)
+    before = measure(client, log, small, engine)
+    after = measure(client, log, large, engine)
+
+    failed = False
+    print(f"{'endpoint':<58}{small:>8}{large:>8}")
+    for path in ENDPOINTS:
+        ok = len(before[path]) == len(after[path])
+        failed |= not ok
+        print(f"{path:<58}{len(before[path]):>8}{len(after[path]):>8}  {'ok' if ok else 'GROWS WITH ROWS'}")
+        if args.verbose or not ok:
+            for statement in after[path]:
+                print("    " + " ".join(statement.split())[:160])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Rebuild the denormalized timeline_events table, and the search_documents
+index built from it, from filings and press releases.
+
+Needed after backfills that write the source tables directly, or to pick up
+changed form descriptions and company names:
+
+    python -m app.devtools.rebuild_timeline
+    python -m app.devtools.rebuild_timeline --ticker AAPL --ticker MSFT
+
+Runs in one transaction, so readers see the old rows until it commits.
+"""
+import argparse
+import sys
+import time
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticker", action="append", help="Only rebuild these companies; repeat for several")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    from app import models  # noqa: F401 — registers the tables for create_all
+    from app.database import Base, engine, session_scope
+    from app.models import Company
+    from app.services.search import rebuild_search
+    from app.services.timeline import rebuild_timeline
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    with session_scope() as db:
+        company_ids = None
+        if args.ticker:
+            tickers = [t.upper() for t in args.ticker]
+            company_ids = [id for (id,) in db.query(Company.id).filter(Company.ticker.in_(tickers))]
+            if len(company_ids) != len(tickers):
+                print(f"Some of {', '.join(tickers)} are not tracked", file=sys.stderr)
+                return 1
+        written = rebuild_timeline(db, company_ids)
+        indexed = rebuild_search(db, company_ids)
+    print(f"Wrote {written} timeline events ({indexed} indexed for search) in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,17 @@ from starlette.types import ASGIApp, Receive, Scope, Send
 from contextlib import asynccontextmanager
 import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy.exc import IntegrityError
 
-from .database import engine, Base
-from .routers import auth_router, companies_router, filings_router, prices_router, exec_comp_router, bear_vs_bull_router
+from .database import engine, Base, session_scope
+from .routers import auth_router, companies_router, filings_router, prices_router, exec_comp_router, bear_vs_bull_router, watchlists_router
 from .config import get_settings
-from .services.sync import sync_all_companies
+from .services.compression import CompressionMiddleware
+from .services.search import ensure_search
+from .services.summary_worker import summary_workers
+from .services.prices import NEW_YORK
+from .services.sync_worker import flush_traffic, sync_due_companies, sync_worker, warm_prices
+from .services.timeline import ensure_timeline
 
 logging.basicConfig(
     level=logging.INFO,
@@ -26,16 +32,39 @@ async def lifespan(app: FastAPI):
     if engine:
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created/verified")
+        try:
+            with session_scope() as db:
+                built = ensure_timeline(db)
+            if built:
+                logger.info(f"Built timeline_events from existing data ({built} rows)")
+            with session_scope() as db:
+                indexed = ensure_search(db)
+            if indexed:
+                logger.info(f"Indexed {indexed} timeline events for search")
+        except IntegrityError:
+            logger.info("timeline_events or search_documents is being built by another replica")
     else:
         logger.warning("Database not configured - set DATABASE_URL in .env")
 
-    scheduler.add_job(sync_all_companies, "cron", hour=6, minute=0)
+    settings = get_settings()
+    scheduler.add_job(sync_due_companies, "interval", minutes=settings.sync_schedule_minutes)
+    scheduler.add_job(flush_traffic, "interval", minutes=1)
+    # Once the day's bar has settled (prices.MARKET_SETTLED)
+    scheduler.add_job(warm_prices, "cron", day_of_week="mon-fri", hour=16, minute=45, timezone=NEW_YORK)
     scheduler.start()
-    logger.info("Scheduler started: daily sync at 06:00 UTC")
+    logger.info(f"Scheduler started: tiered sync every {settings.sync_schedule_minutes} minutes")
+
+    if engine:
+        sync_worker.start()
+        summary_workers.start()
 
     yield
 
+    await sync_worker.stop()
+    await summary_workers.stop()
     scheduler.shutdown()
+    if engine:
+        flush_traffic()
     logger.info("Shutting down...")
 
 
@@ -91,6 +120,7 @@ class WildcardCORSMiddleware:
             await self.base(scope, receive, send)
 
 
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(WildcardCORSMiddleware)
 
 app.include_router(companies_router)
@@ -99,6 +129,7 @@ app.include_router(prices_router)
 app.include_router(exec_comp_router)
 app.include_router(bear_vs_bull_router)
 app.include_router(auth_router)
+app.include_router(watchlists_router)
 
 
 @app.get("/")
@@ -1,23 +1,53 @@
+from .cache_generation import CacheGeneration
 from .company import Company
+from .company_sync_attempt import CompanySyncAttempt
+from .company_sync_state import CompanySyncState
 from .filing import Filing
+from .filing_text import FilingText
 from .interest_log import InterestLog
+from .lease import Lease
 from .press_release import PressRelease
+from .price_candle import PriceCandle
+from .price_history import PriceHistory
+from .search_document import SearchDocument
+from .summary_job import SummaryJob
+from .sync_run import SyncRun
+from .sync_task import SyncTask
+from .ticker_traffic import TickerTraffic
+from .timeline_entry import TimelineEntry
 from .executive_compensation import ExecutiveCompensation
+from .exec_comp_attempt import ExecCompAttempt
 from .bear_vs_bull_argument import BearVsBullArgument
 from .bear_vs_bull_post import BearVsBullPost
 from .bear_vs_bull_vote import BearVsBullVote
 from .user import User
 from .auth_session import AuthSession
+from .watchlist import Watchlist
 
 __all__ = [
+    "CacheGeneration",
     "Company",
+    "CompanySyncAttempt",
+    "CompanySyncState",
     "Filing",
+    "FilingText",
     "InterestLog",
+    "Lease",
     "PressRelease",
+    "PriceCandle",
+    "PriceHistory",
+    "SearchDocument",
+    "SummaryJob",
+    "SyncRun",
+    "SyncTask",
+    "TickerTraffic",
+    "TimelineEntry",
     "ExecutiveCompensation",
+    "ExecCompAttempt",
     "BearVsBullArgument",
     "BearVsBullPost",
     "BearVsBullVote",
     "User",
     "AuthSession",
+    "Watchlist",
 ]
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class CacheGeneration(Base):
+    """Change counter per cache tag, shared by every replica's response cache.
+
+    Bumped in the same transaction as the data it describes; cached responses
+    built under an older generation of any of their tags are stale.
+    """
+
+    __tablename__ = "cache_generations"
+
+    id = Column(Integer, primary_key=True)
+    tag = Column(String, unique=True, nullable=False, index=True)  # "ticker:AAPL", "*", "companies"
+    generation = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+
+from ..database import Base
+
+
+class CompanySyncAttempt(Base):
+    """When a company was last synced, successfully or not, and how many syncs in a row failed."""
+
+    __tablename__ = "company_sync_attempts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), unique=True, nullable=False, index=True)
+    last_attempt_at = Column(DateTime, nullable=False)
+    # Reset by a sync without errors; the scheduler backs off while it is above zero
+    consecutive_failures = Column(Integer, nullable=False, default=0)
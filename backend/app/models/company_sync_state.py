@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class CompanySyncState(Base):
+    __tablename__ = "company_sync_state"
+
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), unique=True, nullable=False, index=True)
+
+    # Newest accession number seen in the EDGAR submissions feed (any form type)
+    last_accession_number = Column(String, nullable=True)
+    # Last-Modified header of the submissions JSON, replayed as If-Modified-Since
+    submissions_last_modified = Column(String, nullable=True)
+    # Newest Finnhub news timestamp stored
+    last_news_at = Column(DateTime, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+
+from ..database import Base
+
+
+class ExecCompAttempt(Base):
+    """Outcome of extracting exec comp from one DEF 14A, so syncs don't repeat the download and LLM call."""
+
+    __tablename__ = "exec_comp_attempts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    accession_number = Column(String, unique=True, nullable=False, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
+    status = Column(String, nullable=False)  # extracted, empty (no named officers), failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    # A failed extraction is retried after this, until exec_comp_max_attempts
+    next_attempt_at = Column(DateTime, nullable=True)
+    attempted_at = Column(DateTime, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -27,3 +27,8 @@ class ExecutiveCompensation(Base):
 
     filing = relationship("Filing")
     company = relationship("Company")
+
+    __table_args__ = (
+        # Latest fiscal year per company
+        Index("ix_executive_compensation_company_year", company_id, fiscal_year),
+    )
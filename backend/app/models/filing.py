@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -21,3 +21,10 @@ class Filing(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     company = relationship("Company", back_populates="filings")
+
+    __table_args__ = (
+        # Per-company timeline and "latest filing" lookups
+        Index("ix_filings_company_filed_date", company_id, filed_date.desc()),
+        # Per-company form type filters (timeline, latest DEF 14A)
+        Index("ix_filings_company_form_filed_date", company_id, form_type, filed_date),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class FilingText(Base):
+    """Cleaned text of a filing document, kept from summarization for full-text search."""
+
+    __tablename__ = "filing_texts"
+
+    filing_id = Column(Integer, ForeignKey("filings.id"), primary_key=True)
+    text = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -9,4 +9,4 @@ class InterestLog(Base):
     id = Column(Integer, primary_key=True, index=True)
     ticker = Column(String, nullable=False, index=True)
     name = Column(String, nullable=False)
-    searched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    searched_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, Integer, String
+
+from ..database import Base
+
+
+class Lease(Base):
+    """A named, time-limited lock shared by all replicas, e.g. scheduler leadership."""
+
+    __tablename__ = "leases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False, index=True)
+    owner = Column(String, nullable=True)
+    expires_at = Column(DateTime, nullable=True)
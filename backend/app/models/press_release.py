@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, BigInteger
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, BigInteger, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -17,3 +17,8 @@ class PressRelease(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     company = relationship("Company", back_populates="press_releases")
+
+    __table_args__ = (
+        # Per-company timeline and news watermarks
+        Index("ix_press_releases_company_published_at", company_id, published_at.desc()),
+    )
@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, Date, Float, String
+
+from ..database import Base
+
+
+class PriceCandle(Base):
+    """One daily OHLCV bar, split- and dividend-adjusted as Yahoo Finance returns it."""
+
+    __tablename__ = "price_candles"
+
+    # (ticker, day) is the primary key, so every period read is one index range scan
+    ticker = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(BigInteger, nullable=False)
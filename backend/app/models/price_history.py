@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Date, DateTime, String
+
+from ..database import Base
+
+
+class PriceHistory(Base):
+    """The stretch of price_candles held for a ticker and when it was last refreshed from Yahoo."""
+
+    __tablename__ = "price_histories"
+
+    ticker = Column(String, primary_key=True)
+    first_day = Column(Date, nullable=False)
+    last_day = Column(Date, nullable=False)
+    fetched_at = Column(DateTime, nullable=False)
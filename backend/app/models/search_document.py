@@ -0,0 +1,80 @@
+from sqlalchemy import DDL, BigInteger, Column, Date, ForeignKey, Index, Integer, String, Text, UniqueConstraint, event
+
+from ..database import Base
+
+
+class SearchDocument(Base):
+    """One searchable row per timeline event: timeline columns plus summary and cleaned text.
+
+    The full-text index itself is dialect specific and created with the table
+    (see the DDL below): an external-content FTS5 table kept in sync by
+    triggers on SQLite, a generated tsvector column with a GIN index on
+    PostgreSQL. Maintained at ingest by services/search.py.
+    """
+
+    __tablename__ = "search_documents"
+
+    # Timeline order (day, event type, source id) packed into one integer by
+    # services.search.sort_key, newest smallest: the full-text index is keyed
+    # on it, so newest first is the index's own order and stops after a page
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=False)
+    event_type = Column(String, nullable=False)  # "filing" or "press_release"
+    source_id = Column(Integer, nullable=False)  # filings.id or press_releases.id
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
+    ticker = Column(String, nullable=False)
+    company_name = Column(String, nullable=False)
+    form_type = Column(String, nullable=False)
+    form_type_description = Column(String, nullable=False)
+    event_date = Column(Date, nullable=False)
+    headline = Column(String, nullable=True)
+    document_url = Column(String, nullable=False)
+    summary = Column(Text, nullable=True)
+    body = Column(Text, nullable=True)  # cleaned filing text, when kept
+
+    __table_args__ = (
+        UniqueConstraint("event_type", "source_id", name="uq_search_documents_source"),
+        Index("ix_search_documents_ticker_order", ticker, id),
+    )
+
+
+_SQLITE_INDEX = [
+    # ticker is indexed so ticker filters intersect inside the index instead of
+    # joining every match; it carries no weight in the rank
+    "CREATE VIRTUAL TABLE search_documents_fts USING fts5("
+    "headline, summary, body, ticker, content='search_documents', content_rowid='id', tokenize='porter unicode61')",
+    # Headline matches outrank summary matches, which outrank body text
+    "INSERT INTO search_documents_fts(search_documents_fts, rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0, 0.0)')",
+    """CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN
+        INSERT INTO search_documents_fts(rowid, headline, summary, body, ticker)
+        VALUES (new.id, new.headline, new.summary, new.body, new.ticker);
+    END""",
+    """CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN
+        INSERT INTO search_documents_fts(search_documents_fts, rowid, headline, summary, body, ticker)
+        VALUES ('delete', old.id, old.headline, old.summary, old.body, old.ticker);
+    END""",
+    """CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN
+        INSERT INTO search_documents_fts(search_documents_fts, rowid, headline, summary, body, ticker)
+        VALUES ('delete', old.id, old.headline, old.summary, old.body, old.ticker);
+        INSERT INTO search_documents_fts(rowid, headline, summary, body, ticker)
+        VALUES (new.id, new.headline, new.summary, new.body, new.ticker);
+    END""",
+]
+
+_POSTGRESQL_INDEX = [
+    """ALTER TABLE search_documents ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(headline, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(body, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX ix_search_documents_vector ON search_documents USING GIN (search_vector)",
+]
+
+for _statement in _SQLITE_INDEX:
+    event.listen(SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in _POSTGRESQL_INDEX:
+    event.listen(SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+# The triggers go with the table; the FTS5 table does not
+event.listen(
+    SearchDocument.__table__, "after_drop",
+    DDL("DROP TABLE IF EXISTS search_documents_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,31 @@
+from sqlalchemy import Boolean, Column, Date, DateTime, Integer, String
+from sqlalchemy.orm import relationship
+
+from ..database import Base
+
+
+class SyncRun(Base):
+    """One sync across all tracked companies, split into per-company SyncTasks."""
+
+    __tablename__ = "sync_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    label = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="running", index=True)  # running, done
+    # "active" while running, NULL once done; the unique constraint allows one running sync
+    active_key = Column(String, unique=True, nullable=True)
+
+    # Parameters every replica uses for its share of the run
+    filing_limit = Column(Integer, nullable=False)
+    since_date = Column(Date, nullable=True)
+    incremental = Column(Boolean, nullable=False, default=False)
+
+    fetched = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    pr_fetched = Column(Integer, nullable=False, default=0)
+    current = Column(String, nullable=True)
+
+    started_at = Column(DateTime, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    tasks = relationship("SyncTask", back_populates="run")
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from ..database import Base
+
+
+class SyncTask(Base):
+    """A company's share of a SyncRun, claimed by one replica at a time."""
+
+    __tablename__ = "sync_tasks"
+    __table_args__ = (UniqueConstraint("run_id", "company_id", name="uq_sync_task_run_company"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("sync_runs.id"), nullable=False, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    status = Column(String, nullable=False, default="pending", index=True)  # pending, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+    errors = Column(Text, nullable=True)  # newline-separated
+    completed_at = Column(DateTime, nullable=True)
+
+    run = relationship("SyncRun", back_populates="tasks")
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Date, Integer, String, UniqueConstraint
+
+from ..database import Base
+
+
+class TickerTraffic(Base):
+    """Daily page views per ticker, used to decide how often each company is synced."""
+
+    __tablename__ = "ticker_traffic"
+    __table_args__ = (UniqueConstraint("ticker", "day", name="uq_ticker_traffic_ticker_day"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    ticker = Column(String, nullable=False, index=True)
+    day = Column(Date, nullable=False, index=True)
+    views = Column(Integer, nullable=False, default=0)
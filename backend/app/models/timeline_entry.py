@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, String, UniqueConstraint
+
+from ..database import Base
+
+
+class TimelineEntry(Base):
+    """One row per filing or press release, denormalized for the timeline API.
+
+    Written in the same transaction as the filing or press release it mirrors
+    (see services/ingest.py); rebuilt from the source tables with
+    `python -m app.devtools.rebuild_timeline`.
+    """
+
+    __tablename__ = "timeline_events"
+
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String, nullable=False)  # "filing" or "press_release"
+    source_id = Column(Integer, nullable=False)  # filings.id or press_releases.id
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
+    ticker = Column(String, nullable=False)
+    company_name = Column(String, nullable=False)
+    form_type = Column(String, nullable=False)  # "PR" for press releases
+    form_type_description = Column(String, nullable=False)
+    event_date = Column(Date, nullable=False)
+    headline = Column(String, nullable=True)
+    document_url = Column(String, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("event_type", "source_id", name="uq_timeline_events_source"),
+        # Timeline order is (event_date, event_type, source_id), all descending
+        Index("ix_timeline_events_order", event_date.desc(), event_type.desc(), source_id.desc()),
+        Index("ix_timeline_events_ticker_order", ticker, event_date.desc(), event_type.desc(), source_id.desc()),
+        Index("ix_timeline_events_form_order", form_type, event_date.desc(), event_type.desc(), source_id.desc()),
+    )
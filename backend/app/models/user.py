@@ -16,3 +16,4 @@ class User(Base):
     sessions = relationship("AuthSession", back_populates="user", cascade="all, delete-orphan")
     bear_vs_bull_posts = relationship("BearVsBullPost", back_populates="user", cascade="all, delete-orphan")
     bear_vs_bull_votes = relationship("BearVsBullVote", back_populates="user", cascade="all, delete-orphan")
+    watchlists = relationship("Watchlist", back_populates="user", cascade="all, delete-orphan")
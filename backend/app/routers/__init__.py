@@ -4,5 +4,6 @@ from .prices import router as prices_router
 from .exec_comp import router as exec_comp_router
 from .bear_vs_bull import router as bear_vs_bull_router
 from .auth import router as auth_router
+from .watchlists import router as watchlists_router
 
-__all__ = ["companies_router", "filings_router", "prices_router", "exec_comp_router", "bear_vs_bull_router", "auth_router"]
+__all__ = ["companies_router", "filings_router", "prices_router", "exec_comp_router", "bear_vs_bull_router", "auth_router", "watchlists_router"]
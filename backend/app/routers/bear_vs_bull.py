@@ -13,6 +13,7 @@ from ..services.bear_vs_bull import (
     get_anonymous_voter_hash,
     get_request_ip_hash,
 )
+from ..services.fast_json import json_response
 
 router = APIRouter(prefix="/api/bear-vs-bull", tags=["bear-vs-bull"])
 
@@ -24,13 +25,14 @@ def get_bear_vs_bull(
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_optional_current_user),
 ):
-    return build_bear_vs_bull_response(
+    # Already shaped like BearVsBullResponse; encode without a second validation pass
+    return json_response(build_bear_vs_bull_response(
         db=db,
         ticker=ticker,
         current_user=current_user,
         anonymous_voter_hash=get_anonymous_voter_hash(request),
         ip_hash=get_request_ip_hash(request),
-    )
+    ))
 
 
 @router.post("/posts", response_model=BearVsBullArgumentResponse)
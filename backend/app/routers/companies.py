@@ -1,10 +1,14 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import Company, InterestLog
 from ..schemas import CompanyCreate, CompanyResponse
 from ..services import TickerLookup
+from ..services.response_cache import COMPANIES, cached_json, mark_changed
+from ..services.search import delete_company_documents
+from ..services.sync import delete_synced_data
+from ..services.timeline import delete_company_entries
 from ..config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -24,9 +28,11 @@ async def search_tickers(q: str = Query(..., min_length=1, description="Search q
 
 
 @router.get("", response_model=list[CompanyResponse])
-def list_companies(db: Session = Depends(get_db)):
+def list_companies(request: Request, db: Session = Depends(get_db)):
     """List all tracked companies."""
-    return db.query(Company).order_by(Company.ticker).all()
+    return cached_json(request, {}, [COMPANIES], lambda: [
+        CompanyResponse.model_validate(c) for c in db.query(Company).order_by(Company.ticker).all()
+    ])
 
 
 @router.post("", response_model=CompanyResponse)
@@ -54,6 +60,7 @@ async def add_company(data: CompanyCreate, db: Session = Depends(get_db)):
         cik=info.cik,
     )
     db.add(company)
+    mark_changed(db, [ticker], [COMPANIES])
     db.commit()
     db.refresh(company)
     return company
@@ -89,6 +96,10 @@ def remove_company(ticker: str, db: Session = Depends(get_db)):
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
 
+    delete_company_entries(db, company.id)
+    delete_company_documents(db, company.id)
+    delete_synced_data(db, company.id)
+    mark_changed(db, [company.ticker], [COMPANIES])
     db.delete(company)
     db.commit()
     return {"message": f"Removed {ticker.upper()}"}
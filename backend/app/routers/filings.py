@@ -1,370 +1,283 @@
-import asyncio
 import logging
-from datetime import date, datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from dataclasses import asdict
+from datetime import date, timedelta
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
-from typing import Optional, List
-from ..database import get_db, SessionLocal
-from ..models import Company, Filing, PressRelease, ExecutiveCompensation
-from ..schemas import FilingResponse, FilingDetail, TimelineResponse
-from ..schemas.filing import TimelineEvent
-from ..services import EdgarService, SummarizerService, FinnhubService
+from typing import Literal, Optional, List
+from ..database import get_db
+from ..models import Filing, User
+from ..schemas import FilingResponse, FilingDetail, SearchResponse, TimelineFacetsResponse, TimelineResponse
+from ..schemas.watchlist import MAX_WATCHLIST_TICKERS, normalize_tickers
+from ..services.auth import get_optional_current_user
+from ..services.response_cache import ALL, cached_json, ticker_tag
+from ..services.search import SORT_RELEVANCE, InvalidQuery, SearchCursor, search_page
+from ..services.summary_queue import enqueue_missing_summaries, queue_stats, retry_failed
+from ..services.summary_worker import summary_workers
+from ..services.sync import backfill_news, load_companies, new_sync_state, sync_filings
+from ..services.sync_runs import run_status
+from ..services.sync_tiers import SYNC_TIERS, company_priorities
+from ..services.sync_worker import start_sync
+from ..services.timeline import (
+    InvalidCursor,
+    TimelineCursor,
+    TimelineFilters,
+    get_form_description,
+    timeline_facets,
+    timeline_page,
+    timeline_total,
+)
+from ..services.traffic import traffic
+from .watchlists import get_owned_watchlist
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/filings", tags=["filings"])
 
-FORM_TYPES = ["10-K", "10-Q", "8-K", "4", "S-1", "DEF 14A"]
-
-# Module-level sync state — updated by the background task
-_sync_state: dict = {
-    "running": False,
-    "fetched": 0,
-    "skipped": 0,
-    "pr_fetched": 0,
-    "errors": [],
-    "current": None,
-    "message": "No sync has run yet",
-    "started_at": None,
-    "completed_at": None,
-}
-
-
-async def _run_sync():
-    global _sync_state
-    _sync_state = {
-        "running": True,
-        "fetched": 0,
-        "skipped": 0,
-        "pr_fetched": 0,
-        "errors": [],
-        "current": None,
-        "message": "Starting sync...",
-        "started_at": datetime.utcnow().isoformat(),
-        "completed_at": None,
-    }
-
-    db = SessionLocal()
-    try:
-        companies = db.query(Company).all()
-        if not companies:
-            _sync_state.update({"running": False, "message": "No companies tracked"})
-            return
-
-        edgar = EdgarService()
-        summarizer = SummarizerService()
-        finnhub = FinnhubService()
-        since_date = date.today() - timedelta(days=365)
-
-        logger.info(f"Full sync started for {len(companies)} companies since {since_date}")
-
-        for company in companies:
-            _sync_state["current"] = company.ticker
-            _sync_state["message"] = f"Fetching filings for {company.ticker}..."
-            try:
-                filings = await edgar.get_company_filings(
-                    cik=company.cik,
-                    form_types=FORM_TYPES,
-                    limit=200,
-                    since_date=since_date,
-                )
-
-                for ef in filings:
-                    existing = db.query(Filing).filter(
-                        Filing.accession_number == ef.accession_number
-                    ).first()
-                    if existing:
-                        _sync_state["skipped"] += 1
-                        continue
-
-                    # Skip Groq summarization for Form 4 — high volume, low value
-                    headline = None
-                    if ef.form_type != "4":
-                        for attempt in range(3):
-                            try:
-                                _sync_state["message"] = (
-                                    f"{company.ticker}: summarizing {ef.form_type} "
-                                    f"filed {ef.filed_date}..."
-                                )
-                                # 5,000 chars ≈ 1,250 tokens — enough for a good
-                                # summary while staying under Groq's 6,000 TPM limit
-                                text = await summarizer.fetch_filing_text(
-                                    ef.document_url, max_chars=5000
-                                )
-                                headline = summarizer.generate_headline(
-                                    ef.form_type, company.name, text
-                                )
-                                # ~2,700 tokens/call × 2.7 calls/min ≈ 7,300 TPM
-                                await asyncio.sleep(22)
-                                break
-                            except Exception as e:
-                                if attempt < 2:
-                                    _sync_state["message"] = (
-                                        f"{company.ticker}: rate limited, "
-                                        f"waiting 60s (attempt {attempt + 1}/3)..."
-                                    )
-                                    await asyncio.sleep(60)
-                                else:
-                                    _sync_state["errors"].append(
-                                        f"{company.ticker} {ef.form_type}: {str(e)}"
-                                    )
-
-                    db.add(Filing(
-                        company_id=company.id,
-                        accession_number=ef.accession_number,
-                        form_type=ef.form_type,
-                        filed_date=ef.filed_date,
-                        document_url=ef.document_url,
-                        headline=headline,
-                    ))
-                    _sync_state["fetched"] += 1
-
-                db.commit()
-                await asyncio.sleep(0.5)  # SEC rate limit between companies
-
-                # Fetch press releases from Finnhub
-                _sync_state["message"] = f"Fetching news for {company.ticker}..."
-                try:
-                    news_items = await finnhub.get_company_news(
-                        symbol=company.ticker,
-                        from_date=date.today() - timedelta(days=7),
-                        to_date=date.today(),
-                    )
-                    for item in news_items:
-                        existing_pr = db.query(PressRelease).filter(
-                            PressRelease.finnhub_id == item.id
-                        ).first()
-                        if existing_pr:
-                            continue
-                        db.add(PressRelease(
-                            company_id=company.id,
-                            finnhub_id=item.id,
-                            headline=item.headline,
-                            source=item.source,
-                            url=item.url,
-                            published_at=datetime.fromtimestamp(item.datetime),
-                        ))
-                        _sync_state["pr_fetched"] += 1
-                    db.commit()
-                except Exception as e:
-                    _sync_state["errors"].append(
-                        f"{company.ticker} news: {str(e)}"
-                    )
-                    logger.error(f"Finnhub error for {company.ticker}: {e}")
-
-            except Exception as e:
-                _sync_state["errors"].append(f"{company.ticker}: {str(e)}")
-                logger.error(f"Sync error for {company.ticker}: {e}")
-
-        # --- Executive compensation extraction ---
-        _sync_state["message"] = "Extracting executive compensation..."
-        try:
-            exec_extracted = 0
-            for company in companies:
-                existing = db.query(ExecutiveCompensation).filter(
-                    ExecutiveCompensation.company_id == company.id
-                ).first()
-                if existing:
-                    continue
-
-                filing = db.query(Filing).filter(
-                    Filing.company_id == company.id,
-                    Filing.form_type == "DEF 14A",
-                ).order_by(Filing.filed_date.desc()).first()
-
-                if not filing:
-                    try:
-                        edgar_filings = await edgar.get_company_filings(
-                            cik=company.cik, form_types=["DEF 14A"], limit=1,
-                        )
-                        if not edgar_filings:
-                            continue
-                        ef = edgar_filings[0]
-                        existing_filing = db.query(Filing).filter(
-                            Filing.accession_number == ef.accession_number
-                        ).first()
-                        if existing_filing:
-                            filing = existing_filing
-                        else:
-                            filing = Filing(
-                                company_id=company.id,
-                                accession_number=ef.accession_number,
-                                form_type=ef.form_type,
-                                filed_date=ef.filed_date,
-                                document_url=ef.document_url,
-                            )
-                            db.add(filing)
-                            db.commit()
-                            db.refresh(filing)
-                        await asyncio.sleep(0.5)
-                    except Exception as e:
-                        db.rollback()
-                        logger.error(f"Exec comp: failed to fetch DEF 14A for {company.ticker}: {e}")
-                        continue
-
-                try:
-                    _sync_state["message"] = f"Extracting exec comp for {company.ticker}..."
-                    text = await summarizer.fetch_compensation_section(filing.document_url)
-                    comp_data = summarizer.extract_executive_compensation(company.name, text)
-                    for entry in comp_data:
-                        if not entry.get("name"):
-                            continue
-                        db.add(ExecutiveCompensation(
-                            filing_id=filing.id,
-                            company_id=company.id,
-                            executive_name=entry["name"],
-                            position=entry.get("position"),
-                            total_compensation=entry.get("total_compensation"),
-                            salary=entry.get("salary"),
-                            bonus=entry.get("bonus"),
-                            stock_awards=entry.get("stock_awards"),
-                            option_awards=entry.get("option_awards"),
-                            other_compensation=entry.get("other_compensation"),
-                            fiscal_year=entry.get("fiscal_year"),
-                            filed_date=filing.filed_date,
-                        ))
-                    db.commit()
-                    exec_extracted += len(comp_data)
-                    await asyncio.sleep(5)
-                except Exception as e:
-                    db.rollback()
-                    logger.error(f"Exec comp extraction failed for {company.ticker}: {e}")
-
-            if exec_extracted:
-                logger.info(f"Exec comp sync: extracted {exec_extracted} entries")
-        except Exception as e:
-            logger.error(f"Exec comp sync failed: {e}")
-
-        fetched = _sync_state["fetched"]
-        skipped = _sync_state["skipped"]
-        pr_fetched = _sync_state["pr_fetched"]
-        _sync_state.update({
-            "running": False,
-            "current": None,
-            "message": f"Done — {fetched} new filings, {skipped} already stored, {pr_fetched} press releases",
-            "completed_at": datetime.utcnow().isoformat(),
-        })
-        logger.info(f"Full sync complete: {fetched} fetched, {skipped} skipped, {pr_fetched} press releases")
-
-    except Exception as e:
-        _sync_state.update({
-            "running": False,
-            "current": None,
-            "message": f"Sync failed: {str(e)}",
-            "completed_at": datetime.utcnow().isoformat(),
-        })
-        logger.error(f"Sync failed: {e}")
-    finally:
-        db.close()
-
 
 @router.get("/sync-status")
-def get_sync_status():
-    """Get the current status of a running or completed sync."""
-    return _sync_state
+def get_sync_status(db: Session = Depends(get_db)):
+    """Get the status of the running or most recent sync, shared by all replicas."""
+    return run_status(db)
 
 
 @router.post("/sync")
-async def start_sync(background_tasks: BackgroundTasks):
-    """Start a full sync of all tracked companies with AI summarization."""
-    if _sync_state["running"]:
-        return {"message": "Sync already in progress", "status": _sync_state}
-    background_tasks.add_task(_run_sync)
+def start_full_sync(db: Session = Depends(get_db)):
+    """Start a full sync of all tracked companies; every replica takes a share of the companies."""
+    run_id = start_sync("Full sync", limit=200, since_date=date.today() - timedelta(days=365))
+    if run_id is None:
+        return {"message": "Sync already in progress", "status": run_status(db)}
     return {"message": "Sync started"}
 
 
-def get_form_description(form_type: str) -> str:
-    descriptions = {
-        "10-K": "Annual Report",
-        "10-Q": "Quarterly Report",
-        "8-K": "Current Report",
-        "4": "Insider Trading",
-        "S-1": "IPO Registration",
-        "DEF 14A": "Proxy Statement",
-        "SC 13G": "Ownership Report",
-        "SC 13D": "Ownership Report",
+@router.get("/sync-schedule")
+def get_sync_schedule(db: Session = Depends(get_db)):
+    """Each company's popularity score, sync tier and next due time."""
+    return {
+        "tiers": [
+            {"name": t.name, "interval_minutes": int(t.interval.total_seconds() // 60), "min_score": t.min_score}
+            for t in SYNC_TIERS
+        ],
+        "companies": [asdict(p) for p in company_priorities(db)],
     }
-    return descriptions.get(form_type, form_type)
+
+
+@router.get("/summary-queue")
+def get_summary_queue(db: Session = Depends(get_db)):
+    """Summary queue depth by status, throughput and recent failures."""
+    return {**queue_stats(db), "workers": summary_workers.describe()}
+
+
+@router.post("/summary-queue/retry-failed")
+def retry_failed_summaries(db: Session = Depends(get_db)):
+    """Give every failed summary job a fresh set of attempts."""
+    requeued = retry_failed(db)
+    db.commit()
+    summary_workers.wake()
+    return {"requeued": requeued}
+
+
+def resolve_tickers(
+    db: Session,
+    ticker: Optional[str],
+    tickers: Optional[List[str]],
+    watchlist_id: Optional[int],
+    current_user: Optional[User],
+) -> List[str]:
+    """`ticker`, `tickers` and the saved watchlist combined; empty means all companies."""
+    symbols = normalize_tickers(([ticker] if ticker else []) + (tickers or []))
+    if watchlist_id is not None:
+        symbols = normalize_tickers(symbols + get_owned_watchlist(db, watchlist_id, current_user).ticker_list)
+    if (tickers is not None or watchlist_id is not None) and not symbols:
+        raise HTTPException(status_code=400, detail="No tickers given")
+    if len(symbols) > MAX_WATCHLIST_TICKERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_WATCHLIST_TICKERS} tickers per timeline")
+    return symbols
+
+
+def timeline_filters(
+    symbols: List[str],
+    form_type: Optional[str],
+    exclude_form_types: Optional[List[str]],
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> TimelineFilters:
+    return TimelineFilters(
+        ticker=symbols[0] if len(symbols) == 1 else None,
+        tickers=tuple(symbols) if len(symbols) > 1 else None,
+        form_type=form_type,
+        exclude_form_types=sorted(set(exclude_form_types)) if exclude_form_types else None,
+        start_date=start_date,
+        end_date=end_date,
+    )
 
 
 @router.get("/timeline", response_model=TimelineResponse)
 def get_timeline(
+    request: Request,
     ticker: Optional[str] = Query(None, description="Filter by ticker"),
+    tickers: Optional[List[str]] = Query(
+        default=None, description=f"Watchlist of up to {MAX_WATCHLIST_TICKERS} tickers (repeat or comma-separate)"
+    ),
+    watchlist_id: Optional[int] = Query(None, description="Saved watchlist of the logged-in member"),
     form_type: Optional[str] = Query(None, description="Filter by form type"),
     exclude_form_types: Optional[List[str]] = Query(default=None, description="Form types to exclude"),
     start_date: Optional[date] = Query(None, description="Start date"),
     end_date: Optional[date] = Query(None, description="End date"),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: Literal["exact", "approx", "none"] = Query(
+        "exact", description="How to compute total: exact, approx (capped) or none"
+    ),
     db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_optional_current_user),
 ):
-    """Get timeline of filings and press releases across all companies."""
-    events: List[TimelineEvent] = []
-
-    # --- Filings ---
-    exclude_pr = exclude_form_types and "PR" in exclude_form_types
-    filing_excludes = [ft for ft in (exclude_form_types or []) if ft != "PR"]
-
-    filing_query = db.query(Filing).join(Company)
-    if ticker:
-        filing_query = filing_query.filter(Company.ticker == ticker.upper())
-    if form_type and form_type != "PR":
-        filing_query = filing_query.filter(Filing.form_type == form_type)
-    if filing_excludes:
-        filing_query = filing_query.filter(Filing.form_type.notin_(filing_excludes))
-    if start_date:
-        filing_query = filing_query.filter(Filing.filed_date >= start_date)
-    if end_date:
-        filing_query = filing_query.filter(Filing.filed_date <= end_date)
-
-    # If filtering to only PR, skip filings entirely
-    if form_type != "PR":
-        for f in filing_query.all():
-            events.append(TimelineEvent(
-                id=f.id,
-                ticker=f.company.ticker,
-                company_name=f.company.name,
-                form_type=f.form_type,
-                form_type_description=get_form_description(f.form_type),
-                filed_date=f.filed_date,
-                headline=f.headline,
-                document_url=f.document_url,
-                event_type="filing",
-            ))
-
-    # --- Press Releases ---
-    if not exclude_pr:
-        pr_query = db.query(PressRelease).join(Company)
-        if ticker:
-            pr_query = pr_query.filter(Company.ticker == ticker.upper())
-        if form_type and form_type != "PR":
-            # User is filtering to a specific filing type, skip PRs
-            pass
-        else:
-            if start_date:
-                pr_query = pr_query.filter(PressRelease.published_at >= start_date)
-            if end_date:
-                pr_query = pr_query.filter(PressRelease.published_at <= end_date)
-
-            for pr in pr_query.all():
-                events.append(TimelineEvent(
-                    id=pr.id,
-                    ticker=pr.company.ticker,
-                    company_name=pr.company.name,
-                    form_type="PR",
-                    form_type_description="News",
-                    filed_date=pr.published_at.date() if hasattr(pr.published_at, 'date') else pr.published_at,
-                    headline=pr.headline,
-                    document_url=pr.url,
-                    event_type="press_release",
-                ))
-
-    # Sort merged events by date descending, apply limit
-    events.sort(key=lambda e: e.filed_date, reverse=True)
-    total = len(events)
-    events = events[:limit]
-
-    return TimelineResponse(events=events, total=total)
+    """Get timeline of filings and press releases across all companies, newest first.
+
+    `ticker`, `tickers` and `watchlist_id` combine into one watchlist, merged
+    from each ticker's newest events. Served from the response cache until a
+    sync changes the tickers' data; supports If-None-Match.
+    """
+    try:
+        after = TimelineCursor.decode(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    symbols = resolve_tickers(db, ticker, tickers, watchlist_id, current_user)
+    for symbol in symbols:
+        traffic.record(symbol)
+
+    filters = timeline_filters(symbols, form_type, exclude_form_types, start_date, end_date)
+    params = {
+        "ticker": ",".join(symbols) or None,
+        "form_type": form_type,
+        "exclude_form_types": ",".join(filters.exclude_form_types or []) or None,
+        "start_date": start_date,
+        "end_date": end_date,
+        "limit": limit,
+        "cursor": cursor,
+        "count": count,
+    }
+    tags = [ticker_tag(s) for s in symbols] or [ALL]
+    return cached_json(request, params, tags, lambda: timeline_response(db, filters, limit, after, count))
+
+
+def timeline_response(
+    db: Session,
+    filters: TimelineFilters,
+    limit: int,
+    cursor: Optional[TimelineCursor],
+    count: str,
+) -> dict:
+    """TimelineResponse as plain dicts, straight from the row tuples."""
+    rows, next_cursor = timeline_page(db, filters, limit, cursor)
+    # Same keys, in the same order, as TimelineEvent
+    events = [
+        {
+            "id": row.id,
+            "ticker": row.ticker,
+            "company_name": row.company_name,
+            "form_type": row.form_type,
+            "form_type_description": row.form_type_description,
+            "filed_date": row.event_date,
+            "headline": row.headline,
+            "document_url": row.document_url,
+            "event_type": row.event_type,
+        }
+        for row in rows
+    ]
+    total, total_exact = timeline_total(db, filters, count)
+
+    return {
+        "events": events,
+        "total": total,
+        "total_exact": total_exact,
+        "next_cursor": next_cursor.encode() if next_cursor else None,
+    }
+
+
+@router.get("/timeline/facets", response_model=TimelineFacetsResponse)
+def get_timeline_facets(
+    request: Request,
+    ticker: Optional[str] = Query(None, description="Filter by ticker"),
+    tickers: Optional[List[str]] = Query(
+        default=None, description=f"Watchlist of up to {MAX_WATCHLIST_TICKERS} tickers (repeat or comma-separate)"
+    ),
+    watchlist_id: Optional[int] = Query(None, description="Saved watchlist of the logged-in member"),
+    form_type: Optional[str] = Query(None, description="Filter by form type"),
+    exclude_form_types: Optional[List[str]] = Query(default=None, description="Form types to exclude"),
+    start_date: Optional[date] = Query(None, description="Start date"),
+    end_date: Optional[date] = Query(None, description="End date"),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_optional_current_user),
+):
+    """Event counts by form type, month and event type for the same filters as /timeline.
+
+    Each facet ignores its own filter (form type counts ignore form_type and
+    exclude_form_types, month counts ignore the date range), so they show what
+    changing that filter would return. Cached like the timeline.
+    """
+    symbols = resolve_tickers(db, ticker, tickers, watchlist_id, current_user)
+    filters = timeline_filters(symbols, form_type, exclude_form_types, start_date, end_date)
+    params = {
+        "ticker": ",".join(symbols) or None,
+        "form_type": form_type,
+        "exclude_form_types": ",".join(filters.exclude_form_types or []) or None,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    tags = [ticker_tag(s) for s in symbols] or [ALL]
+    return cached_json(request, params, tags, lambda: timeline_facets(db, filters))
+
+
+@router.get("/search", response_model=SearchResponse)
+def search_filings(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find; end with * for a prefix"),
+    ticker: Optional[str] = Query(None, description="Filter by ticker"),
+    tickers: Optional[List[str]] = Query(
+        default=None, description=f"Watchlist of up to {MAX_WATCHLIST_TICKERS} tickers (repeat or comma-separate)"
+    ),
+    watchlist_id: Optional[int] = Query(None, description="Saved watchlist of the logged-in member"),
+    form_type: Optional[str] = Query(None, description="Filter by form type (PR for press releases)"),
+    start_date: Optional[date] = Query(None, description="Start date"),
+    end_date: Optional[date] = Query(None, description="End date"),
+    sort: Literal["relevance", "date"] = Query(SORT_RELEVANCE, description="Best matches first, or newest first"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_optional_current_user),
+):
+    """Full-text search over filing and press release headlines, summaries and filing text.
+
+    Results carry a highlighted snippet; cached like the timeline.
+    """
+    try:
+        after = SearchCursor.decode(cursor, sort) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    symbols = resolve_tickers(db, ticker, tickers, watchlist_id, current_user)
+    filters = timeline_filters(symbols, form_type, None, start_date, end_date)
+    params = {
+        "q": q.strip().lower(),
+        "ticker": ",".join(symbols) or None,
+        "form_type": form_type,
+        "start_date": start_date,
+        "end_date": end_date,
+        "sort": sort,
+        "limit": limit,
+        "cursor": cursor,
+    }
+
+    def build() -> dict:
+        try:
+            results, next_cursor = search_page(db, q, filters, limit, sort, after)
+        except InvalidQuery as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"results": results, "next_cursor": next_cursor.encode() if next_cursor else None}
+
+    tags = [ticker_tag(s) for s in symbols] or [ALL]
+    return cached_json(request, params, tags, build)
 
 
 @router.get("/{filing_id}", response_model=FilingDetail)
@@ -373,6 +286,7 @@ def get_filing(filing_id: int, db: Session = Depends(get_db)):
     filing = db.query(Filing).filter(Filing.id == filing_id).first()
     if not filing:
         raise HTTPException(status_code=404, detail="Filing not found")
+    traffic.record(filing.company.ticker)
 
     return FilingDetail(
         id=filing.id,
@@ -392,109 +306,55 @@ def get_filing(filing_id: int, db: Session = Depends(get_db)):
 
 @router.post("/fetch")
 async def fetch_filings(
-    background_tasks: BackgroundTasks,
     ticker: Optional[str] = Query(None, description="Specific ticker to fetch"),
     limit: int = Query(20, ge=1, le=100),
     summarize: bool = Query(True, description="Generate AI headlines"),
-    db: Session = Depends(get_db),
 ):
     """Fetch new filings from SEC EDGAR."""
-    if ticker:
-        companies = db.query(Company).filter(Company.ticker == ticker.upper()).all()
-        if not companies:
+    companies = load_companies(ticker)
+    if not companies:
+        if ticker:
             raise HTTPException(status_code=404, detail="Company not tracked")
-    else:
-        companies = db.query(Company).all()
-        if not companies:
-            raise HTTPException(status_code=400, detail="No companies tracked")
-
-    # Fetch synchronously for now (can move to background later)
-    edgar = EdgarService()
-    summarizer = SummarizerService() if summarize else None
+        raise HTTPException(status_code=400, detail="No companies tracked")
 
-    results = {"fetched": 0, "skipped": 0, "errors": []}
-
-    for company in companies:
-        try:
-            filings = await edgar.get_company_filings(
-                cik=company.cik,
-                form_types=["10-K", "10-Q", "8-K", "4", "S-1", "DEF 14A"],
-                limit=limit,
-            )
-
-            for ef in filings:
-                # Skip if already exists
-                existing = db.query(Filing).filter(
-                    Filing.accession_number == ef.accession_number
-                ).first()
-                if existing:
-                    results["skipped"] += 1
-                    continue
-
-                # Generate headline if enabled
-                headline = None
-                if summarizer:
-                    try:
-                        text = await summarizer.fetch_filing_text(ef.document_url)
-                        headline = summarizer.generate_headline(
-                            ef.form_type,
-                            company.name,
-                            text,
-                        )
-                    except Exception as e:
-                        results["errors"].append(f"Summary failed for {ef.accession_number}: {str(e)}")
-
-                filing = Filing(
-                    company_id=company.id,
-                    accession_number=ef.accession_number,
-                    form_type=ef.form_type,
-                    filed_date=ef.filed_date,
-                    document_url=ef.document_url,
-                    headline=headline,
-                )
-                db.add(filing)
-                results["fetched"] += 1
-
-            db.commit()
-
-        except Exception as e:
-            results["errors"].append(f"Error fetching {company.ticker}: {str(e)}")
-
-    return results
+    state = new_sync_state()
+    await sync_filings(companies, state, limit=limit, summarize=summarize)
+    return {"fetched": state["fetched"], "skipped": state["skipped"], "errors": state["errors"]}
 
 
 @router.post("/resummarize")
-async def resummarize_filings(
+def resummarize_filings(
     ticker: Optional[str] = Query(None, description="Specific ticker to resummarize"),
     limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
-    """Generate AI headlines for filings that don't have them."""
-    query = db.query(Filing).join(Company).filter(Filing.headline.is_(None))
-
-    if ticker:
-        query = query.filter(Company.ticker == ticker.upper())
+    """Queue AI headlines for filings that don't have them, including previously failed ones."""
+    queued = enqueue_missing_summaries(db, ticker=ticker, limit=limit, include_failed=True)
+    db.commit()
 
-    filings = query.limit(limit).all()
+    if not queued:
+        return {"queued": 0, "message": "No filings need summarization"}
 
-    if not filings:
-        return {"summarized": 0, "errors": [], "message": "No filings need summarization"}
+    summary_workers.wake()
+    return {"queued": queued, "message": f"Queued {queued} filings for summarization"}
 
-    summarizer = SummarizerService()
-    results = {"summarized": 0, "errors": []}
 
-    for filing in filings:
-        try:
-            text = await summarizer.fetch_filing_text(filing.document_url)
-            headline = summarizer.generate_headline(
-                filing.form_type,
-                filing.company.name,
-                text,
-            )
-            filing.headline = headline
-            results["summarized"] += 1
-        except Exception as e:
-            results["errors"].append(f"Failed {filing.accession_number}: {str(e)}")
+@router.post("/news/backfill")
+def start_news_backfill(
+    background_tasks: BackgroundTasks,
+    ticker: Optional[str] = Query(None, description="Specific ticker to backfill"),
+    days: int = Query(365, ge=1, le=365, description="How far back to go (Finnhub free tier keeps 1 year)"),
+    window_days: int = Query(7, ge=1, le=30, description="Days per Finnhub request"),
+):
+    """Fetch older press releases in the background, walking back one window at a time."""
+    companies = load_companies(ticker)
+    if not companies:
+        if ticker:
+            raise HTTPException(status_code=404, detail="Company not tracked")
+        raise HTTPException(status_code=400, detail="No companies tracked")
 
-    db.commit()
-    return results
+    background_tasks.add_task(
+        backfill_news, companies, new_sync_state("Backfilling news..."), days=days, window_days=window_days
+    )
+    windows = -(-days // window_days)
+    return {"message": "News backfill started", "companies": len(companies), "requests": windows * len(companies)}
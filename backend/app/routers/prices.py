@@ -1,14 +1,21 @@
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from typing import List
-import yfinance as yf
-from datetime import datetime
+from typing import List, Optional, Union
 import logging
+from ..schemas.watchlist import MAX_WATCHLIST_TICKERS, normalize_tickers
+from ..services.candles import Candles
+from ..services.fast_json import json_response
+from ..services.prices import price_cache
+from ..services.traffic import traffic
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/prices", tags=["prices"])
 
+# max_points bounds; LTTB keeps the first and last candle and needs a bucket between
+MIN_POINTS = 3
+MAX_POINTS = 2000
+
 
 class Candle(BaseModel):
     date: str
@@ -24,38 +31,102 @@ class PriceResponse(BaseModel):
     candles: List[Candle]
 
 
-@router.get("/{ticker}", response_model=PriceResponse)
+class PriceColumns(BaseModel):
+    """The same candles as parallel arrays (format=columns), ready for charting libraries."""
+    ticker: str
+    dates: List[str]
+    open: List[float]
+    high: List[float]
+    low: List[float]
+    close: List[float]
+    volume: List[int]
+
+
+class PriceError(BaseModel):
+    ticker: str
+    status: int  # what GET /api/prices/{ticker} would have answered
+    detail: str
+
+
+class PriceBatchResponse(BaseModel):
+    prices: List[Union[PriceResponse, PriceColumns]]
+    errors: List[PriceError]
+
+
+def price_payload(ticker: str, candles: Candles, format: str) -> dict:
+    if format == "columns":
+        return {"ticker": ticker, **candles.columns()}
+    return {"ticker": ticker, "candles": candles.rows()}
+
+
+@router.get("/batch", response_model=PriceBatchResponse)
+async def get_batch_prices(
+    tickers: List[str] = Query(..., description="Comma-separated or repeated"),
+    period: str = Query(default="1y", pattern="^(1mo|3mo|6mo|1y|2y|5y)$"),
+    format: str = Query(default="rows", pattern="^(rows|columns)$"),
+    max_points: Optional[int] = Query(default=None, ge=MIN_POINTS, le=MAX_POINTS),
+):
+    """
+    Prices for up to 50 tickers (a whole watchlist) in one request.
+
+    Tickers the cache and candle store can't answer are downloaded from
+    Yahoo together. A ticker that fails is listed under errors, with the
+    status its own request would have returned, and the rest are still served.
+    """
+    symbols = normalize_tickers(tickers)
+    if not symbols:
+        raise HTTPException(status_code=400, detail="No tickers given")
+    if len(symbols) > MAX_WATCHLIST_TICKERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_WATCHLIST_TICKERS} tickers per request")
+
+    for symbol in symbols:
+        traffic.record(symbol)
+    results = await price_cache.get_many(symbols, period, max_points)
+
+    prices, errors = [], []
+    for symbol in symbols:
+        result = results[symbol]
+        if isinstance(result, Exception):
+            logger.error(f"Error fetching prices for {symbol}: {result}")
+            errors.append({"ticker": symbol, "status": 500, "detail": f"Failed to fetch price data: {result}"})
+        elif not result:
+            errors.append({"ticker": symbol, "status": 404, "detail": f"No price data found for {symbol}"})
+        else:
+            prices.append(price_payload(symbol, result, format))
+    return json_response({"prices": prices, "errors": errors})
+
+
+@router.get("/{ticker}", response_model=Union[PriceResponse, PriceColumns])
 async def get_prices(
     ticker: str,
     period: str = Query(default="1y", pattern="^(1mo|3mo|6mo|1y|2y|5y)$"),
+    format: str = Query(default="rows", pattern="^(rows|columns)$"),
+    max_points: Optional[int] = Query(default=None, ge=MIN_POINTS, le=MAX_POINTS),
 ):
     """
     Get historical OHLCV price data for a ticker.
 
     Period options: 1mo, 3mo, 6mo, 1y, 2y, 5y
+
+    format=columns returns {dates, open, high, low, close, volume} arrays
+    instead of one object per candle; a 5y response is about half the size.
+
+    max_points caps the number of candles for charts narrower than the
+    history: closes are picked with LTTB so the line keeps its shape, and
+    each returned candle aggregates the days it stands for (first open,
+    highest high, lowest low, total volume).
+
+    Read from the local candle store (price_candles), topped up from Yahoo
+    with just the missing days once the market has moved, and held in
+    memory in between.
     """
+    traffic.record(ticker)
     try:
-        stock = yf.Ticker(ticker.upper())
-        hist = stock.history(period=period)
-
-        if hist.empty:
-            raise HTTPException(status_code=404, detail=f"No price data found for {ticker}")
-
-        candles = []
-        for date, row in hist.iterrows():
-            candles.append(Candle(
-                date=date.strftime("%Y-%m-%d"),
-                open=round(row["Open"], 2),
-                high=round(row["High"], 2),
-                low=round(row["Low"], 2),
-                close=round(row["Close"], 2),
-                volume=int(row["Volume"]),
-            ))
-
-        return PriceResponse(ticker=ticker.upper(), candles=candles)
-
-    except HTTPException:
-        raise
+        candles = await price_cache.get(ticker, period, max_points)
     except Exception as e:
         logger.error(f"Error fetching prices for {ticker}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch price data: {str(e)}")
+
+    if not candles:
+        raise HTTPException(status_code=404, detail=f"No price data found for {ticker}")
+    return json_response(price_payload(ticker.upper(), candles, format))
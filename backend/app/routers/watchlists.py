@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..models import User, Watchlist
+from ..schemas import WatchlistRequest, WatchlistResponse
+from ..services.auth import require_current_user
+
+router = APIRouter(prefix="/api/watchlists", tags=["watchlists"])
+
+
+def get_owned_watchlist(db: Session, watchlist_id: int, user: User | None) -> Watchlist:
+    """The watchlist if `user` owns it; 404 otherwise, so ids of other members' lists don't leak."""
+    watchlist = db.query(Watchlist).filter(Watchlist.id == watchlist_id).first()
+    if not watchlist or not user or watchlist.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Watchlist not found")
+    return watchlist
+
+
+def serialize_watchlist(watchlist: Watchlist) -> WatchlistResponse:
+    return WatchlistResponse(
+        id=watchlist.id,
+        name=watchlist.name,
+        tickers=watchlist.ticker_list,
+        created_at=watchlist.created_at,
+    )
+
+
+@router.get("", response_model=list[WatchlistResponse])
+def list_watchlists(db: Session = Depends(get_db), current_user: User = Depends(require_current_user)):
+    """The current member's watchlists; pass an id as watchlist_id to /api/filings/timeline."""
+    watchlists = db.query(Watchlist).filter(Watchlist.user_id == current_user.id).order_by(Watchlist.name)
+    return [serialize_watchlist(w) for w in watchlists]
+
+
+@router.post("", response_model=WatchlistResponse)
+def create_watchlist(
+    payload: WatchlistRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_current_user),
+):
+    watchlist = Watchlist(user_id=current_user.id, name=payload.name, tickers=",".join(payload.tickers))
+    db.add(watchlist)
+    db.commit()
+    db.refresh(watchlist)
+    return serialize_watchlist(watchlist)
+
+
+@router.put("/{watchlist_id}", response_model=WatchlistResponse)
+def update_watchlist(
+    watchlist_id: int,
+    payload: WatchlistRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_current_user),
+):
+    watchlist = get_owned_watchlist(db, watchlist_id, current_user)
+    watchlist.name = payload.name
+    watchlist.tickers = ",".join(payload.tickers)
+    db.commit()
+    db.refresh(watchlist)
+    return serialize_watchlist(watchlist)
+
+
+@router.delete("/{watchlist_id}")
+def delete_watchlist(
+    watchlist_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_current_user),
+):
+    db.delete(get_owned_watchlist(db, watchlist_id, current_user))
+    db.commit()
+    return {"success": True}
@@ -1,11 +1,13 @@
 from .company import CompanyCreate, CompanyResponse
-from .filing import FilingResponse, FilingDetail, TimelineResponse
+from .filing import FilingResponse, FilingDetail, SearchResponse, TimelineFacetsResponse, TimelineResponse
 from .auth import AuthSessionResponse, LoginRequest, RegisterRequest, UserResponse
 from .bear_vs_bull import BearVsBullArgumentResponse, BearVsBullCreateRequest, BearVsBullResponse, BearVsBullVoteRequest
+from .watchlist import WatchlistRequest, WatchlistResponse
 
 __all__ = [
     "CompanyCreate", "CompanyResponse",
-    "FilingResponse", "FilingDetail", "TimelineResponse",
+    "FilingResponse", "FilingDetail", "SearchResponse", "TimelineFacetsResponse", "TimelineResponse",
     "AuthSessionResponse", "LoginRequest", "RegisterRequest", "UserResponse",
     "BearVsBullArgumentResponse", "BearVsBullCreateRequest", "BearVsBullResponse", "BearVsBullVoteRequest",
+    "WatchlistRequest", "WatchlistResponse",
 ]
@@ -41,4 +41,39 @@ class TimelineEvent(BaseModel):
 
 class TimelineResponse(BaseModel):
     events: List[TimelineEvent]
+    total: Optional[int] = None  # None when count=none
+    total_exact: bool = True
+    next_cursor: Optional[str] = None  # pass as `cursor` for the next page
+
+
+class SearchResult(TimelineEvent):
+    snippet: Optional[str] = None  # HTML-escaped text with matches in <mark> tags
+    score: Optional[float] = None  # higher is more relevant; None for sort=date
+
+
+class SearchResponse(BaseModel):
+    results: List[SearchResult]
+    next_cursor: Optional[str] = None  # pass as `cursor` for the next page
+
+
+class FormTypeFacet(BaseModel):
+    form_type: str
+    form_type_description: str
+    count: int
+
+
+class MonthFacet(BaseModel):
+    month: str  # "2025-01"
+    count: int
+
+
+class EventTypeFacet(BaseModel):
+    event_type: str
+    count: int
+
+
+class TimelineFacetsResponse(BaseModel):
     total: int
+    form_types: List[FormTypeFacet]  # most events first
+    months: List[MonthFacet]  # newest first
+    event_types: List[EventTypeFacet]
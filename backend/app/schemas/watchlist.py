@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field, field_validator
+
+# Larger lists should use the all-companies timeline
+MAX_WATCHLIST_TICKERS = 50
+
+
+def normalize_tickers(values: list[str]) -> list[str]:
+    """Upper-cased, de-duplicated and sorted; comma-separated entries are split."""
+    return sorted({t.strip().upper() for value in values for t in value.split(",") if t.strip()})
+
+
+class WatchlistRequest(BaseModel):
+    name: str = Field(min_length=1, max_length=100)
+    tickers: list[str] = Field(min_length=1)
+
+    @field_validator("name")
+    @classmethod
+    def normalize_name(cls, value: str) -> str:
+        return value.strip()
+
+    @field_validator("tickers")
+    @classmethod
+    def normalize_ticker_list(cls, value: list[str]) -> list[str]:
+        tickers = normalize_tickers(value)
+        if not tickers:
+            raise ValueError("A watchlist needs at least one ticker")
+        if len(tickers) > MAX_WATCHLIST_TICKERS:
+            raise ValueError(f"A watchlist can hold at most {MAX_WATCHLIST_TICKERS} tickers")
+        return tickers
+
+
+class WatchlistResponse(BaseModel):
+    id: int
+    name: str
+    tickers: list[str]
+    created_at: datetime
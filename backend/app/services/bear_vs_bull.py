@@ -3,7 +3,8 @@ import hashlib
 import re
 
 from fastapi import HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, contains_eager
 
 from ..models import BearVsBullArgument, BearVsBullPost, BearVsBullVote, Company, User
 from .auth import build_member_label
@@ -48,11 +49,17 @@ TEMPLATES = {
 
 
 def ensure_seed_data(db: Session) -> None:
-    companies = db.query(Company).order_by(Company.ticker.asc()).all()
+    # Argument counts for every company in one grouped query
+    rows = (
+        db.query(Company, func.count(BearVsBullArgument.id))
+        .outerjoin(BearVsBullArgument, BearVsBullArgument.company_id == Company.id)
+        .group_by(Company.id)
+        .order_by(Company.ticker.asc())
+        .all()
+    )
     created = False
 
-    for company in companies:
-        existing_count = db.query(BearVsBullArgument).filter(BearVsBullArgument.company_id == company.id).count()
+    for company, existing_count in rows:
         if existing_count >= 2:
             continue
 
@@ -238,8 +245,8 @@ def build_bear_vs_bull_response(
 ) -> dict:
     ensure_seed_data(db)
 
-    argument_query = db.query(BearVsBullArgument).join(Company)
-    post_query = db.query(BearVsBullPost).join(Company)
+    argument_query = db.query(BearVsBullArgument).join(Company).options(contains_eager(BearVsBullArgument.company))
+    post_query = db.query(BearVsBullPost).join(Company).options(contains_eager(BearVsBullPost.company))
     if ticker:
         ticker_value = ticker.upper()
         argument_query = argument_query.filter(Company.ticker == ticker_value)
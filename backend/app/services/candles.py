@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, List
+
+import numpy as np
+
+
+def _cents(values) -> np.ndarray:
+    """Rounded to cents the way Python's round() does it.
+
+    np.round scales by 100 first, which can tip values a hair away from a
+    half cent the other way; those few are redone one by one.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6):
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the `threshold` points Largest-Triangle-Three-Buckets keeps.
+
+    The first and last points always stay. The points between are split
+    into threshold - 2 equal buckets, and each bucket keeps the point
+    spanning the largest triangle with the point kept before it and the
+    average of the next bucket. Bucket averages and areas are whole-array
+    operations; only the walk from bucket to bucket is a Python loop,
+    because each choice depends on the previous one.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes
+    # The bucket after the last is the last point itself
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    # Plain Python scalars in the loop; NumPy scalar arithmetic costs more than the tiny bucket slices
+    edges, next_x, next_y = edges.tolist(), next_x.tolist(), next_y.tolist()
+    xs, ys = x.tolist(), y.tolist()
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = xs[a], ys[a]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(area.argmax())
+        kept.append(a)
+    kept.append(n - 1)
+    return np.array(kept, dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class Candles:
+    """Daily OHLCV bars as NumPy columns, oldest first, prices rounded to cents.
+
+    Slicing returns views, and both response shapes are built from whole
+    columns, so no per-candle Python object exists until JSON encoding
+    needs one (the row shape) or at all (the columnar shape: orjson
+    writes float64/int64 arrays directly).
+    """
+
+    dates: np.ndarray  # datetime64[D]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray  # int64
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "Candles":
+        """From (day, open, high, low, close, volume) tuples, e.g. straight from a query."""
+        columns = list(zip(*rows))
+        if not columns:
+            return EMPTY
+        day, o, h, lo, c, v = columns
+        return cls(
+            dates=np.array(day, dtype="datetime64[D]"),
+            open=_cents(o),
+            high=_cents(h),
+            low=_cents(lo),
+            close=_cents(c),
+            volume=np.array(v, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def since(self, start: date) -> "Candles":
+        i = int(np.searchsorted(self.dates, np.datetime64(start, "D")))
+        return Candles(
+            self.dates[i:], self.open[i:], self.high[i:], self.low[i:], self.close[i:], self.volume[i:],
+        )
+
+    def downsample(self, max_points: int) -> "Candles":
+        """At most `max_points` candles that keep the shape of the chart.
+
+        LTTB picks which closes to keep (by date), and each kept candle
+        absorbs the ones since the previous kept candle: open of the first,
+        highest high, lowest low, summed volume. So the close line keeps its
+        peaks and troughs and no high or low is lost.
+        """
+        if len(self) <= max_points:
+            return self
+        kept = lttb_indices(self.dates.astype(np.int64).astype(np.float64), self.close, max_points)
+        starts = np.concatenate(([0], kept[:-1] + 1))
+        return Candles(
+            dates=self.dates[kept],
+            open=self.open[starts],
+            high=np.maximum.reduceat(self.high, starts),
+            low=np.minimum.reduceat(self.low, starts),
+            close=self.close[kept],
+            volume=np.add.reduceat(self.volume, starts),
+        )
+
+    def rows(self) -> List[dict]:
+        """One dict per candle, shaped like the API's Candle."""
+        return [
+            {"date": d, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+            for d, o, h, lo, c, v in zip(
+                np.datetime_as_string(self.dates, unit="D").tolist(),
+                self.open.tolist(), self.high.tolist(), self.low.tolist(), self.close.tolist(),
+                self.volume.tolist(),
+            )
+        ]
+
+    def columns(self) -> dict:
+        """Parallel arrays, shaped like the API's PriceColumns minus the ticker."""
+        return {
+            "dates": np.datetime_as_string(self.dates, unit="D").tolist(),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        }
+
+
+EMPTY = Candles(
+    dates=np.array([], dtype="datetime64[D]"),
+    open=np.array([], dtype=np.float64),
+    high=np.array([], dtype=np.float64),
+    low=np.array([], dtype=np.float64),
+    close=np.array([], dtype=np.float64),
+    volume=np.array([], dtype=np.int64),
+)
@@ -0,0 +1,117 @@
+import gzip
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Preferred first; brotli is ~15-20% smaller than gzip on our JSON
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+
+# Per-request compression has to be cheap; cached bodies are compressed once and reused
+FAST_LEVELS = {"br": 4, "gzip": 6}
+CACHED_LEVELS = {"br": 9, "gzip": 9}
+
+settings = get_settings()
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Best encoding we support from an Accept-Encoding header, or None for identity."""
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, levels: dict = FAST_LEVELS) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=levels["br"])
+    # mtime=0 keeps the output (and anything hashed from it) deterministic
+    return gzip.compress(body, compresslevel=levels["gzip"], mtime=0)
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";")[0].strip().lower()
+    return (
+        content_type.startswith("text/")
+        or content_type in ("application/json", "application/javascript", "image/svg+xml")
+        or content_type.endswith("+json")
+    )
+
+
+class CompressionMiddleware:
+    """gzip/brotli for response bodies of at least `minimum_size` bytes.
+
+    Responses that already negotiated an encoding (Content-Encoding or
+    Vary: Accept-Encoding set, as cached_json does with its precompressed
+    bodies) and streamed responses are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = settings.compression_min_bytes):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            passthrough = True  # only the first body message is ever considered
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or start["status"] in (204, 206, 304)
+                or "content-encoding" in headers
+                or "accept-encoding" in headers.get("vary", "").lower()
+                or not is_compressible(headers.get("content-type", ""))
+                or len(body) < self.minimum_size
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if encoding:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
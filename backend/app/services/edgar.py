@@ -1,9 +1,10 @@
-import httpx
 import time
 from datetime import date, datetime
 from typing import List, Optional, Dict
 from dataclasses import dataclass
 
+from .http_clients import async_client
+
 
 @dataclass
 class EdgarFiling:
@@ -14,6 +15,14 @@ class EdgarFiling:
     description: str
 
 
+@dataclass
+class SubmissionsResult:
+    filings: List[EdgarFiling]
+    latest_accession: Optional[str]  # newest accession of any form type
+    last_modified: Optional[str]
+    not_modified: bool = False
+
+
 @dataclass
 class TickerInfo:
     ticker: str
@@ -47,7 +56,7 @@ class TickerLookup:
     async def _ensure_loaded(self):
         if self._tickers and (time.time() - self._loaded_at) < self.CACHE_TTL:
             return
-        async with httpx.AsyncClient() as client:
+        async with async_client() as client:
             response = await client.get(self.TICKERS_URL, headers=self.HEADERS, timeout=30.0)
             response.raise_for_status()
             data = response.json()
@@ -118,17 +127,61 @@ class EdgarService:
         since_date: Optional[date] = None,
     ) -> List[EdgarFiling]:
         """Fetch recent filings for a company."""
+        result = await self.get_new_filings(cik, form_types, limit, since_date)
+        return result.filings
+
+    async def get_new_filings(
+        self,
+        cik: str,
+        form_types: List[str] = None,
+        limit: int = 50,
+        since_date: Optional[date] = None,
+        after_accession: Optional[str] = None,
+        if_modified_since: Optional[str] = None,
+    ) -> SubmissionsResult:
+        """Fetch filings newer than a watermark.
+
+        Sends If-Modified-Since so unchanged companies cost a 304, and stops
+        walking the feed at `after_accession`. With a watermark `limit` does
+        not apply: the returned latest_accession moves the watermark past
+        everything newer, so every filing up to it must be returned.
+        """
         cik_padded = self._format_cik(cik)
         url = f"{self.SUBMISSIONS_URL}/CIK{cik_padded}.json"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.HEADERS, timeout=30.0)
+        headers = dict(self.HEADERS)
+        if if_modified_since:
+            headers["If-Modified-Since"] = if_modified_since
+
+        async with async_client() as client:
+            response = await client.get(url, headers=headers, timeout=30.0)
+            if response.status_code == 304:
+                return SubmissionsResult(
+                    filings=[],
+                    latest_accession=after_accession,
+                    last_modified=if_modified_since,
+                    not_modified=True,
+                )
             response.raise_for_status()
             data = response.json()
 
-        filings = []
         recent = data.get("filings", {}).get("recent", {})
+        accession_numbers = recent.get("accessionNumber", [])
+        return SubmissionsResult(
+            filings=self._parse_recent(cik, recent, form_types, limit, since_date, after_accession),
+            latest_accession=accession_numbers[0] if accession_numbers else after_accession,
+            last_modified=response.headers.get("Last-Modified"),
+        )
 
+    def _parse_recent(
+        self,
+        cik: str,
+        recent: dict,
+        form_types: Optional[List[str]],
+        limit: int,
+        since_date: Optional[date],
+        after_accession: Optional[str],
+    ) -> List[EdgarFiling]:
+        filings = []
         if not recent:
             return filings
 
@@ -139,6 +192,11 @@ class EdgarService:
         primary_docs = recent.get("primaryDocument", [])
 
         for i in range(len(accession_numbers)):
+            accession = accession_numbers[i]
+            # Everything from the watermark on was handled by an earlier sync
+            if after_accession and accession == after_accession:
+                break
+
             filed_date_str = filing_dates[i] if i < len(filing_dates) else ""
             try:
                 filed_date = datetime.strptime(filed_date_str, "%Y-%m-%d").date()
@@ -153,7 +211,6 @@ class EdgarService:
             if form_types and form_type not in form_types:
                 continue
 
-            accession = accession_numbers[i]
             accession_no_dash = accession.replace("-", "")
             primary_doc = primary_docs[i] if i < len(primary_docs) else ""
             doc_url = f"{self.BASE_URL}/Archives/edgar/data/{cik}/{accession_no_dash}/{primary_doc}"
@@ -167,9 +224,8 @@ class EdgarService:
                 description=description,
             ))
 
-            if len(filings) >= limit:
+            # A watermarked walk is bounded by the watermark instead
+            if not after_accession and len(filings) >= limit:
                 break
 
         return filings
-
-
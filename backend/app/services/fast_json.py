@@ -0,0 +1,28 @@
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+# UTC datetimes end in "Z" like Pydantic's; numpy scalars from pandas rows are accepted
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode plain dicts/lists (dates, datetimes and numpy scalars included) with orjson."""
+    return orjson.dumps(payload, default=_default, option=OPTIONS)
+
+
+def json_response(payload: Any, headers: Optional[dict] = None) -> Response:
+    """JSON response that skips FastAPI's response_model validation pass.
+
+    The route keeps its response_model for the OpenAPI schema, so `payload`
+    must already have exactly that shape (same keys, JSON-compatible values).
+    """
+    return Response(content=dumps(payload), media_type="application/json", headers=headers)
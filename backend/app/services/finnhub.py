@@ -4,12 +4,15 @@ from dataclasses import dataclass
 from datetime import date
 from typing import List
 
-import httpx
-
 from ..config import get_settings
+from .http_clients import async_client
+from .rate_limits import finnhub_limiter
 
 logger = logging.getLogger(__name__)
 
+RATE_LIMIT_RETRIES = 2
+RATE_LIMIT_BACKOFF_SECONDS = 5
+
 
 @dataclass
 class FinnhubNewsItem:
@@ -33,7 +36,7 @@ class FinnhubService:
         from_date: date,
         to_date: date,
     ) -> List[FinnhubNewsItem]:
-        """Fetch company news from Finnhub."""
+        """Fetch company news from Finnhub, within the shared per-minute request budget."""
         if not self.api_key:
             logger.warning("FINNHUB_API_KEY not set, skipping news fetch")
             return []
@@ -46,8 +49,17 @@ class FinnhubService:
             "token": self.api_key,
         }
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.get(url, params=params)
+        async with async_client(timeout=30) as client:
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                # Shared by every concurrent caller in the process
+                await finnhub_limiter().acquire()
+                resp = await client.get(url, params=params)
+                if resp.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                    break
+                # Another process is spending the same key's quota; back off
+                wait = float(resp.headers.get("Retry-After") or RATE_LIMIT_BACKOFF_SECONDS)
+                logger.warning(f"Finnhub rate limited for {symbol}, retrying in {wait:.0f}s")
+                await asyncio.sleep(wait)
             resp.raise_for_status()
             data = resp.json()
 
@@ -68,7 +80,4 @@ class FinnhubService:
             except (KeyError, TypeError) as e:
                 logger.debug(f"Skipping malformed news item: {e}")
 
-        # Rate limit: ~1 request per second to stay well under 60/min
-        await asyncio.sleep(1)
-
         return items
@@ -0,0 +1,30 @@
+from typing import Optional
+
+import httpx
+
+# Transports installed by tooling (e.g. the sync benchmark's record/replay
+# cassettes). None means httpx's normal network transport.
+_async_transport: Optional[httpx.AsyncBaseTransport] = None
+_sync_transport: Optional[httpx.BaseTransport] = None
+
+
+def install_transports(
+    async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    sync_transport: Optional[httpx.BaseTransport] = None,
+) -> None:
+    """Route every upstream call (EDGAR, Finnhub, Groq) through the given transports."""
+    global _async_transport, _sync_transport
+    _async_transport = async_transport
+    _sync_transport = sync_transport
+
+
+def async_client(**kwargs) -> httpx.AsyncClient:
+    """httpx.AsyncClient for upstream APIs; use instead of constructing one directly."""
+    return httpx.AsyncClient(transport=_async_transport, **kwargs)
+
+
+def sync_client(**kwargs) -> Optional[httpx.Client]:
+    """httpx.Client for SDKs that accept one (Groq). None means use the SDK's default."""
+    if _sync_transport is None:
+        return None
+    return httpx.Client(transport=_sync_transport, **kwargs)
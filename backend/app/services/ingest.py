@@ -0,0 +1,112 @@
+import logging
+from typing import Dict, Iterable, List, Set
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import Filing, PressRelease
+from .response_cache import mark_companies_changed
+from .search import index_events
+from .timeline import FILING, PRESS_RELEASE, add_filing_entries, add_press_release_entries
+
+logger = logging.getLogger(__name__)
+
+# Stay well under SQLite's bound-parameter limit for IN (...) and multi-row VALUES
+BATCH_SIZE = 500
+
+
+def _chunks(values: List, size: int = BATCH_SIZE) -> Iterable[List]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def existing_accessions(db: Session, accession_numbers: Iterable[str]) -> Set[str]:
+    """Return the subset of accession numbers already stored."""
+    found: Set[str] = set()
+    for chunk in _chunks(list(set(accession_numbers))):
+        rows = db.query(Filing.accession_number).filter(Filing.accession_number.in_(chunk))
+        found.update(accession for (accession,) in rows)
+    return found
+
+
+def existing_finnhub_ids(db: Session, finnhub_ids: Iterable[int]) -> Set[int]:
+    """Return the subset of Finnhub news ids already stored."""
+    found: Set[int] = set()
+    for chunk in _chunks(list(set(finnhub_ids))):
+        rows = db.query(PressRelease.finnhub_id).filter(PressRelease.finnhub_id.in_(chunk))
+        found.update(finnhub_id for (finnhub_id,) in rows)
+    return found
+
+
+def insert_ignoring_conflicts(db: Session, model, key: str, rows: List[dict]) -> Dict:
+    """Insert rows, skipping any whose `key` already exists. Returns {key: id} for inserted rows.
+
+    Uses INSERT ... ON CONFLICT DO NOTHING, so two syncs racing on the same
+    company skip each other's rows instead of failing the whole batch on the
+    unique constraint. Does not commit; callers decide the transaction boundary.
+    """
+    unique_rows: Dict = {}
+    for row in rows:
+        unique_rows.setdefault(row[key], row)
+    rows = list(unique_rows.values())
+    if not rows:
+        return {}
+
+    key_column = getattr(model, key)
+    dialect = db.get_bind().dialect.name
+    inserted: Dict = {}
+
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        for chunk in _chunks(rows):
+            stmt = (
+                dialect_insert(model)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[key])
+                .returning(model.id, key_column)
+            )
+            for row_id, row_key in db.execute(stmt):
+                inserted[row_key] = row_id
+        return inserted
+
+    # Other dialects: one savepoint per row so a conflict only skips that row
+    for row in rows:
+        try:
+            with db.begin_nested():
+                result = db.execute(insert(model).values(row).returning(model.id))
+                inserted[row[key]] = result.scalar_one()
+        except IntegrityError:
+            logger.debug(f"Skipping existing {model.__tablename__} row {row[key]}")
+    return inserted
+
+
+def _inserted_rows(rows: List[dict], key: str, inserted: Dict) -> List[dict]:
+    seen = set()
+    result = []
+    for row in rows:
+        if row[key] in inserted and row[key] not in seen:
+            seen.add(row[key])
+            result.append({**row, "id": inserted[row[key]]})
+    return result
+
+
+def insert_filings(db: Session, rows: List[dict]) -> Dict[str, int]:
+    """Bulk insert filings with their timeline entries and search documents, invalidating cached responses. Returns {accession_number: id} for rows actually inserted."""
+    inserted = insert_ignoring_conflicts(db, Filing, "accession_number", rows)
+    new_rows = _inserted_rows(rows, "accession_number", inserted)
+    add_filing_entries(db, new_rows)
+    index_events(db, FILING, [row["id"] for row in new_rows])
+    mark_companies_changed(db, [row["company_id"] for row in new_rows])
+    return inserted
+
+
+def insert_press_releases(db: Session, rows: List[dict]) -> Dict[int, int]:
+    """Bulk insert press releases with their timeline entries and search documents, invalidating cached responses. Returns {finnhub_id: id} for rows actually inserted."""
+    inserted = insert_ignoring_conflicts(db, PressRelease, "finnhub_id", rows)
+    new_rows = _inserted_rows(rows, "finnhub_id", inserted)
+    add_press_release_entries(db, new_rows)
+    index_events(db, PRESS_RELEASE, [row["id"] for row in new_rows])
+    mark_companies_changed(db, [row["company_id"] for row in new_rows])
+    return inserted
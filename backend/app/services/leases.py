@@ -0,0 +1,40 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from ..models import Lease
+from .ingest import insert_ignoring_conflicts
+
+# Identifies this process in leases held by any replica
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire_lease(db: Session, name: str, owner: str, ttl_seconds: int) -> bool:
+    """Take or renew the named lease. True if `owner` holds it afterwards. Does not commit.
+
+    The conditional UPDATE only matches a free, expired or already-owned
+    lease, so exactly one replica wins on both PostgreSQL and SQLite.
+    """
+    now = datetime.utcnow()
+    insert_ignoring_conflicts(db, Lease, "name", [{"name": name}])
+    result = db.execute(
+        update(Lease)
+        .where(
+            Lease.name == name,
+            or_(Lease.owner.is_(None), Lease.owner == owner, Lease.expires_at < now),
+        )
+        .values(owner=owner, expires_at=now + timedelta(seconds=ttl_seconds))
+    )
+    return result.rowcount == 1
+
+
+def release_lease(db: Session, name: str, owner: str) -> None:
+    db.execute(
+        update(Lease)
+        .where(Lease.name == name, Lease.owner == owner)
+        .values(owner=None, expires_at=None)
+    )
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# "pipeline.stage" running in the current task (and threads it starts), so
+# tooling can attribute HTTP requests and SQL statements to a stage
+current_stage: ContextVar[Optional[str]] = ContextVar("current_stage", default=None)
+
+# Called with each pipeline when its run finishes; used by the sync benchmark
+pipeline_listeners: List[Callable[["Pipeline"], None]] = []
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` acquisitions every `per` seconds.
+
+    One instance can be shared by several stages (and pipelines) that hit the
+    same upstream, e.g. discovery and document fetches both count against SEC's
+    request budget.
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, burst: Optional[int] = None):
+        self.rate = rate
+        self.per = per
+        self.capacity = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        # Callers reserve a token up front and the balance may go negative; each
+        # caller then sleeps until its own token has accrued. No lock is needed
+        # because nothing awaits between reading and updating the balance.
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / self.per)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens * self.per / self.rate)
+
+
+@dataclass
+class Stage:
+    """One step of a pipeline.
+
+    `handler` receives an item and returns the item to pass downstream, or None
+    to drop it. With `fan_out` the handler returns an iterable and each element
+    is forwarded separately. With `batch_size` > 1 the handler receives a list
+    of up to that many items, collected for at most `batch_seconds`.
+    """
+
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+    rate_limiter: Optional[RateLimiter] = None
+    fan_out: bool = False
+    batch_size: int = 1
+    batch_seconds: float = 0.5
+
+
+@dataclass
+class StageStats:
+    processed: int = 0
+    emitted: int = 0
+    dropped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+
+
+@dataclass
+class _Sink:
+    items: List[Any] = field(default_factory=list)
+
+    async def put(self, item: Any) -> None:
+        self.items.append(item)
+
+
+class Pipeline:
+    """Runs items through stages connected by bounded asyncio queues.
+
+    Every stage has its own worker pool, so network, CPU and LLM waits overlap
+    instead of adding up. Bounded queues give backpressure: a slow stage stalls
+    the stages in front of it rather than buffering the whole run in memory.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = 100,
+        on_error: Optional[Callable[[str, Any, Exception], None]] = None,
+        name: str = "pipeline",
+    ):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.name = name
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.stats: Dict[str, StageStats] = {stage.name: StageStats() for stage in stages}
+
+    async def run(self, source: Union[Iterable[Any], AsyncIterable[Any]]) -> List[Any]:
+        """Feed `source` through every stage and return the last stage's output.
+
+        An async iterable source is pulled only as fast as the first queue has
+        room, which lets long-running consumers (like the summary workers)
+        claim work just in time.
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        sink = _Sink()
+
+        workers = []
+        for i, stage in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(queues) else sink
+            for _ in range(max(1, stage.concurrency)):
+                workers.append(asyncio.create_task(self._work(stage, queues[i], outbox)))
+
+        try:
+            if hasattr(source, "__aiter__"):
+                async for item in source:
+                    await queues[0].put(item)
+            else:
+                for item in source:
+                    await queues[0].put(item)
+            # Each stage calls task_done only after forwarding its output, so once
+            # queue i has drained, everything bound for queue i + 1 is enqueued.
+            for queue in queues:
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for listener in pipeline_listeners:
+                listener(self)
+
+        return sink.items
+
+    async def _work(self, stage: Stage, inbox: asyncio.Queue, outbox) -> None:
+        current_stage.set(f"{self.name}.{stage.name}")
+        while True:
+            payload = await inbox.get()
+            count = 1
+            if stage.batch_size > 1:
+                payload = await self._fill_batch(stage, inbox, [payload])
+                count = len(payload)
+            try:
+                await self._process(stage, payload, count, outbox)
+            finally:
+                for _ in range(count):
+                    inbox.task_done()
+
+    async def _fill_batch(self, stage: Stage, inbox: asyncio.Queue, batch: List[Any]) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + stage.batch_seconds
+        while len(batch) < stage.batch_size:
+            if not inbox.empty():
+                batch.append(inbox.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(inbox.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _process(self, stage: Stage, payload: Any, count: int, outbox) -> None:
+        stats = self.stats[stage.name]
+        try:
+            if stage.rate_limiter:
+                await stage.rate_limiter.acquire()
+            started = time.monotonic()
+            try:
+                result = await stage.handler(payload)
+            finally:
+                stats.busy_seconds += time.monotonic() - started
+            stats.processed += count
+
+            if result is None:
+                stats.dropped += count
+                return
+            for output in (result if stage.fan_out else (result,)):
+                await outbox.put(output)
+                stats.emitted += 1
+        except Exception as e:
+            stats.failed += count
+            if self.on_error:
+                self.on_error(stage.name, payload, e)
+            else:
+                logger.error(f"Pipeline stage {stage.name} failed: {e}")
+
+    def describe(self) -> str:
+        """One-line per-stage summary for logs."""
+        return ", ".join(
+            f"{name}: {s.processed} in/{s.emitted} out/{s.failed} failed/{s.busy_seconds:.1f}s"
+            for name, s in self.stats.items()
+        )
@@ -0,0 +1,157 @@
+import logging
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, List
+
+import pandas as pd
+import yfinance as yf
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models import PriceCandle, PriceHistory
+from .candles import Candles
+from .ingest import BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Longest period /api/prices serves; a ticker's first download stores all of it
+FULL_PERIOD = "5y"
+# Refreshes download again from this many days before the last stored bar.
+# A changed close in the overlap means Yahoo re-adjusted the whole series
+# (split or dividend), so it is downloaded in full instead.
+OVERLAP_DAYS = 7
+ADJUSTMENT_TOLERANCE = 1e-4
+# Tickers per yf.download request
+DOWNLOAD_CHUNK = 100
+
+CANDLE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def download_histories(tickers: List[str], **kwargs) -> Dict[str, pd.DataFrame]:
+    """Daily bars for many tickers in one Yahoo request, keyed by ticker.
+
+    Takes yf.download's `period` or `start`. Tickers Yahoo has nothing for
+    are left out; yfinance logs their errors instead of raising.
+    """
+    frame = yf.download(tickers, group_by="ticker", auto_adjust=True, progress=False, threads=True, **kwargs)
+    histories = {}
+    if frame is None:
+        return histories
+    for ticker in tickers:
+        if isinstance(frame.columns, pd.MultiIndex):
+            if ticker not in frame.columns.get_level_values(0):
+                continue
+            history = frame[ticker]
+        else:
+            history = frame
+        # A bulk download has a row for every date any ticker traded
+        history = history.dropna(subset=["Close"])
+        if not history.empty:
+            histories[ticker] = history
+    return histories
+
+
+def _candle_rows(ticker: str, history: pd.DataFrame) -> List[dict]:
+    # Whole-column conversions; NaN volume shows up on some illiquid days
+    volume = history["Volume"].fillna(0).astype("int64")
+    return [
+        {"ticker": ticker, "day": day, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+        for day, o, h, lo, c, v in zip(
+            history.index.date,
+            history["Open"].tolist(), history["High"].tolist(), history["Low"].tolist(), history["Close"].tolist(),
+            volume.tolist(),
+        )
+    ]
+
+
+def _upsert(db: Session, model, index_elements: List[str], rows: List[dict], update_columns) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        for i in range(0, len(rows), BATCH_SIZE):
+            stmt = dialect_insert(model).values(rows[i:i + BATCH_SIZE])
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={column: stmt.excluded[column] for column in update_columns},
+            ))
+        return
+    for row in rows:
+        db.merge(model(**row))
+
+
+def _matches_stored(db: Session, ticker: str, history: pd.DataFrame, before) -> bool:
+    """Whether downloaded closes agree with the stored ones for completed days before `before`."""
+    stored = dict(
+        db.query(PriceCandle.day, PriceCandle.close)
+        .filter(PriceCandle.ticker == ticker, PriceCandle.day >= history.index.date[0], PriceCandle.day < before)
+    )
+    for day, close in zip(history.index.date, history["Close"]):
+        old = stored.get(day)
+        if old is not None and abs(close - old) > ADJUSTMENT_TOLERANCE * abs(old):
+            return False
+    return True
+
+
+def save_history(db: Session, ticker: str, history: pd.DataFrame, replace: bool) -> None:
+    """Store downloaded bars for `ticker`; `replace` drops everything stored before. Does not commit."""
+    rows = _candle_rows(ticker, history)
+    if replace:
+        db.execute(delete(PriceCandle).where(PriceCandle.ticker == ticker))
+    _upsert(db, PriceCandle, ["ticker", "day"], rows, CANDLE_COLUMNS)
+
+    values = {"ticker": ticker, "first_day": rows[0]["day"], "last_day": rows[-1]["day"], "fetched_at": datetime.utcnow()}
+    update_columns = ["last_day", "fetched_at"] + (["first_day"] if replace else [])
+    stored = db.get(PriceHistory, ticker)
+    if stored is not None and not replace:
+        values["first_day"] = min(stored.first_day, values["first_day"])
+    _upsert(db, PriceHistory, ["ticker"], [values], update_columns)
+
+
+def refresh_histories(db: Session, tickers: List[str]) -> List[str]:
+    """Bring the stored candles for `tickers` up to date. Does not commit.
+
+    Tickers already stored get only their tail downloaded, in one request;
+    new or re-adjusted tickers get the full history in another. Returns
+    the tickers Yahoo had data for.
+    """
+    histories = {h.ticker: h for h in db.query(PriceHistory).filter(PriceHistory.ticker.in_(tickers))}
+    refreshed, full = [], [t for t in tickers if t not in histories]
+
+    tails = [t for t in tickers if t in histories]
+    if tails:
+        start = min(histories[t].last_day for t in tails) - timedelta(days=OVERLAP_DAYS)
+        downloaded = download_histories(tails, start=start)
+        for ticker in tails:
+            history = downloaded.get(ticker)
+            if history is None:
+                continue
+            if not _matches_stored(db, ticker, history, before=histories[ticker].last_day):
+                logger.info(f"Prices for {ticker} were re-adjusted, downloading the full history")
+                full.append(ticker)
+                continue
+            save_history(db, ticker, history, replace=False)
+            refreshed.append(ticker)
+
+    if full:
+        downloaded = download_histories(full, period=FULL_PERIOD)
+        for ticker in full:
+            if ticker in downloaded:
+                save_history(db, ticker, downloaded[ticker], replace=True)
+                refreshed.append(ticker)
+    return refreshed
+
+
+def stored_candles(db: Session, tickers: List[str]) -> Dict[str, Candles]:
+    """Every stored candle for each of `tickers`, oldest first; tickers with none are left out."""
+    candles = {}
+    for i in range(0, len(tickers), BATCH_SIZE):
+        rows = db.execute(
+            select(PriceCandle.ticker, PriceCandle.day, *(getattr(PriceCandle, c) for c in CANDLE_COLUMNS))
+            .where(PriceCandle.ticker.in_(tickers[i:i + BATCH_SIZE]))
+            .order_by(PriceCandle.ticker, PriceCandle.day)
+        ).all()
+        for ticker, group in groupby(rows, key=itemgetter(0)):
+            candles[ticker] = Candles.from_rows(row[1:] for row in group)
+    return candles
@@ -0,0 +1,329 @@
+import asyncio
+import calendar
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as clock, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple, Union
+from zoneinfo import ZoneInfo
+
+from ..config import get_settings
+from ..database import session_scope
+from ..models import PriceHistory
+from .candles import EMPTY, Candles
+from .price_store import DOWNLOAD_CHUNK, refresh_histories, stored_candles
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+NEW_YORK = ZoneInfo("America/New_York")
+MARKET_OPEN = clock(9, 30)
+# Yahoo's daily bar keeps moving for a few minutes after the 16:00 close
+MARKET_SETTLED = clock(16, 30)
+
+PERIOD_MONTHS = {"1mo": 1, "3mo": 3, "6mo": 6, "1y": 12, "2y": 24, "5y": 60}
+# Distinct (period, max_points) views kept per cached ticker
+DOWNSAMPLED_PER_ENTRY = 16
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    last = date(year, month + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year: int) -> Set[date]:
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _last_weekday(year, 5, 0),  # Memorial Day
+        _observed(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),
+    }
+    # New Year's Day falling on a Saturday is not observed on the Friday before
+    if date(year, 1, 1).weekday() != 5:
+        holidays.add(_observed(date(year, 1, 1)))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return holidays
+
+
+def is_trading_day(day: date) -> bool:
+    return day.weekday() < 5 and day not in nyse_holidays(day.year)
+
+
+def price_expiry(now: datetime) -> datetime:
+    """When daily candles fetched at `now` (aware) stop being current.
+
+    During a session today's bar changes, so they are kept for
+    price_ttl_open_seconds. Otherwise nothing changes until the next
+    session opens. Early closes are treated as full days, which only
+    means a few extra refreshes.
+    """
+    local = now.astimezone(NEW_YORK)
+    if is_trading_day(local.date()) and MARKET_OPEN <= local.time() < MARKET_SETTLED:
+        return now + timedelta(seconds=settings.price_ttl_open_seconds)
+
+    day = local.date()
+    if not is_trading_day(day) or local.time() >= MARKET_OPEN:
+        day += timedelta(days=1)
+        while not is_trading_day(day):
+            day += timedelta(days=1)
+    return datetime.combine(day, MARKET_OPEN, tzinfo=NEW_YORK)
+
+
+def period_start(period: str, today: date) -> date:
+    """First day of `period` ending `today`, counted in calendar months like Yahoo's ranges."""
+    months = today.year * 12 + today.month - 1 - PERIOD_MONTHS[period]
+    year, month = divmod(months, 12)
+    return date(year, month + 1, min(today.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def _expires_at(fetched_at: datetime) -> float:
+    return price_expiry(fetched_at.replace(tzinfo=timezone.utc)).timestamp()
+
+
+@dataclass
+class PriceEntry:
+    candles: Candles  # the ticker's whole stored history
+    fetched_at: float
+    expires_at: float
+    stale: bool = False  # a refresh failed and these are the last good candles
+    # Downsampled views by (period start, max_points); they go with the entry when it's refreshed
+    downsampled: "OrderedDict[Tuple[date, int], Candles]" = field(default_factory=OrderedDict)
+
+    def view(self, start: date, max_points: Optional[int] = None) -> Candles:
+        candles = self.candles.since(start)
+        if max_points is None or len(candles) <= max_points:
+            return candles
+        key = (start, max_points)
+        view = self.downsampled.get(key)
+        if view is None:
+            view = self.downsampled[key] = candles.downsample(max_points)
+            while len(self.downsampled) > DOWNSAMPLED_PER_ENTRY:
+                self.downsampled.popitem(last=False)
+        return view
+
+
+def load_histories(tickers: List[str]) -> Dict[str, Union[PriceEntry, Exception]]:
+    """Each ticker's candles from price_candles, downloading missing tails first where the market has moved.
+
+    Blocking; run it off the event loop. All tickers that are due are
+    refreshed together: one Yahoo request for the tails, one for full
+    histories. If Yahoo fails or returns nothing for a ticker (which is how
+    yfinance reports most outages), its stored candles are served as they
+    are and retried after price_error_retry_seconds. Tickers with nothing
+    stored get the exception instead, or an empty entry if Yahoo simply
+    doesn't know them.
+    """
+    with session_scope() as db:
+        fetched = dict(db.query(PriceHistory.ticker, PriceHistory.fetched_at).filter(PriceHistory.ticker.in_(tickers)))
+    now = time.time()
+    due = [t for t in tickers if t not in fetched or now >= _expires_at(fetched[t])]
+
+    failed: Dict[str, str] = {}
+    error: Optional[Exception] = None
+    if due:
+        try:
+            with session_scope() as db:
+                refreshed = set(refresh_histories(db, due))
+            failed = {t: "no data returned" for t in due if t not in refreshed}
+        except Exception as e:
+            error = e
+            failed = {t: str(e) for t in due}
+
+    now = time.time()
+    with session_scope() as db:
+        fetched = dict(db.query(PriceHistory.ticker, PriceHistory.fetched_at).filter(PriceHistory.ticker.in_(tickers)))
+        candles = stored_candles(db, list(fetched))
+
+    entries: Dict[str, Union[PriceEntry, Exception]] = {}
+    for ticker in tickers:
+        if ticker not in fetched:
+            # Unknown ticker: remember briefly so a typo doesn't hit Yahoo on every request
+            entries[ticker] = error or PriceEntry(EMPTY, now, now + settings.price_error_retry_seconds)
+            continue
+        fetched_at = fetched[ticker]
+        if ticker in failed:
+            logger.warning(f"Price refresh for {ticker} failed ({failed[ticker]}); "
+                           f"serving candles from {fetched_at:%Y-%m-%d %H:%M} UTC")
+            entries[ticker] = PriceEntry(candles[ticker], fetched_at.replace(tzinfo=timezone.utc).timestamp(),
+                                         now + settings.price_error_retry_seconds, stale=True)
+        else:
+            entries[ticker] = PriceEntry(candles[ticker], fetched_at.replace(tzinfo=timezone.utc).timestamp(),
+                                         _expires_at(fetched_at))
+    return entries
+
+
+class PriceCache:
+    """Each ticker's stored candles in memory, loaded off the event loop.
+
+    Entries live until `price_expiry` of their last refresh, and every
+    period is sliced from the same entry. Misses in one call are loaded
+    together, and a ticker already being loaded is waited on rather than
+    loaded again. If a load fails outright (the database is unreachable
+    too) the previous entry keeps being served. Only touched from the
+    event loop, so it needs no lock.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self._entries: "OrderedDict[str, PriceEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(self, ticker: str, period: str, max_points: Optional[int] = None) -> Candles:
+        """Candles for `period`, downsampled to `max_points`; empty for a ticker Yahoo doesn't know."""
+        ticker = ticker.upper()
+        result = (await self.get_many([ticker], period, max_points))[ticker]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def get_many(
+        self, tickers: List[str], period: str, max_points: Optional[int] = None,
+    ) -> Dict[str, Union[Candles, Exception]]:
+        """Candles for `period` per upper-cased ticker, or the exception that loading it raised."""
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        now = time.time()
+        entries: Dict[str, Union[PriceEntry, Exception]] = {}
+        missing = []
+        for ticker in tickers:
+            entry = self._entries.get(ticker)
+            if entry is not None and now < entry.expires_at:
+                self._entries.move_to_end(ticker)
+                self.hits += 1
+                entries[ticker] = entry
+                continue
+            self.misses += 1
+            if ticker not in self._inflight:
+                missing.append(ticker)
+
+        if missing:
+            load = asyncio.create_task(self._refresh(missing))
+            load.add_done_callback(self._retrieve)
+            for ticker in missing:
+                task = self._inflight[ticker] = asyncio.create_task(self._pick(load, ticker))
+                task.add_done_callback(lambda done, ticker=ticker: self._finished(ticker, done))
+
+        waiting = [t for t in tickers if t not in entries]
+        # A client disconnecting must not cancel loads other requests are waiting on
+        results = await asyncio.gather(*(asyncio.shield(self._inflight[t]) for t in waiting), return_exceptions=True)
+        entries.update(zip(waiting, results))
+
+        start = period_start(period, datetime.now(NEW_YORK).date())
+        return {
+            ticker: entry if isinstance(entry, Exception) else entry.view(start, max_points)
+            for ticker, entry in entries.items()
+        }
+
+    async def _refresh(self, tickers: List[str]) -> Dict[str, Union[PriceEntry, Exception]]:
+        try:
+            loaded = await asyncio.to_thread(load_histories, tickers)
+        except Exception as e:
+            loaded = {ticker: e for ticker in tickers}
+
+        for ticker, entry in loaded.items():
+            if isinstance(entry, Exception):
+                previous = self._entries.get(ticker)
+                if previous is None or not previous.candles:
+                    continue
+                logger.warning(f"Loading prices for {ticker} failed ({entry}); serving the previous candles")
+                previous.stale = True
+                previous.expires_at = time.time() + settings.price_error_retry_seconds
+                loaded[ticker] = entry = previous
+            if entry.stale:
+                self.stale_served += 1
+            self._entries[ticker] = entry
+            self._entries.move_to_end(ticker)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return loaded
+
+    @staticmethod
+    async def _pick(load: asyncio.Task, ticker: str) -> PriceEntry:
+        entry = (await load)[ticker]
+        if isinstance(entry, Exception):
+            raise entry
+        return entry
+
+    def _finished(self, ticker: str, task: asyncio.Task) -> None:
+        self._inflight.pop(ticker, None)
+        self._retrieve(task)
+
+    @staticmethod
+    def _retrieve(task: asyncio.Task) -> None:
+        if not task.cancelled():
+            task.exception()  # retrieved here, so it isn't logged as unhandled if every waiter left
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def describe(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+        }
+
+
+price_cache = PriceCache(settings.price_cache_entries)
+
+
+def warm_price_store(tickers: List[str]) -> int:
+    """Download the missing tail of every ticker whose stored candles are out of date. Blocking.
+
+    Runs after the close, so the day's requests read the finished bar
+    locally. Returns the number of tickers refreshed.
+    """
+    with session_scope() as db:
+        fetched = dict(db.query(PriceHistory.ticker, PriceHistory.fetched_at))
+    now = time.time()
+    due = [t for t in tickers if t not in fetched or now >= _expires_at(fetched[t])]
+
+    refreshed = 0
+    for i in range(0, len(due), DOWNLOAD_CHUNK):
+        chunk = due[i:i + DOWNLOAD_CHUNK]
+        try:
+            with session_scope() as db:
+                refreshed += len(refresh_histories(db, chunk))
+        except Exception as e:
+            logger.error(f"Price store refresh failed for {chunk[0]}..{chunk[-1]}: {e}")
+    return refreshed
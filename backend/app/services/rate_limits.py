@@ -0,0 +1,26 @@
+from typing import Optional
+
+from ..config import get_settings
+from .pipeline import RateLimiter
+
+_limiters: dict[str, RateLimiter] = {}
+
+
+def _shared_limiter(name: str, rate: float, per: float = 1.0, burst: Optional[int] = None) -> RateLimiter:
+    """Process-wide limiter so concurrent pipelines share one upstream budget."""
+    if name not in _limiters:
+        _limiters[name] = RateLimiter(rate, per, burst)
+    return _limiters[name]
+
+
+def sec_limiter() -> RateLimiter:
+    return _shared_limiter("sec", get_settings().sec_requests_per_second)
+
+
+def groq_limiter() -> RateLimiter:
+    return _shared_limiter("groq", 1, get_settings().groq_seconds_per_request)
+
+
+def finnhub_limiter() -> RateLimiter:
+    # Finnhub also caps bursts at 30 calls/second, so don't spend the whole minute at once
+    return _shared_limiter("finnhub", get_settings().finnhub_requests_per_minute, 60, burst=10)
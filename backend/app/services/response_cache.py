@@ -0,0 +1,241 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import session_scope
+from ..models import CacheGeneration, Company
+from .compression import CACHED_LEVELS, compress, negotiate
+from .fast_json import dumps
+
+logger = logging.getLogger(__name__)
+
+# Responses spanning every company; any change invalidates them
+ALL = "*"
+# The tracked companies list itself
+COMPANIES = "companies"
+
+
+def ticker_tag(ticker: str) -> str:
+    return f"ticker:{ticker.upper()}"
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    generations: Dict[str, int]  # generation of each tag when the body was built
+    encoded: Dict[str, bytes] = field(default_factory=dict)  # body per content encoding
+
+    def body_for(self, encoding: Optional[str]) -> bytes:
+        """The body compressed with `encoding`, compressed once and kept with the entry."""
+        if encoding is None:
+            return self.body
+        compressed = self.encoded.get(encoding)
+        if compressed is None:
+            # Two requests racing here both compress; either result is the same bytes
+            compressed = self.encoded[encoding] = compress(self.body, encoding, CACHED_LEVELS)
+        return compressed
+
+
+class ResponseCache:
+    """LRU of encoded JSON responses, invalidated by tag generations.
+
+    Every write that changes what a response shows bumps the generation of
+    its tags in cache_generations, in the same transaction (`mark_changed`).
+    A cached body is served only while all its tags are at the generation it
+    was built under. This process sees its own commits immediately and other
+    replicas' commits within `poll_seconds`.
+    """
+
+    def __init__(self, max_entries: int, poll_seconds: float):
+        self.max_entries = max_entries
+        self.poll_seconds = poll_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._generations_at = float("-inf")
+        self._lock = threading.Lock()  # sync endpoints run in the threadpool
+
+    def generations(self) -> Dict[str, int]:
+        with self._lock:
+            fresh = time.monotonic() - self._generations_at < self.poll_seconds
+            if fresh:
+                return self._generations
+        try:
+            with session_scope() as db:
+                rows = db.query(CacheGeneration.tag, CacheGeneration.generation).all()
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not refresh cache generations: {e}")
+            return self._generations
+        with self._lock:
+            # Never step back below a local bump the poll raced with
+            merged = dict(self._generations)
+            for tag, generation in rows:
+                merged[tag] = max(generation, merged.get(tag, 0))
+            self._generations = merged
+            self._generations_at = time.monotonic()
+            return merged
+
+    def snapshot(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Current generation of `tags`; take it before reading the data a response is built from."""
+        generations = self.generations()
+        return {tag: generations.get(tag, 0) for tag in tags}
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        generations = self.generations()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if any(generations.get(tag, 0) != gen for tag, gen in entry.generations.items()):
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, body: bytes, generations: Dict[str, int]) -> CachedResponse:
+        entry = CachedResponse(body=body, etag=make_etag(body), generations=generations)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Local bump after this process committed changes to `tags`."""
+        tags = set(tags)
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in [k for k, e in self._entries.items() if tags & e.generations.keys()]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations_at = float("-inf")
+
+    def describe(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+settings = get_settings()
+response_cache = ResponseCache(settings.response_cache_entries, settings.response_cache_poll_seconds)
+
+
+def mark_changed(db: Session, tickers: Iterable[str] = (), tags: Iterable[str] = ()) -> None:
+    """Bump the generations of `tickers` (and everything-tagged responses). Does not commit.
+
+    The bump commits or rolls back with the caller's data; this process's
+    cache drops the affected entries as soon as the transaction commits.
+    """
+    changed = {ticker_tag(t) for t in tickers} | set(tags)
+    if not changed:
+        return
+    changed.add(ALL)
+
+    dialect = db.get_bind().dialect.name
+    rows = [{"tag": tag, "generation": 1} for tag in sorted(changed)]
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(CacheGeneration).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["tag"],
+            set_={"generation": CacheGeneration.generation + 1},
+        ))
+    else:
+        for row in rows:
+            result = db.execute(
+                update(CacheGeneration)
+                .where(CacheGeneration.tag == row["tag"])
+                .values(generation=CacheGeneration.generation + 1)
+            )
+            if not result.rowcount:
+                db.add(CacheGeneration(**row))
+    db.info.setdefault("cache_tags", set()).update(changed)
+
+
+def mark_companies_changed(db: Session, company_ids: Iterable[int]) -> None:
+    company_ids = set(company_ids)
+    if company_ids:
+        mark_changed(db, [t for (t,) in db.query(Company.ticker).filter(Company.id.in_(company_ids))])
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        response_cache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop("cache_tags", None)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """A strong ETag names one exact byte sequence, so each encoding gets its own: "<hash>-br"."""
+    return etag if encoding is None else etag[:-1] + "-" + encoding + '"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match holds `etag` in any of its encoded variants; all carry the same JSON."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    if "*" in candidates:
+        return True
+    return any(c.strip('"').split("-", 1)[0] == etag.strip('"') for c in candidates)
+
+
+def cached_json(request: Request, params: dict, tags: Iterable[str], build: Callable[[], Any]) -> Response:
+    """Serve `build()` as JSON from the response cache, with strong per-encoding ETags and 304 support.
+
+    `build()` returns plain dicts/lists shaped like the route's response_model
+    (encoded with orjson, not validated again). `params` are the normalized
+    query parameters that, with the path, make the cache key; `tags` are
+    what the response depends on (ticker tags, ALL). Large bodies are sent
+    gzip/brotli compressed from the copy cached with the entry.
+    """
+    key = request.url.path + "?" + urlencode(sorted((k, str(v)) for k, v in params.items() if v is not None))
+    entry = response_cache.get(key)
+    status = "hit"
+    if entry is None:
+        status = "miss"
+        generations = response_cache.snapshot(tags)
+        entry = response_cache.put(key, dumps(build()), generations)
+
+    headers = {"Cache-Control": "no-cache", "X-Cache": status}
+    encoding = None
+    if len(entry.body) >= settings.compression_min_bytes:
+        headers["Vary"] = "Accept-Encoding"
+        encoding = negotiate(request.headers.get("accept-encoding", ""))
+    headers["ETag"] = _encoded_etag(entry.etag, encoding)
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=entry.body_for(encoding), media_type="application/json", headers=headers)
@@ -0,0 +1,377 @@
+import base64
+import binascii
+import html
+import json
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import (
+    BigInteger, Date, Float, Integer, and_, case, cast, column, delete, exists, func, insert, literal, literal_column, select,
+    table, tuple_, update,
+)
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import Filing, FilingText, SearchDocument, TimelineEntry
+from .timeline import FILING, PRESS_RELEASE, InvalidCursor, TimelineFilters
+
+SORT_RELEVANCE = "relevance"
+SORT_DATE = "date"
+
+# Highlight markers: control characters can't appear in escaped text, so the
+# snippet is HTML-escaped first and the markers become <mark> tags afterwards
+_START, _STOP = "\x02", "\x03"
+SNIPPET_TOKENS = 24
+
+EPOCH = date(1970, 1, 1)
+_DAY = 2 ** 32
+# Press releases sort before filings of the same day, like the timeline
+# (event_type descending): the bit makes the key more negative
+_PRESS_RELEASE_BIT = 2 ** 31
+# Larger source ids would spill into the press release bit and the day
+MAX_SOURCE_ID = _PRESS_RELEASE_BIT - 1
+
+_fts = table("search_documents_fts", column("rowid"), column("rank"))
+_search_vector = literal_column("search_documents.search_vector")
+
+_DOCUMENT_COLUMNS = [
+    "id", "event_type", "source_id", "company_id", "ticker", "company_name", "form_type",
+    "form_type_description", "event_date", "headline", "document_url", "summary", "body",
+]
+
+settings = get_settings()
+
+
+class InvalidQuery(ValueError):
+    pass
+
+
+def sort_key(event_date: date, event_type: str, source_id: int) -> int:
+    """Timeline order as one integer, smaller is newer: search_documents.id.
+
+    Negative so that newest first is ascending: FTS5 reads doclists forwards
+    lazily but has to load a term's whole doclist to walk it backwards.
+    """
+    _check_source_id(source_id)
+    return -((event_date - EPOCH).days * _DAY + (_PRESS_RELEASE_BIT if event_type == PRESS_RELEASE else 0) + source_id)
+
+
+def _check_source_id(max_source_id: Optional[int]) -> None:
+    if max_source_id is not None and max_source_id > MAX_SOURCE_ID:
+        raise ValueError(
+            f"Source id {max_source_id} does not fit the search sort key (max {MAX_SOURCE_ID}); "
+            "search_documents ids need a wider layout"
+        )
+
+
+def _sql_sort_key(dialect: str):
+    """sort_key over timeline_events columns. Callers check the source ids with _check_source_id first."""
+    if dialect == "sqlite":
+        days = cast(func.julianday(TimelineEntry.event_date) - 2440587.5, Integer)  # Julian day of 1970-01-01
+    else:
+        days = TimelineEntry.event_date - literal(EPOCH, Date)
+    press_release = case((TimelineEntry.event_type == PRESS_RELEASE, _PRESS_RELEASE_BIT), else_=0)
+    return -(cast(days, BigInteger) * _DAY + press_release + TimelineEntry.source_id)
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+    """Position after the last result: (rank, document id) for relevance, the document id for date order.
+
+    A relevance cursor also carries the candidate cutoff its first page used,
+    so documents arriving between pages can't shift the ranked window and make
+    later pages skip or repeat results. None means no cutoff applied.
+    """
+
+    sort: str
+    rank: Optional[float]
+    id: int
+    cutoff: Optional[int] = None
+
+    def encode(self) -> str:
+        raw = json.dumps([self.sort, self.rank, self.id, self.cutoff], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str, sort: str) -> "SearchCursor":
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            cursor_sort, rank, id, cutoff = json.loads(raw)
+            cursor = cls(
+                cursor_sort, None if rank is None else float(rank), int(id), None if cutoff is None else int(cutoff),
+            )
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+            raise InvalidCursor(f"Invalid cursor: {e}") from e
+        if cursor.sort != sort or (sort == SORT_RELEVANCE) != (cursor.rank is not None):
+            raise InvalidCursor(f"Cursor is not for sort={sort}")
+        return cursor
+
+
+def _fts5_phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def fts5_query(text: str, tickers: Tuple[str, ...] = ()) -> str:
+    """User input as an FTS5 query over the text columns: every word must match,
+    a trailing * makes the last a prefix. `tickers` restrict it inside the index.
+    """
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        raise InvalidQuery("Search for at least one word")
+    terms = [_fts5_phrase(word) for word in words]
+    if text.rstrip().endswith("*"):
+        terms[-1] += "*"
+    query = "{headline summary body} : (" + " ".join(terms) + ")"
+    if tickers:
+        query = "ticker : (" + " OR ".join(_fts5_phrase(t) for t in tickers) + ") AND " + query
+    return query
+
+
+def _filtered(query, filters: TimelineFilters):
+    if filters.ticker:
+        query = query.where(SearchDocument.ticker == filters.ticker.upper())
+    if filters.tickers:
+        query = query.where(SearchDocument.ticker.in_(filters.tickers))
+    if filters.form_type:
+        query = query.where(SearchDocument.form_type == filters.form_type)
+    if filters.exclude_form_types:
+        query = query.where(SearchDocument.form_type.notin_(filters.exclude_form_types))
+    if filters.start_date:
+        query = query.where(SearchDocument.event_date >= filters.start_date)
+    if filters.end_date:
+        query = query.where(SearchDocument.event_date <= filters.end_date)
+    return query
+
+
+def _result_columns():
+    return [
+        SearchDocument.source_id.label("id"),
+        SearchDocument.event_type,
+        SearchDocument.ticker,
+        SearchDocument.company_name,
+        SearchDocument.form_type,
+        SearchDocument.form_type_description,
+        SearchDocument.event_date,
+        SearchDocument.headline,
+        SearchDocument.document_url,
+    ]
+
+
+def _sqlite_query(text: str, filters: TimelineFilters, ranked: bool):
+    """Matches on the FTS5 index, with its rowid (the document id), bm25 rank and snippet.
+
+    Ticker filters go into the MATCH as well; the exact comparison still runs
+    in SQL, since tickers like BRK.B are tokenized. bm25 counts every match of
+    each word on first use, so unranked (date order) queries leave it out.
+    """
+    fts = literal_column("search_documents_fts")
+    tickers = (filters.ticker,) if filters.ticker else filters.tickers or ()
+    query = (
+        select(
+            *_result_columns(),
+            _fts.c.rowid.label("document_id"),
+            (_fts.c.rank if ranked else literal(None)).label("rank"),
+            func.snippet(fts, -1, _START, _STOP, "…", SNIPPET_TOKENS).label("snippet"),
+        )
+        .select_from(_fts.join(SearchDocument, SearchDocument.id == _fts.c.rowid))
+        .where(fts.op("MATCH")(fts5_query(text, tickers)))
+    )
+    # Order and seek on the FTS rowid so SQLite walks the index in that order
+    return query, _fts.c.rowid, _fts.c.rank
+
+
+def _postgresql_query(text: str, ranked: bool):
+    """Matches on the GIN-indexed tsvector, ranked by negated ts_rank_cd (lower is better, like bm25)."""
+    if not re.search(r"\w", text):
+        raise InvalidQuery("Search for at least one word")
+    tsquery = func.websearch_to_tsquery(literal_column("'english'"), text)
+    rank = cast(-func.ts_rank_cd(_search_vector, tsquery), Float)
+    query = (
+        select(
+            *_result_columns(),
+            SearchDocument.id.label("document_id"),
+            (rank if ranked else literal(None)).label("rank"),
+            literal(None).label("snippet"),
+        )
+        .where(_search_vector.op("@@")(tsquery))
+    )
+    return query, SearchDocument.id, rank
+
+
+def _postgresql_snippets(db: Session, text: str, document_ids: List[int]) -> dict:
+    """ts_headline is expensive, so it only runs over the page's rows."""
+    if not document_ids:
+        return {}
+    tsquery = func.websearch_to_tsquery(literal_column("'english'"), text)
+    document = func.concat_ws(" … ", SearchDocument.headline, SearchDocument.summary, SearchDocument.body)
+    options = f'StartSel="{_START}", StopSel="{_STOP}", MaxWords={SNIPPET_TOKENS}, MinWords=8, MaxFragments=2'
+    rows = db.execute(
+        select(SearchDocument.id, func.ts_headline(literal_column("'english'"), document, tsquery, options))
+        .where(SearchDocument.id.in_(document_ids))
+    )
+    return dict(rows.all())
+
+
+def _highlight(snippet: Optional[str]) -> Optional[str]:
+    if not snippet:
+        return None
+    return html.escape(snippet).replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def search_page(
+    db: Session,
+    text: str,
+    filters: TimelineFilters,
+    limit: int,
+    sort: str = SORT_RELEVANCE,
+    cursor: Optional[SearchCursor] = None,
+) -> Tuple[List[dict], Optional[SearchCursor]]:
+    """Up to `limit` matching events after `cursor`, and the cursor for the page after.
+
+    Date order walks the index newest first and stops after one page; its
+    results have no score.
+    Relevance ranks only the newest `search_rank_candidates` matches, so a
+    word found in half the corpus costs the same as a rare one; below that
+    many matches the ranking is exact. The first page fixes that window and
+    its cursor carries it to the following pages.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        query, key, rank = _sqlite_query(text, filters, ranked=sort == SORT_RELEVANCE)
+    elif dialect == "postgresql":
+        query, key, rank = _postgresql_query(text, ranked=sort == SORT_RELEVANCE)
+    else:
+        raise InvalidQuery(f"Full-text search is not available on {dialect}")
+    query = _filtered(query, filters)
+
+    if sort == SORT_DATE:
+        if cursor:
+            query = query.where(key > literal(cursor.id, BigInteger))
+        query = query.order_by(key)
+    else:
+        if cursor:
+            cutoff = cursor.cutoff
+        else:
+            cutoff = db.execute(
+                query.with_only_columns(key).order_by(key).offset(settings.search_rank_candidates - 1).limit(1)
+            ).scalar()
+        if cutoff is not None:
+            query = query.where(key <= literal(cutoff, BigInteger))
+        if cursor:
+            # Best rank first; ties newest first
+            query = query.where(tuple_(rank, key) > tuple_(literal(cursor.rank, Float), literal(cursor.id, BigInteger)))
+        query = query.order_by(rank, key)
+    rows = db.execute(query.limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if sort == SORT_RELEVANCE:
+            next_cursor = SearchCursor(sort, last.rank, last.document_id, cutoff)
+        else:
+            next_cursor = SearchCursor(sort, None, last.document_id)
+
+    snippets = {}
+    if dialect == "postgresql":
+        snippets = _postgresql_snippets(db, text, [row.document_id for row in rows])
+    results = [
+        {
+            "id": row.id,
+            "event_type": row.event_type,
+            "ticker": row.ticker,
+            "company_name": row.company_name,
+            "form_type": row.form_type,
+            "form_type_description": row.form_type_description,
+            "filed_date": row.event_date,
+            "headline": row.headline,
+            "document_url": row.document_url,
+            "snippet": _highlight(snippets.get(row.document_id, row.snippet)),
+            "score": None if row.rank is None else round(-row.rank, 6),
+        }
+        for row in rows
+    ]
+    return results, next_cursor
+
+
+def _documents_select(dialect: str):
+    """search_documents rows built from timeline_events, filing summaries and kept filing text."""
+    return (
+        select(
+            _sql_sort_key(dialect),
+            TimelineEntry.event_type,
+            TimelineEntry.source_id,
+            TimelineEntry.company_id,
+            TimelineEntry.ticker,
+            TimelineEntry.company_name,
+            TimelineEntry.form_type,
+            TimelineEntry.form_type_description,
+            TimelineEntry.event_date,
+            TimelineEntry.headline,
+            TimelineEntry.document_url,
+            Filing.summary,
+            FilingText.text,
+        )
+        .select_from(TimelineEntry)
+        .outerjoin(Filing, and_(TimelineEntry.event_type == FILING, Filing.id == TimelineEntry.source_id))
+        .outerjoin(FilingText, FilingText.filing_id == Filing.id)
+    )
+
+
+def index_events(db: Session, event_type: str, source_ids: List[int]) -> None:
+    """Index events just written to timeline_events. Does not commit."""
+    if not source_ids:
+        return
+    _check_source_id(max(source_ids))
+    source = _documents_select(db.get_bind().dialect.name).where(
+        TimelineEntry.event_type == event_type,
+        TimelineEntry.source_id.in_(source_ids),
+    )
+    db.execute(insert(SearchDocument).from_select(_DOCUMENT_COLUMNS, source))
+
+
+def update_filing_document(db: Session, filing_id: int, headline: Optional[str], text: Optional[str] = None) -> None:
+    """New headline, and cleaned text if the summarizer kept it. Does not commit."""
+    values = {"headline": headline}
+    if text:
+        existing = db.get(FilingText, filing_id)
+        if existing:
+            existing.text = text
+        else:
+            db.add(FilingText(filing_id=filing_id, text=text))
+        values["body"] = text
+    db.execute(
+        update(SearchDocument)
+        .where(SearchDocument.event_type == FILING, SearchDocument.source_id == filing_id)
+        .values(**values)
+    )
+
+
+def delete_company_documents(db: Session, company_id: int) -> None:
+    db.execute(delete(SearchDocument).where(SearchDocument.company_id == company_id))
+
+
+def rebuild_search(db: Session, company_ids: Optional[List[int]] = None) -> int:
+    """Recreate search_documents from timeline_events (rebuild that first). Does not commit."""
+    clear = delete(SearchDocument)
+    source = _documents_select(db.get_bind().dialect.name)
+    if company_ids:
+        clear = clear.where(SearchDocument.company_id.in_(company_ids))
+        source = source.where(TimelineEntry.company_id.in_(company_ids))
+    highest = select(func.max(TimelineEntry.source_id))
+    if company_ids:
+        highest = highest.where(TimelineEntry.company_id.in_(company_ids))
+    _check_source_id(db.execute(highest).scalar())
+    db.execute(clear)
+    return db.execute(insert(SearchDocument).from_select(_DOCUMENT_COLUMNS, source)).rowcount
+
+
+def ensure_search(db: Session) -> int:
+    """Index existing timeline events on first start after upgrading; a no-op once indexed."""
+    if db.query(exists().where(SearchDocument.id.isnot(None))).scalar():
+        return 0
+    if not db.query(exists().where(TimelineEntry.id.isnot(None))).scalar():
+        return 0
+    return rebuild_search(db)
@@ -1,9 +1,10 @@
 import re
-import httpx
 from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
 import warnings
 from groq import Groq
 from ..config import get_settings
+from .http_clients import async_client, sync_client
+from .rate_limits import sec_limiter
 
 # Suppress XML parsing warning
 warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
@@ -89,18 +90,27 @@ class SummarizerService:
 
     def __init__(self):
         settings = get_settings()
-        self.client = Groq(api_key=settings.groq_api_key)
+        self.client = Groq(api_key=settings.groq_api_key, http_client=sync_client())
         self.model = settings.groq_model
 
     async def fetch_filing_text(self, url: str, max_chars: int = 15000) -> str:
         """Fetch and extract clean text content from a filing document."""
-        async with httpx.AsyncClient() as client:
+        html = await self.fetch_filing_html(url)
+        text = self.clean_filing_html(html)
+        text = await self.supplement_with_exhibit(url, text)
+        return text[:max_chars]
+
+    async def fetch_filing_html(self, url: str) -> str:
+        """Download the raw HTML of a filing document."""
+        async with async_client() as client:
             response = await client.get(url, headers={
                 "User-Agent": "StockDDFinder contact@example.com"
             }, timeout=30.0)
             response.raise_for_status()
-            html = response.text
+            return response.text
 
+    def clean_filing_html(self, html: str) -> str:
+        """Extract clean text from filing HTML. CPU-bound; safe to run in a worker thread."""
         # Parse HTML and extract text
         soup = BeautifulSoup(html, 'lxml')
 
@@ -112,27 +122,31 @@ class SummarizerService:
         text = soup.get_text(separator='\n')
 
         # Clean up the text
-        text = self._clean_text(text)
+        return self._clean_text(text)
 
-        # Try to fetch exhibit/press release if main filing is sparse
-        # This is common for 8-K filings where the actual content is in an exhibit
+    async def supplement_with_exhibit(self, url: str, text: str) -> str:
+        """Append the press release exhibit when the main filing text is sparse.
+
+        This is common for 8-K filings where the actual content is in an exhibit.
+        """
         if len(text) < 2000:
-            exhibit_text = await self._try_fetch_8k_exhibit(url, client if hasattr(client, 'get') else None)
+            exhibit_text = await self._try_fetch_8k_exhibit(url)
             if exhibit_text:
                 text = text + "\n\n--- PRESS RELEASE / EXHIBIT ---\n\n" + exhibit_text
+        return text
 
-        return text[:max_chars]
-
-    async def _try_fetch_8k_exhibit(self, filing_url: str, client=None) -> str:
+    async def _try_fetch_8k_exhibit(self, filing_url: str) -> str:
         """Try to fetch the press release exhibit for an 8-K filing."""
         try:
             # Get the base directory of the filing
             base_url = filing_url.rsplit('/', 1)[0]
 
-            async with httpx.AsyncClient() as http_client:
+            async with async_client() as http_client:
                 # Get the filing index to find exhibits
                 index_url = base_url + '/'
                 try:
+                    # Both lookups are EDGAR requests, so they share its rate budget
+                    await sec_limiter().acquire()
                     index_response = await http_client.get(index_url, headers={
                         "User-Agent": "StockDDFinder research@example.com"
                     }, timeout=15.0)
@@ -180,6 +194,7 @@ class SummarizerService:
 
     async def _fetch_exhibit_content(self, client, url: str) -> str:
         """Fetch and clean exhibit content."""
+        await sec_limiter().acquire()
         try:
             response = await client.get(url, headers={
                 "User-Agent": "StockDDFinder contact@example.com"
@@ -407,18 +422,16 @@ Respond with ONLY the factual summary. No preamble."""
         return headline
 
     async def fetch_compensation_section(self, url: str, max_chars: int = 15000) -> str:
-        """Fetch DEF 14A and extract the Summary Compensation Table.
+        """Fetch DEF 14A and extract the Summary Compensation Table."""
+        html = await self.fetch_filing_html(url)
+        return self.extract_compensation_section(html, max_chars=max_chars)
+
+    def extract_compensation_section(self, html: str, max_chars: int = 15000) -> str:
+        """Extract the Summary Compensation Table from DEF 14A HTML.
 
         Tries to find the actual HTML table with salary/stock data first,
         then falls back to text extraction if no table is found.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers={
-                "User-Agent": "StockDDFinder contact@example.com"
-            }, timeout=30.0)
-            response.raise_for_status()
-            html = response.text
-
         soup = BeautifulSoup(html, 'lxml')
         for tag in soup(['script', 'style', 'meta', 'link', 'header', 'footer', 'nav', 'ix:hidden']):
             tag.decompose()
@@ -0,0 +1,269 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import Session
+
+from ..models import Company, Filing, SummaryJob
+from .ingest import insert_ignoring_conflicts
+from .response_cache import mark_changed
+from .search import update_filing_document
+from .timeline import set_filing_headline
+
+MAX_BACKOFF_SECONDS = 6 * 3600
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    job_id: int
+    attempts: int
+    filing_id: int
+    accession_number: str
+    form_type: str
+    filed_date: date
+    document_url: str
+    company_id: int
+    ticker: str
+    company_name: str
+    cik: str
+
+
+def enqueue_filings(db: Session, filing_ids: Iterable[int]) -> int:
+    """Queue filings for summarization. Filings that already have a job are left alone.
+
+    Does not commit, so callers can enqueue in the same transaction that
+    inserts the filings.
+    """
+    now = datetime.utcnow()
+    inserted = insert_ignoring_conflicts(db, SummaryJob, "filing_id", [
+        {"filing_id": filing_id, "status": "pending", "attempts": 0, "next_run_at": now}
+        for filing_id in filing_ids
+    ])
+    return len(inserted)
+
+
+def enqueue_missing_summaries(
+    db: Session,
+    ticker: Optional[str] = None,
+    limit: Optional[int] = None,
+    include_failed: bool = False,
+) -> int:
+    """Queue headline-less filings that have no job yet. Does not commit.
+
+    With `include_failed`, failed jobs for those filings get a fresh attempt
+    budget too. Form 4 filings are skipped — high volume, low value.
+    """
+    job_filter = SummaryJob.id.is_(None)
+    if include_failed:
+        job_filter = or_(job_filter, SummaryJob.status == "failed")
+    query = (
+        db.query(Filing.id)
+        .join(Company)
+        .outerjoin(SummaryJob, SummaryJob.filing_id == Filing.id)
+        .filter(Filing.headline.is_(None), Filing.form_type != "4", job_filter)
+        .order_by(Filing.filed_date.desc())
+    )
+    if ticker:
+        query = query.filter(Company.ticker == ticker.upper())
+    if limit:
+        query = query.limit(limit)
+    filing_ids = [filing_id for (filing_id,) in query.all()]
+    if not filing_ids:
+        return 0
+
+    rearmed = retry_failed(db, filing_ids) if include_failed else 0
+    return enqueue_filings(db, filing_ids) + rearmed
+
+
+def retry_failed(db: Session, filing_ids: Optional[Iterable[int]] = None) -> int:
+    """Move failed jobs back to pending with a fresh attempt budget."""
+    stmt = (
+        update(SummaryJob)
+        .where(SummaryJob.status == "failed")
+        .values(status="pending", attempts=0, next_run_at=datetime.utcnow(), last_error=None)
+    )
+    if filing_ids is not None:
+        stmt = stmt.where(SummaryJob.filing_id.in_(list(filing_ids)))
+    return db.execute(stmt).rowcount
+
+
+def _claimable(now: datetime, max_attempts: int):
+    return and_(
+        SummaryJob.attempts < max_attempts,
+        or_(
+            and_(SummaryJob.status == "pending", SummaryJob.next_run_at <= now),
+            # A worker died or was restarted mid-job; its lease has run out
+            and_(SummaryJob.status == "running", SummaryJob.lease_expires_at < now),
+        ),
+    )
+
+
+def claim_jobs(
+    db: Session,
+    owner: str,
+    limit: int,
+    lease_seconds: int,
+    max_attempts: int,
+) -> List[ClaimedJob]:
+    """Lease up to `limit` due jobs to `owner` and return them with their filing details.
+
+    PostgreSQL skips rows other workers have locked (FOR UPDATE SKIP LOCKED);
+    SQLite ignores the lock clause, so every claim is also a conditional
+    UPDATE that only succeeds if the job is still claimable.
+    """
+    now = datetime.utcnow()
+
+    # Jobs whose lease expired on their last allowed attempt will never be claimed again
+    db.execute(
+        update(SummaryJob)
+        .where(
+            SummaryJob.status == "running",
+            SummaryJob.lease_expires_at < now,
+            SummaryJob.attempts >= max_attempts,
+        )
+        .values(status="failed", last_error="Lease expired on final attempt", lease_owner=None)
+    )
+
+    candidates = (
+        db.query(SummaryJob.id)
+        .filter(_claimable(now, max_attempts))
+        .order_by(SummaryJob.next_run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    claimed = []
+    for (job_id,) in candidates:
+        result = db.execute(
+            update(SummaryJob)
+            .where(SummaryJob.id == job_id, _claimable(now, max_attempts))
+            .values(
+                status="running",
+                attempts=SummaryJob.attempts + 1,
+                lease_owner=owner,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+            )
+        )
+        if result.rowcount:
+            claimed.append(job_id)
+    if not claimed:
+        return []
+
+    rows = (
+        db.query(
+            SummaryJob.id,
+            SummaryJob.attempts,
+            Filing.id,
+            Filing.accession_number,
+            Filing.form_type,
+            Filing.filed_date,
+            Filing.document_url,
+            Company.id,
+            Company.ticker,
+            Company.name,
+            Company.cik,
+        )
+        .join(Filing, SummaryJob.filing_id == Filing.id)
+        .join(Company, Filing.company_id == Company.id)
+        .filter(SummaryJob.id.in_(claimed))
+        .all()
+    )
+    return [ClaimedJob(*row) for row in rows]
+
+
+def _leased_to(job_id: int, owner: str):
+    # A job whose lease ran out may have been claimed by another worker since
+    return and_(SummaryJob.id == job_id, SummaryJob.status == "running", SummaryJob.lease_owner == owner)
+
+
+def complete_job(
+    db: Session, job_id: int, owner: str, filing_id: int, headline: str, text: Optional[str] = None,
+) -> bool:
+    """Store the headline, and the cleaned filing text for search if given.
+
+    Does nothing and returns False if `owner` no longer holds the job's lease.
+    """
+    result = db.execute(
+        update(SummaryJob)
+        .where(_leased_to(job_id, owner))
+        .values(
+            status="done",
+            completed_at=datetime.utcnow(),
+            lease_owner=None,
+            lease_expires_at=None,
+            last_error=None,
+        )
+    )
+    if not result.rowcount:
+        return False
+    db.execute(update(Filing).where(Filing.id == filing_id).values(headline=headline))
+    set_filing_headline(db, filing_id, headline)
+    update_filing_document(db, filing_id, headline, text)
+    mark_changed(db, [t for (t,) in db.query(Company.ticker).join(Filing).filter(Filing.id == filing_id)])
+    return True
+
+
+def fail_job(db: Session, job_id: int, owner: str, error: str, max_attempts: int, backoff_seconds: int) -> bool:
+    """Reschedule with exponential backoff, or mark failed once attempts are used up.
+
+    Does nothing and returns False if `owner` no longer holds the job's lease.
+    """
+    job = db.query(SummaryJob).filter(_leased_to(job_id, owner)).with_for_update().first()
+    if job is None:
+        return False
+    job.last_error = error[:2000]
+    job.lease_owner = None
+    job.lease_expires_at = None
+    if job.attempts >= max_attempts:
+        job.status = "failed"
+        return True
+    delay = min(backoff_seconds * 2 ** max(job.attempts - 1, 0), MAX_BACKOFF_SECONDS)
+    job.status = "pending"
+    job.next_run_at = datetime.utcnow() + timedelta(seconds=delay)
+    return True
+
+
+def queue_stats(db: Session) -> Dict:
+    """Queue depth by status, due backlog and completion throughput."""
+    now = datetime.utcnow()
+    by_status = {status: 0 for status in ("pending", "running", "done", "failed")}
+    by_status.update(dict(
+        db.query(SummaryJob.status, func.count(SummaryJob.id)).group_by(SummaryJob.status).all()
+    ))
+
+    due = db.query(func.count(SummaryJob.id)).filter(
+        SummaryJob.status == "pending", SummaryJob.next_run_at <= now
+    ).scalar()
+    oldest_due = db.query(func.min(SummaryJob.next_run_at)).filter(
+        SummaryJob.status == "pending", SummaryJob.next_run_at <= now
+    ).scalar()
+    done_last_hour = db.query(func.count(SummaryJob.id)).filter(
+        SummaryJob.status == "done", SummaryJob.completed_at >= now - timedelta(hours=1)
+    ).scalar()
+    done_last_day = db.query(func.count(SummaryJob.id)).filter(
+        SummaryJob.status == "done", SummaryJob.completed_at >= now - timedelta(days=1)
+    ).scalar()
+    recent_failures = (
+        db.query(SummaryJob.filing_id, SummaryJob.attempts, SummaryJob.last_error, SummaryJob.updated_at)
+        .filter(SummaryJob.status == "failed")
+        .order_by(SummaryJob.updated_at.desc())
+        .limit(10)
+        .all()
+    )
+
+    return {
+        "depth": by_status,
+        "due": due,
+        "oldest_due_seconds": int((now - oldest_due).total_seconds()) if oldest_due else 0,
+        "throughput": {
+            "last_hour": done_last_hour,
+            "last_24h": done_last_day,
+            "per_minute_last_hour": round(done_last_hour / 60, 2),
+        },
+        "recent_failures": [
+            {"filing_id": filing_id, "attempts": attempts, "error": error}
+            for filing_id, attempts, error, _ in recent_failures
+        ],
+    }
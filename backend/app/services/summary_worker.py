@@ -0,0 +1,193 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from ..config import get_settings
+from ..database import session_scope
+from .leases import PROCESS_ID
+from .pipeline import Pipeline, Stage
+from .rate_limits import groq_limiter, sec_limiter
+from .summarizer import SummarizerService
+from .summary_queue import ClaimedJob, claim_jobs, complete_job, enqueue_missing_summaries, fail_job
+
+logger = logging.getLogger(__name__)
+
+# How long an idle worker sleeps before polling for due jobs (retries, other replicas' work)
+POLL_SECONDS = 30
+
+# 5,000 chars ≈ 1,250 tokens — enough for a good summary while
+# staying under Groq's 6,000 TPM limit
+MAX_CHARS = 5000
+
+
+@dataclass
+class SummaryWork:
+    job: ClaimedJob
+    html: Optional[str] = None
+    text: Optional[str] = None
+    search_text: Optional[str] = None
+    headline: Optional[str] = None
+
+
+class SummaryWorkerPool:
+    """Drains the summary_jobs queue in the background.
+
+    Jobs are claimed with a lease just before they enter the pipeline, so a
+    crashed or restarted process only delays its jobs until the lease runs
+    out. Failures go back to the queue with exponential backoff.
+    """
+
+    def __init__(self):
+        self.owner = PROCESS_ID
+        self.pipeline: Optional[Pipeline] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Summary workers started ({get_settings().summary_workers} workers, owner {self.owner})")
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info("Summary workers stopped")
+
+    def wake(self) -> None:
+        """Check for new jobs now instead of waiting for the next poll. Safe from any thread."""
+        if self._wake and self.running:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def describe(self) -> dict:
+        return {
+            "running": self.running,
+            "owner": self.owner,
+            "workers": get_settings().summary_workers,
+            "stages": {
+                name: {
+                    "processed": s.processed,
+                    "failed": s.failed,
+                    "busy_seconds": round(s.busy_seconds, 1),
+                }
+                for name, s in (self.pipeline.stats.items() if self.pipeline else [])
+            },
+        }
+
+    async def _claimed(self) -> AsyncIterator[SummaryWork]:
+        settings = get_settings()
+        while True:
+            try:
+                with session_scope() as db:
+                    jobs = claim_jobs(
+                        db,
+                        self.owner,
+                        limit=settings.summary_workers,
+                        lease_seconds=settings.summary_lease_seconds,
+                        max_attempts=settings.summary_max_attempts,
+                    )
+            except Exception as e:
+                logger.error(f"Summary queue claim failed: {e}")
+                jobs = []
+            if not jobs:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            for job in jobs:
+                yield SummaryWork(job=job)
+
+    async def _run(self) -> None:
+        settings = get_settings()
+        summarizer = SummarizerService()
+
+        async def fetch(work: SummaryWork) -> SummaryWork:
+            await sec_limiter().acquire()
+            work.html = await summarizer.fetch_filing_html(work.job.document_url)
+            return work
+
+        async def clean(work: SummaryWork) -> SummaryWork:
+            text = await asyncio.to_thread(summarizer.clean_filing_html, work.html)
+            text = await summarizer.supplement_with_exhibit(work.job.document_url, text)
+            work.text = text[:MAX_CHARS]
+            work.search_text = text[:settings.search_text_chars] or None
+            work.html = None
+            return work
+
+        async def summarize(work: SummaryWork) -> SummaryWork:
+            job = work.job
+            work.headline = await asyncio.to_thread(
+                summarizer.generate_headline, job.form_type, job.company_name, work.text
+            )
+            work.text = None
+            return work
+
+        async def persist(work: SummaryWork) -> SummaryWork:
+            job = work.job
+            with session_scope() as db:
+                completed = complete_job(db, job.job_id, self.owner, job.filing_id, work.headline, work.search_text)
+            if not completed:
+                logger.warning(f"Summary lease lost for job {job.job_id}; its headline was not stored")
+            return work
+
+        def on_error(stage: str, work: SummaryWork, e: Exception) -> None:
+            job = work.job
+            logger.warning(
+                f"Summary {stage} failed for {job.ticker} {job.form_type} "
+                f"(job {job.job_id}, attempt {job.attempts}): {e}"
+            )
+            with session_scope() as db:
+                fail_job(
+                    db,
+                    job.job_id,
+                    self.owner,
+                    f"{stage}: {e}",
+                    max_attempts=settings.summary_max_attempts,
+                    backoff_seconds=settings.summary_backoff_seconds,
+                )
+
+        # Pick up filings stored before the queue existed. Best effort: a
+        # failure here must not keep the workers from draining the queue
+        try:
+            with session_scope() as db:
+                queued = enqueue_missing_summaries(db)
+            if queued:
+                logger.info(f"Queued {queued} filings missing headlines")
+        except Exception as e:
+            logger.error(f"Queueing filings missing headlines failed: {e}")
+
+        # Small queues keep claims just in time, so leases don't run out
+        # while jobs wait behind the Groq rate limit
+        self.pipeline = Pipeline(
+            [
+                Stage("fetch", fetch, concurrency=settings.summary_workers),
+                Stage("clean", clean, concurrency=settings.sync_clean_concurrency),
+                Stage(
+                    "summarize",
+                    summarize,
+                    concurrency=settings.summary_workers,
+                    rate_limiter=groq_limiter(),
+                ),
+                Stage("persist", persist),
+            ],
+            queue_size=settings.summary_workers,
+            on_error=on_error,
+            name="summaries",
+        )
+        await self.pipeline.run(self._claimed())
+
+
+summary_workers = SummaryWorkerPool()
@@ -1,198 +1,567 @@
 import asyncio
 import logging
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from ..database import SessionLocal
-from ..models import Company, Filing, PressRelease, ExecutiveCompensation
+from typing import List, Optional
+
+from sqlalchemy import delete, select
+
+from ..config import get_settings
+from ..database import session_scope
+from ..models import (
+    Company,
+    CompanySyncAttempt,
+    CompanySyncState,
+    ExecCompAttempt,
+    ExecutiveCompensation,
+    Filing,
+    FilingText,
+    PressRelease,
+    SummaryJob,
+    SyncTask,
+)
 from .edgar import EdgarService
-from .finnhub import FinnhubService
+from .finnhub import FinnhubNewsItem, FinnhubService
+from .ingest import existing_accessions, existing_finnhub_ids, insert_filings, insert_press_releases
+from .pipeline import Pipeline, Stage
+from .rate_limits import groq_limiter, sec_limiter
+from .response_cache import mark_changed
 from .summarizer import SummarizerService
+from .summary_queue import enqueue_filings
+from .summary_worker import summary_workers
+from .watermarks import load_sync_states, save_sync_states
 
 logger = logging.getLogger(__name__)
 
 FORM_TYPES = ["10-K", "10-Q", "8-K", "4", "S-1", "DEF 14A"]
 
+# Persist stages write in batches: one INSERT ... ON CONFLICT per batch
+PERSIST_BATCH_SIZE = 50
+PERSIST_BATCH_SECONDS = 1.0
 
-async def sync_all_companies():
-    """Fetch new filings and press releases for all tracked companies with AI summarization."""
-    db = SessionLocal()
-    try:
-        companies = db.query(Company).all()
-        if not companies:
-            logger.info("Scheduled sync: no companies tracked, skipping")
-            return
 
-        edgar = EdgarService()
-        finnhub = FinnhubService()
-        summarizer = SummarizerService()
-        fetched = 0
-        skipped = 0
-        pr_fetched = 0
+def new_sync_state(message: str = "Starting sync...") -> dict:
+    return {
+        "running": True,
+        "fetched": 0,
+        "skipped": 0,
+        "pr_fetched": 0,
+        "errors": [],
+        "current": None,
+        "message": message,
+        "started_at": datetime.utcnow().isoformat(),
+        "completed_at": None,
+        # Company ids whose DEF 14A the filing pipeline stored in this run
+        "new_proxies": set(),
+        # fetched/skipped/pr_fetched per company id, so a distributed run can
+        # count only the companies whose task it still holds
+        "company_counts": {},
+    }
+
+
+def _count(state: dict, key: str, works: list) -> None:
+    """Add `works` (items with a .company) to state[key] and to their companies' counts."""
+    state[key] += len(works)
+    for w in works:
+        counts = state["company_counts"].setdefault(w.company.id, {})
+        counts[key] = counts.get(key, 0) + 1
+
+
+def delete_synced_data(db, company_id: int) -> None:
+    """Delete what syncs stored for a company, children before parents, so the company row can go. Does not commit.
+
+    The timeline and search copies have their own delete functions.
+    """
+    filing_ids = select(Filing.id).where(Filing.company_id == company_id).scalar_subquery()
+    for stmt in (
+        delete(SummaryJob).where(SummaryJob.filing_id.in_(filing_ids)),
+        delete(FilingText).where(FilingText.filing_id.in_(filing_ids)),
+        delete(ExecutiveCompensation).where(ExecutiveCompensation.company_id == company_id),
+        delete(ExecCompAttempt).where(ExecCompAttempt.company_id == company_id),
+        delete(Filing).where(Filing.company_id == company_id),
+        delete(PressRelease).where(PressRelease.company_id == company_id),
+        delete(CompanySyncState).where(CompanySyncState.company_id == company_id),
+        delete(CompanySyncAttempt).where(CompanySyncAttempt.company_id == company_id),
+        delete(SyncTask).where(SyncTask.company_id == company_id),
+    ):
+        db.execute(stmt)
+
+
+@dataclass(frozen=True)
+class CompanyRef:
+    """Detached snapshot of a Company, safe to carry across awaits."""
+
+    id: int
+    ticker: str
+    name: str
+    cik: str
+
+
+def load_companies(ticker: Optional[str] = None) -> List[CompanyRef]:
+    """Snapshot tracked companies in a short transaction."""
+    with session_scope() as db:
+        query = db.query(Company.id, Company.ticker, Company.name, Company.cik)
+        if ticker:
+            query = query.filter(Company.ticker == ticker.upper())
+        return [CompanyRef(*row) for row in query.all()]
+
+
+@dataclass
+class FilingWork:
+    """A filing moving through the pipeline, from discovery to persistence."""
+
+    company: CompanyRef
+    accession_number: str
+    form_type: str
+    filed_date: date
+    document_url: str
+    summarize: bool = True
+    filing_id: Optional[int] = None
+
+
+@dataclass
+class NewsWork:
+    company: CompanyRef
+    item: FinnhubNewsItem
+
+
+@dataclass
+class CompWork:
+    company: CompanyRef
+    filing_id: int
+    accession_number: str
+    document_url: str
+    filed_date: date
+    html: Optional[str] = None
+    text: Optional[str] = None
+    entries: Optional[list] = None
+
+
+def _item_companies(item) -> List[CompanyRef]:
+    items = item if isinstance(item, list) else [item]
+    return [getattr(i, "company", i) for i in items]
+
+
+def _on_stage_error(state: dict, failed: Optional[set] = None):
+    """Record a stage failure; `failed` collects company ids whose watermarks must not advance."""
+    def handle(stage: str, item, e: Exception) -> None:
+        companies = _item_companies(item)
+        if failed is not None:
+            failed.update(c.id for c in companies)
+        ticker = companies[0].ticker if companies else None
+        state["errors"].append(f"{ticker} {stage}: {str(e)}")
+        logger.error(f"Sync {stage} error for {ticker}: {e}")
+    return handle
+
+
+async def sync_filings(
+    companies: List[CompanyRef],
+    state: dict,
+    *,
+    limit: int,
+    since_date: Optional[date] = None,
+    summarize: bool = True,
+    incremental: bool = False,
+) -> Pipeline:
+    """discover -> dedupe -> persist for new EDGAR filings.
+
+    New filings are stored without a headline and, when `summarize` is set,
+    queued for the background summary workers in the same transaction.
+
+    With `incremental`, discovery stops at each company's stored watermark and
+    companies whose submissions feed is unchanged are skipped with a 304.
+    Watermarks are recorded either way, but only for companies that finished
+    without a stage error.
+    """
+    settings = get_settings()
+    edgar = EdgarService()
+    with session_scope() as db:
+        sync_states = load_sync_states(db, [c.id for c in companies])
+    watermarks: dict[int, dict] = {}
+    failed: set[int] = set()
+    queued = 0
+
+    async def discover(company: CompanyRef) -> List[FilingWork]:
+        state["current"] = company.ticker
+        state["message"] = f"Fetching filings for {company.ticker}..."
+        sync_state = sync_states.get(company.id) if incremental else None
+        result = await edgar.get_new_filings(
+            cik=company.cik,
+            form_types=FORM_TYPES,
+            limit=limit,
+            since_date=since_date,
+            after_accession=sync_state.last_accession_number if sync_state else None,
+            if_modified_since=sync_state.submissions_last_modified if sync_state else None,
+        )
+        watermarks[company.id] = {
+            "last_accession_number": result.latest_accession,
+            "submissions_last_modified": result.last_modified,
+        }
+        return [
+            FilingWork(
+                company=company,
+                accession_number=ef.accession_number,
+                form_type=ef.form_type,
+                filed_date=ef.filed_date,
+                document_url=ef.document_url,
+                # Skip Groq summarization for Form 4 — high volume, low value
+                summarize=summarize and ef.form_type != "4",
+            )
+            for ef in result.filings
+        ]
+
+    async def dedupe(batch: List[FilingWork]) -> List[FilingWork]:
+        with session_scope() as db:
+            existing = existing_accessions(db, [w.accession_number for w in batch])
+        _count(state, "skipped", [w for w in batch if w.accession_number in existing])
+        return [w for w in batch if w.accession_number not in existing]
+
+    async def persist(batch: List[FilingWork]) -> List[FilingWork]:
+        nonlocal queued
+        with session_scope() as db:
+            inserted = insert_filings(db, [
+                {
+                    "company_id": w.company.id,
+                    "accession_number": w.accession_number,
+                    "form_type": w.form_type,
+                    "filed_date": w.filed_date,
+                    "document_url": w.document_url,
+                }
+                for w in batch
+            ])
+            queued += enqueue_filings(db, [
+                inserted[w.accession_number]
+                for w in batch
+                if w.summarize and w.accession_number in inserted
+            ])
+
+        # Rows another sync inserted since dedupe count as already stored
+        _count(state, "fetched", [w for w in batch if w.accession_number in inserted])
+        _count(state, "skipped", [w for w in batch if w.accession_number not in inserted])
+        for w in batch:
+            w.filing_id = inserted.get(w.accession_number)
+            if w.filing_id is not None and w.form_type == "DEF 14A":
+                state["new_proxies"].add(w.company.id)
+        return [w for w in batch if w.filing_id is not None]
+
+    stages = [
+        Stage(
+            "discover",
+            discover,
+            concurrency=settings.sync_discover_concurrency,
+            rate_limiter=sec_limiter(),
+        ),
+        Stage("dedupe", dedupe, fan_out=True),
+        Stage(
+            "persist",
+            persist,
+            fan_out=True,
+            batch_size=PERSIST_BATCH_SIZE,
+            batch_seconds=PERSIST_BATCH_SECONDS,
+        ),
+    ]
+    pipeline = Pipeline(stages, on_error=_on_stage_error(state, failed), name="filings")
+    await pipeline.run(companies)
+    logger.info(f"Filing pipeline: {pipeline.describe()}")
+    if queued:
+        logger.info(f"Queued {queued} filings for summarization")
+        summary_workers.wake()
+
+    now = datetime.utcnow()
+    with session_scope() as db:
+        save_sync_states(db, {
+            company_id: {**marks, "last_success_at": now}
+            for company_id, marks in watermarks.items()
+            if company_id not in failed
+        })
+    return pipeline
+
+
+def _news_stages(state: dict) -> List[Stage]:
+    """dedupe -> persist for discovered press releases, shared by sync and backfill."""
+
+    async def dedupe(batch: List[NewsWork]) -> List[NewsWork]:
+        with session_scope() as db:
+            existing = existing_finnhub_ids(db, [w.item.id for w in batch])
+        return [w for w in batch if w.item.id not in existing]
+
+    async def persist(batch: List[NewsWork]) -> List[NewsWork]:
+        with session_scope() as db:
+            inserted = insert_press_releases(db, [
+                {
+                    "company_id": w.company.id,
+                    "finnhub_id": w.item.id,
+                    "headline": w.item.headline,
+                    "source": w.item.source,
+                    "url": w.item.url,
+                    "published_at": datetime.fromtimestamp(w.item.datetime),
+                }
+                for w in batch
+            ])
+        stored = [w for w in batch if w.item.id in inserted]
+        _count(state, "pr_fetched", stored)
+        return stored
+
+    return [
+        Stage("dedupe", dedupe, fan_out=True),
+        Stage(
+            "persist",
+            persist,
+            fan_out=True,
+            batch_size=PERSIST_BATCH_SIZE,
+            batch_seconds=PERSIST_BATCH_SECONDS,
+        ),
+    ]
 
-        logger.info(f"Scheduled sync: starting for {len(companies)} companies")
 
+async def sync_news(
+    companies: List[CompanyRef],
+    state: dict,
+    since_date: Optional[date] = None,
+) -> Pipeline:
+    """discover -> dedupe -> persist for Finnhub press releases.
+
+    Each company's window starts at its newest stored news item, falling back
+    to the last 7 days. Discovery runs concurrently; FinnhubService keeps the
+    requests inside the shared per-minute budget.
+    """
+    finnhub = FinnhubService()
+    with session_scope() as db:
+        sync_states = load_sync_states(db, [c.id for c in companies])
+    latest: dict[int, datetime] = {}
+    failed: set[int] = set()
+
+    async def discover(company: CompanyRef) -> List[NewsWork]:
+        sync_state = sync_states.get(company.id)
+        last_seen = sync_state.last_news_at if sync_state and since_date is None else None
+        from_date = since_date or (last_seen.date() if last_seen else date.today() - timedelta(days=7))
+
+        news_items = await finnhub.get_company_news(
+            symbol=company.ticker,
+            from_date=from_date,
+            to_date=date.today(),
+        )
+        if news_items:
+            latest[company.id] = datetime.fromtimestamp(max(item.datetime for item in news_items))
+        if last_seen:
+            # Finnhub windows are whole days; drop what we already had before the watermark
+            cutoff = last_seen.timestamp()
+            news_items = [item for item in news_items if item.datetime >= cutoff]
+        return [NewsWork(company=company, item=item) for item in news_items]
+
+    pipeline = Pipeline(
+        [
+            Stage("discover", discover, concurrency=get_settings().finnhub_concurrency),
+            *_news_stages(state),
+        ],
+        on_error=_on_stage_error(state, failed),
+        name="news",
+    )
+    await pipeline.run(companies)
+
+    updates = {}
+    for company_id, published_at in latest.items():
+        if company_id in failed:
+            continue
+        sync_state = sync_states.get(company_id)
+        if sync_state and sync_state.last_news_at and sync_state.last_news_at >= published_at:
+            continue
+        updates[company_id] = {"last_news_at": published_at}
+    with session_scope() as db:
+        save_sync_states(db, updates)
+    return pipeline
+
+
+@dataclass(frozen=True)
+class NewsWindow:
+    company: CompanyRef
+    from_date: date
+    to_date: date
+
+
+async def backfill_news(
+    companies: List[CompanyRef],
+    state: dict,
+    *,
+    days: int = 365,
+    window_days: int = 7,
+) -> Pipeline:
+    """Walk older Finnhub windows, newest first, back to `days` ago.
+
+    Short windows keep each response under Finnhub's per-call item cap.
+    Watermarks are left alone; they only track the newest item.
+    """
+    finnhub = FinnhubService()
+    oldest = date.today() - timedelta(days=days)
+
+    def windows():
         for company in companies:
-            # --- SEC filings ---
-            try:
-                filings = await edgar.get_company_filings(
-                    cik=company.cik,
-                    form_types=FORM_TYPES,
-                    limit=20,
-                )
-
-                for ef in filings:
-                    existing = db.query(Filing).filter(
-                        Filing.accession_number == ef.accession_number
-                    ).first()
-                    if existing:
-                        skipped += 1
-                        continue
-
-                    # Generate AI headline for non-Form 4 filings
-                    headline = None
-                    if ef.form_type != "4":
-                        for attempt in range(3):
-                            try:
-                                text = await summarizer.fetch_filing_text(
-                                    ef.document_url, max_chars=5000
-                                )
-                                headline = summarizer.generate_headline(
-                                    ef.form_type, company.name, text
-                                )
-                                await asyncio.sleep(22)
-                                break
-                            except Exception as e:
-                                if attempt < 2:
-                                    logger.warning(
-                                        f"Scheduled sync: summary rate limited for "
-                                        f"{company.ticker} {ef.form_type}, "
-                                        f"waiting 60s (attempt {attempt + 1}/3)"
-                                    )
-                                    await asyncio.sleep(60)
-                                else:
-                                    logger.error(
-                                        f"Scheduled sync: summary failed for "
-                                        f"{company.ticker} {ef.form_type}: {e}"
-                                    )
-
-                    db.add(Filing(
-                        company_id=company.id,
-                        accession_number=ef.accession_number,
-                        form_type=ef.form_type,
-                        filed_date=ef.filed_date,
-                        document_url=ef.document_url,
-                        headline=headline,
-                    ))
-                    fetched += 1
-
-                db.commit()
-
-            except Exception as e:
-                logger.error(f"Scheduled sync error for {company.ticker}: {e}")
-
-            # Respect SEC's 10 req/sec rate limit
-            await asyncio.sleep(0.5)
-
-            # --- Press releases from Finnhub ---
-            try:
-                since_date = date.today() - timedelta(days=7)
-                news_items = await finnhub.get_company_news(
-                    symbol=company.ticker,
-                    from_date=since_date,
-                    to_date=date.today(),
-                )
-                for item in news_items:
-                    existing_pr = db.query(PressRelease).filter(
-                        PressRelease.finnhub_id == item.id
-                    ).first()
-                    if existing_pr:
-                        continue
-                    db.add(PressRelease(
-                        company_id=company.id,
-                        finnhub_id=item.id,
-                        headline=item.headline,
-                        source=item.source,
-                        url=item.url,
-                        published_at=datetime.fromtimestamp(item.datetime),
-                    ))
-                    pr_fetched += 1
-                db.commit()
-            except Exception as e:
-                logger.error(f"Scheduled sync Finnhub error for {company.ticker}: {e}")
-
-        logger.info(
-            f"Scheduled sync complete: {fetched} new filings (with summaries), "
-            f"{skipped} already stored, {pr_fetched} press releases"
+            to_date = date.today()
+            while to_date > oldest:
+                from_date = max(to_date - timedelta(days=window_days - 1), oldest)
+                yield NewsWindow(company, from_date, to_date)
+                to_date = from_date - timedelta(days=1)
+
+    async def discover(window: NewsWindow) -> List[NewsWork]:
+        state["current"] = window.company.ticker
+        state["message"] = f"Backfilling {window.company.ticker} news from {window.from_date}..."
+        news_items = await finnhub.get_company_news(
+            symbol=window.company.ticker,
+            from_date=window.from_date,
+            to_date=window.to_date,
         )
+        return [NewsWork(company=window.company, item=item) for item in news_items]
+
+    pipeline = Pipeline(
+        [
+            Stage("discover", discover, concurrency=get_settings().finnhub_concurrency),
+            *_news_stages(state),
+        ],
+        on_error=_on_stage_error(state),
+        name="news-backfill",
+    )
+    await pipeline.run(windows())
+    logger.info(f"News backfill: {pipeline.describe()}")
+    return pipeline
 
-        # --- Executive compensation extraction ---
-        await _sync_exec_comp(db, companies)
 
-    finally:
-        db.close()
+def _proxy_pending(db, company_id: int, filing) -> bool:
+    """Whether exec comp still needs extracting from this DEF 14A.
+
+    Not if it already has rows, or an earlier attempt extracted it, found
+    nobody, or failed and is not yet due (or out of) retries.
+    """
+    if db.query(ExecutiveCompensation.id).filter(
+        ExecutiveCompensation.company_id == company_id,
+        ExecutiveCompensation.filing_id == filing.id,
+    ).first():
+        return False
+    attempt = db.query(ExecCompAttempt.status, ExecCompAttempt.next_attempt_at).filter(
+        ExecCompAttempt.accession_number == filing.accession_number
+    ).first()
+    if attempt is None:
+        return True
+    return attempt.status == "failed" and attempt.next_attempt_at is not None \
+        and attempt.next_attempt_at <= datetime.utcnow()
+
+
+def _comp_retries_due(db, company_ids: List[int]) -> set:
+    """Ids among `company_ids` with a failed exec comp extraction due for another try."""
+    return {
+        company_id for (company_id,) in db.query(ExecCompAttempt.company_id).filter(
+            ExecCompAttempt.company_id.in_(company_ids),
+            ExecCompAttempt.status == "failed",
+            ExecCompAttempt.next_attempt_at <= datetime.utcnow(),
+        )
+    }
+
 
+def _record_comp_attempt(db, work: CompWork, status: str, error: Optional[str] = None) -> None:
+    """Upsert the outcome for work's DEF 14A. Does not commit.
 
-async def _sync_exec_comp(db, companies):
-    """Extract exec comp from DEF 14A filings for companies missing data."""
+    Failures get a retry time that doubles from exec_comp_backoff_hours,
+    and none once exec_comp_max_attempts is reached.
+    """
+    settings = get_settings()
+    now = datetime.utcnow()
+    attempt = db.query(ExecCompAttempt).filter(
+        ExecCompAttempt.accession_number == work.accession_number
+    ).first()
+    if attempt is None:
+        attempt = ExecCompAttempt(accession_number=work.accession_number, company_id=work.company.id, attempts=0)
+        db.add(attempt)
+    attempt.attempts += 1
+    attempt.status = status
+    attempt.last_error = error
+    attempt.attempted_at = now
+    attempt.next_attempt_at = None
+    if status == "failed" and attempt.attempts < settings.exec_comp_max_attempts:
+        attempt.next_attempt_at = now + timedelta(
+            hours=settings.exec_comp_backoff_hours * 2 ** (attempt.attempts - 1)
+        )
+
+
+async def extract_exec_comp(companies: List[CompanyRef], results: dict) -> Pipeline:
+    """Extract exec comp from the most recent DEF 14A of companies missing data.
+
+    If a company has no DEF 14A in the database, fetches it directly from EDGAR.
+    Every extraction's outcome is recorded by accession (ExecCompAttempt), so
+    a proxy that was extracted, named nobody or keeps failing is not
+    downloaded and sent to the LLM again; failures are retried with backoff.
+    Stages: discover -> fetch -> clean -> summarize -> persist.
+    """
     edgar = EdgarService()
     summarizer = SummarizerService()
-    extracted = 0
-
-    for company in companies:
-        # Skip if already have exec comp for this company
-        existing = db.query(ExecutiveCompensation).filter(
-            ExecutiveCompensation.company_id == company.id
-        ).first()
-        if existing:
-            continue
 
-        # Find DEF 14A in database
-        filing = db.query(Filing).filter(
-            Filing.company_id == company.id,
+    def latest_proxy(db, company_id: int):
+        return db.query(Filing.id, Filing.accession_number, Filing.document_url, Filing.filed_date).filter(
+            Filing.company_id == company_id,
             Filing.form_type == "DEF 14A",
         ).order_by(Filing.filed_date.desc()).first()
 
-        # If not in DB, fetch from EDGAR directly
+    async def discover(company: CompanyRef) -> Optional[CompWork]:
+        with session_scope() as db:
+            filing = latest_proxy(db, company.id)
+            pending = filing is not None and _proxy_pending(db, company.id, filing)
+
         if not filing:
-            try:
-                edgar_filings = await edgar.get_company_filings(
-                    cik=company.cik, form_types=["DEF 14A"], limit=1,
-                )
-                if not edgar_filings:
-                    continue
-                ef = edgar_filings[0]
-                existing_filing = db.query(Filing).filter(
-                    Filing.accession_number == ef.accession_number
-                ).first()
-                if existing_filing:
-                    filing = existing_filing
-                else:
-                    filing = Filing(
-                        company_id=company.id,
-                        accession_number=ef.accession_number,
-                        form_type=ef.form_type,
-                        filed_date=ef.filed_date,
-                        document_url=ef.document_url,
-                    )
-                    db.add(filing)
-                    db.commit()
-                    db.refresh(filing)
-                await asyncio.sleep(0.5)
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Exec comp: failed to fetch DEF 14A for {company.ticker}: {e}")
-                continue
+            logger.info(f"No DEF 14A in DB for {company.ticker}, fetching from EDGAR...")
+            await sec_limiter().acquire()
+            edgar_filings = await edgar.get_company_filings(
+                cik=company.cik, form_types=["DEF 14A"], limit=1,
+            )
+            if not edgar_filings:
+                logger.info(f"No DEF 14A found on EDGAR for {company.ticker}")
+                return None
+            ef = edgar_filings[0]
+            with session_scope() as db:
+                inserted = insert_filings(db, [{
+                    "company_id": company.id,
+                    "accession_number": ef.accession_number,
+                    "form_type": ef.form_type,
+                    "filed_date": ef.filed_date,
+                    "document_url": ef.document_url,
+                }])
+                filing = latest_proxy(db, company.id)
+                pending = _proxy_pending(db, company.id, filing)
+            if inserted:
+                logger.info(f"Fetched DEF 14A for {company.ticker} filed {ef.filed_date}")
 
-        try:
-            logger.info(f"Exec comp: extracting for {company.ticker}")
-            text = await summarizer.fetch_compensation_section(filing.document_url)
-            comp_data = summarizer.extract_executive_compensation(company.name, text)
+        if not pending:
+            results["skipped"] += 1
+            return None
+        return CompWork(
+            company=company,
+            filing_id=filing.id,
+            accession_number=filing.accession_number,
+            document_url=filing.document_url,
+            filed_date=filing.filed_date,
+        )
+
+    async def fetch(work: CompWork) -> CompWork:
+        await sec_limiter().acquire()
+        work.html = await summarizer.fetch_filing_html(work.document_url)
+        return work
+
+    async def clean(work: CompWork) -> CompWork:
+        work.text = await asyncio.to_thread(summarizer.extract_compensation_section, work.html)
+        work.html = None
+        return work
 
-            for entry in comp_data:
-                if not entry.get("name"):
-                    continue
+    async def summarize(work: CompWork) -> CompWork:
+        logger.info(f"Extracting exec comp for {work.company.ticker} from filing {work.filing_id}")
+        work.entries = await asyncio.to_thread(
+            summarizer.extract_executive_compensation, work.company.name, work.text
+        )
+        return work
+
+    async def persist(work: CompWork) -> CompWork:
+        entries = [entry for entry in work.entries if entry.get("name")]
+        with session_scope() as db:
+            for entry in entries:
                 db.add(ExecutiveCompensation(
-                    filing_id=filing.id,
-                    company_id=company.id,
+                    filing_id=work.filing_id,
+                    company_id=work.company.id,
                     executive_name=entry["name"],
                     position=entry.get("position"),
                     total_compensation=entry.get("total_compensation"),
@@ -202,16 +571,84 @@ async def _sync_exec_comp(db, companies):
                     option_awards=entry.get("option_awards"),
                     other_compensation=entry.get("other_compensation"),
                     fiscal_year=entry.get("fiscal_year"),
-                    filed_date=filing.filed_date,
+                    filed_date=work.filed_date,
                 ))
+            _record_comp_attempt(db, work, "extracted" if entries else "empty")
+            if entries:
+                mark_changed(db, [work.company.ticker])
+        results["extracted"] += len(entries)
+        logger.info(f"Extracted {len(entries)} executives for {work.company.ticker}")
+        return work
+
+    report_error = _on_stage_error(results)
+
+    def on_error(stage: str, item, e: Exception) -> None:
+        report_error(stage, item, e)
+        if not isinstance(item, CompWork):
+            return
+        try:
+            with session_scope() as db:
+                _record_comp_attempt(db, item, "failed", f"{stage}: {e}")
+        except Exception as record_error:
+            logger.error(f"Could not record exec comp failure for {item.accession_number}: {record_error}")
+
+    settings = get_settings()
+    pipeline = Pipeline(
+        [
+            Stage("discover", discover),
+            Stage("fetch", fetch, concurrency=settings.sync_fetch_concurrency),
+            Stage("clean", clean, concurrency=settings.sync_clean_concurrency),
+            Stage("summarize", summarize, rate_limiter=groq_limiter()),
+            Stage("persist", persist),
+        ],
+        on_error=on_error,
+        name="exec-comp",
+    )
+    await pipeline.run(companies)
+    return pipeline
+
 
-            db.commit()
-            extracted += len(comp_data)
-            await asyncio.sleep(5)  # Rate limit Groq
+async def sync_companies(
+    companies: List[CompanyRef],
+    state: dict,
+    *,
+    limit: int,
+    since_date: Optional[date] = None,
+    incremental: bool = False,
+) -> dict:
+    """Filings, press releases and exec comp for a batch of companies.
 
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Exec comp: extraction failed for {company.ticker}: {e}")
+    Filing and news pipelines run side by side; exec comp extraction follows
+    because it reuses DEF 14A filings the filing pipeline just stored. An
+    incremental sync extracts only for companies that got a new DEF 14A in
+    this run or have a failed extraction due a retry, so a round with no new
+    proxies costs no EDGAR lookups or LLM calls.
+    """
+    await asyncio.gather(
+        sync_filings(
+            companies,
+            state,
+            limit=limit,
+            since_date=since_date,
+            incremental=incremental,
+        ),
+        sync_news(companies, state),
+    )
 
-    if extracted:
-        logger.info(f"Exec comp sync: extracted {extracted} entries")
+    comp_companies = companies
+    if incremental:
+        with session_scope() as db:
+            retries = _comp_retries_due(db, [c.id for c in companies])
+        comp_companies = [c for c in companies if c.id in state["new_proxies"] or c.id in retries]
+        if not comp_companies:
+            return state
+
+    state["message"] = "Extracting executive compensation..."
+    comp_results = {"extracted": 0, "skipped": 0, "errors": state["errors"]}
+    try:
+        await extract_exec_comp(comp_companies, comp_results)
+        if comp_results["extracted"]:
+            logger.info(f"Exec comp sync: extracted {comp_results['extracted']} entries")
+    except Exception as e:
+        logger.error(f"Exec comp sync failed: {e}")
+    return state
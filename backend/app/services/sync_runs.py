@@ -0,0 +1,344 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, exists, func, insert, or_, update
+from sqlalchemy.orm import Session
+
+from ..models import Company, SyncRun, SyncTask
+from .ingest import insert_ignoring_conflicts
+from .sync import CompanyRef
+from .sync_tiers import record_sync_attempts
+
+
+@dataclass
+class ClaimedTasks:
+    """A replica's share of a sync run: the run's parameters plus the companies it leased."""
+
+    run_id: int
+    label: str
+    filing_limit: int
+    since_date: Optional[date]
+    incremental: bool
+    owner: str
+    task_ids: Dict[int, int] = field(default_factory=dict)  # company id -> task id
+    companies: List[CompanyRef] = field(default_factory=list)
+
+
+def start_run(
+    db: Session,
+    label: str,
+    *,
+    limit: int,
+    since_date: Optional[date] = None,
+    incremental: bool = False,
+    company_ids: Optional[List[int]] = None,
+) -> Optional[int]:
+    """Create a run with one pending task per company (default: every tracked company).
+
+    Returns None if a run is already in progress, on this or any other replica.
+    Does not commit.
+    """
+    inserted = insert_ignoring_conflicts(db, SyncRun, "active_key", [{
+        "active_key": "active",
+        "label": label,
+        "status": "running",
+        "filing_limit": limit,
+        "since_date": since_date,
+        "incremental": incremental,
+        "fetched": 0,
+        "skipped": 0,
+        "pr_fetched": 0,
+        "started_at": datetime.utcnow(),
+    }])
+    if not inserted:
+        return None
+    run_id = inserted["active"]
+
+    if company_ids is None:
+        company_ids = [company_id for (company_id,) in db.query(Company.id).all()]
+    if company_ids:
+        db.execute(insert(SyncTask), [
+            {"run_id": run_id, "company_id": company_id, "status": "pending", "attempts": 0}
+            for company_id in company_ids
+        ])
+    return run_id
+
+
+def _claimable(now: datetime, max_attempts: int):
+    return and_(
+        SyncTask.attempts < max_attempts,
+        or_(
+            SyncTask.status == "pending",
+            # The replica working on it died; its lease has run out
+            and_(SyncTask.status == "running", SyncTask.lease_expires_at < now),
+        ),
+    )
+
+
+def claim_tasks(
+    db: Session,
+    owner: str,
+    limit: int,
+    lease_seconds: int,
+    max_attempts: int,
+) -> Optional[ClaimedTasks]:
+    """Lease up to `limit` companies of the running sync to `owner`.
+
+    Same claim pattern as the summary queue: FOR UPDATE SKIP LOCKED lets
+    PostgreSQL replicas pick disjoint rows, and the conditional UPDATE keeps
+    SQLite (which ignores the lock clause) from double-claiming.
+    """
+    run = db.query(SyncRun).filter(SyncRun.status == "running").order_by(SyncRun.id).first()
+    if run is None:
+        return None
+    now = datetime.utcnow()
+
+    db.execute(
+        update(SyncTask)
+        .where(
+            SyncTask.run_id == run.id,
+            SyncTask.status == "running",
+            SyncTask.lease_expires_at < now,
+            SyncTask.attempts >= max_attempts,
+        )
+        .values(status="failed", lease_owner=None, errors="Lease expired on final attempt")
+    )
+
+    candidates = (
+        db.query(SyncTask.id)
+        .filter(SyncTask.run_id == run.id, _claimable(now, max_attempts))
+        .order_by(SyncTask.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    claimed = []
+    for (task_id,) in candidates:
+        result = db.execute(
+            update(SyncTask)
+            .where(SyncTask.id == task_id, _claimable(now, max_attempts))
+            .values(
+                status="running",
+                attempts=SyncTask.attempts + 1,
+                lease_owner=owner,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+            )
+        )
+        if result.rowcount:
+            claimed.append(task_id)
+
+    tasks = ClaimedTasks(
+        run_id=run.id,
+        label=run.label,
+        filing_limit=run.filing_limit,
+        since_date=run.since_date,
+        incremental=run.incremental,
+        owner=owner,
+    )
+    if not claimed:
+        return tasks
+
+    rows = (
+        db.query(SyncTask.id, Company.id, Company.ticker, Company.name, Company.cik)
+        .join(Company, SyncTask.company_id == Company.id)
+        .filter(SyncTask.id.in_(claimed))
+        .all()
+    )
+    for task_id, *company in rows:
+        ref = CompanyRef(*company)
+        tasks.task_ids[ref.id] = task_id
+        tasks.companies.append(ref)
+
+    db.execute(
+        update(SyncRun)
+        .where(SyncRun.id == run.id)
+        .values(current=", ".join(c.ticker for c in tasks.companies))
+    )
+    return tasks
+
+
+def _errors_by_company(tasks: ClaimedTasks, errors: List[str]) -> Dict[int, List[str]]:
+    # Sync errors are prefixed with the ticker; anything else goes on the first task
+    by_ticker = {c.ticker: c.id for c in tasks.companies}
+    grouped: Dict[int, List[str]] = {c.id: [] for c in tasks.companies}
+    for error in errors:
+        company_id = by_ticker.get(error.split(" ", 1)[0], tasks.companies[0].id)
+        grouped[company_id].append(error)
+    return grouped
+
+
+def _lease_held(tasks: ClaimedTasks, company_id: int, now: datetime):
+    # Once a lease runs out the task may be claimed by another replica, or failed
+    return and_(
+        SyncTask.id == tasks.task_ids[company_id],
+        SyncTask.status == "running",
+        SyncTask.lease_owner == tasks.owner,
+        SyncTask.lease_expires_at >= now,
+    )
+
+
+def renew_tasks(db: Session, tasks: ClaimedTasks, lease_seconds: int) -> int:
+    """Extend the leases `tasks.owner` still holds on the batch. Does not commit. Returns how many were renewed."""
+    now = datetime.utcnow()
+    result = db.execute(
+        update(SyncTask)
+        .where(
+            SyncTask.id.in_(list(tasks.task_ids.values())),
+            SyncTask.status == "running",
+            SyncTask.lease_owner == tasks.owner,
+            SyncTask.lease_expires_at >= now,
+        )
+        .values(lease_expires_at=now + timedelta(seconds=lease_seconds))
+    )
+    return result.rowcount
+
+
+def complete_tasks(db: Session, tasks: ClaimedTasks, state: dict) -> List[int]:
+    """Record a finished batch: task statuses, errors and the run's counters. Does not commit.
+
+    Only tasks whose lease is still held are written, and only their
+    companies' counts are added to the run. Returns the company ids whose
+    lease was lost; whoever holds them now records their outcome.
+    """
+    now = datetime.utcnow()
+    outcomes: Dict[int, bool] = {}
+    lost = []
+    for company_id, errors in _errors_by_company(tasks, state["errors"]).items():
+        result = db.execute(
+            update(SyncTask)
+            .where(_lease_held(tasks, company_id, now))
+            .values(
+                status="done",
+                completed_at=now,
+                lease_owner=None,
+                lease_expires_at=None,
+                errors="\n".join(errors) or None,
+            )
+        )
+        if result.rowcount:
+            outcomes[company_id] = not errors
+        else:
+            lost.append(company_id)
+    record_sync_attempts(db, outcomes, now)
+    if not outcomes:
+        return lost
+    # Only companies still held: whoever reclaimed the others counts them
+    totals = {key: 0 for key in ("fetched", "skipped", "pr_fetched")}
+    for company_id in outcomes:
+        for key, count in state["company_counts"].get(company_id, {}).items():
+            totals[key] += count
+    # Increment in SQL so replicas finishing at the same time don't overwrite each other
+    db.execute(
+        update(SyncRun)
+        .where(SyncRun.id == tasks.run_id)
+        .values(
+            fetched=SyncRun.fetched + totals["fetched"],
+            skipped=SyncRun.skipped + totals["skipped"],
+            pr_fetched=SyncRun.pr_fetched + totals["pr_fetched"],
+        )
+    )
+    return lost
+
+
+def release_tasks(db: Session, tasks: ClaimedTasks, error: str, max_attempts: int) -> List[int]:
+    """Hand a batch that crashed back for another attempt, or fail it once attempts are used up.
+
+    Like complete_tasks, leaves tasks whose lease was lost alone and returns
+    their company ids. Does not commit.
+    """
+    now = datetime.utcnow()
+    released = {}
+    lost = []
+    for company_id in tasks.task_ids:
+        result = db.execute(
+            update(SyncTask)
+            .where(_lease_held(tasks, company_id, now))
+            .values(
+                status=case((SyncTask.attempts >= max_attempts, "failed"), else_="pending"),
+                lease_owner=None,
+                lease_expires_at=None,
+                errors=error,
+            )
+        )
+        if result.rowcount:
+            released[company_id] = False
+        else:
+            lost.append(company_id)
+    record_sync_attempts(db, released, now)
+    return lost
+
+
+def finish_runs(db: Session) -> int:
+    """Mark running syncs with no pending or running tasks as done. Does not commit."""
+    open_tasks = exists().where(
+        SyncTask.run_id == SyncRun.id,
+        SyncTask.status.in_(["pending", "running"]),
+    )
+    result = db.execute(
+        update(SyncRun)
+        .where(SyncRun.status == "running", ~open_tasks)
+        .values(status="done", active_key=None, current=None, completed_at=datetime.utcnow())
+    )
+    return result.rowcount
+
+
+def run_status(db: Session) -> dict:
+    """The latest sync run in the shape /sync-status has always returned."""
+    run = db.query(SyncRun).order_by(SyncRun.id.desc()).first()
+    if run is None:
+        return {
+            "running": False,
+            "fetched": 0,
+            "skipped": 0,
+            "pr_fetched": 0,
+            "errors": [],
+            "current": None,
+            "message": "No sync has run yet",
+            "started_at": None,
+            "completed_at": None,
+        }
+
+    counts = dict(
+        db.query(SyncTask.status, func.count(SyncTask.id))
+        .filter(SyncTask.run_id == run.id)
+        .group_by(SyncTask.status)
+        .all()
+    )
+    total = sum(counts.values())
+    finished = counts.get("done", 0) + counts.get("failed", 0)
+    errors = [
+        error
+        for (task_errors,) in db.query(SyncTask.errors).filter(
+            SyncTask.run_id == run.id, SyncTask.errors.isnot(None)
+        )
+        for error in task_errors.split("\n")
+    ]
+    workers = [
+        owner
+        for (owner,) in db.query(SyncTask.lease_owner).filter(
+            SyncTask.run_id == run.id, SyncTask.status == "running"
+        ).distinct()
+    ]
+
+    running = run.status == "running"
+    if running:
+        message = f"{run.label}: {finished}/{total} companies done"
+    else:
+        message = (
+            f"Done — {run.fetched} new filings, {run.skipped} already stored, "
+            f"{run.pr_fetched} press releases"
+        )
+    return {
+        "running": running,
+        "fetched": run.fetched,
+        "skipped": run.skipped,
+        "pr_fetched": run.pr_fetched,
+        "errors": errors,
+        "current": run.current if running else None,
+        "message": message,
+        "started_at": run.started_at.isoformat(),
+        "completed_at": run.completed_at.isoformat() if run.completed_at else None,
+        "companies": {"total": total, "finished": finished, **counts},
+        "workers": workers,
+    }
@@ -0,0 +1,172 @@
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from ..models import Company, CompanySyncAttempt, CompanySyncState, Filing, InterestLog, SyncRun, SyncTask, TickerTraffic
+from .ingest import insert_ignoring_conflicts
+
+
+@dataclass(frozen=True)
+class SyncTier:
+    name: str
+    interval: timedelta
+    min_score: float
+
+
+# Highest first; a company gets the first tier whose min_score it reaches
+SYNC_TIERS = (
+    SyncTier("hot", timedelta(minutes=10), 100),
+    SyncTier("warm", timedelta(hours=1), 20),
+    SyncTier("active", timedelta(hours=6), 5),
+    SyncTier("daily", timedelta(days=1), 0),
+)
+
+# Popularity score weights
+VIEW_WEIGHT = 1.0  # per page view in the last 7 days
+RECENT_VIEW_WEIGHT = 2.0  # extra per page view today
+INTEREST_WEIGHT = 5.0  # per InterestLog search in the last 30 days
+FILING_WEIGHT = 2.0  # per filing filed in the last 30 days
+
+# After a failed sync the next one waits the tier interval doubled per
+# consecutive failure, up to this
+MAX_FAILURE_BACKOFF = timedelta(days=7)
+
+
+@dataclass(frozen=True)
+class CompanyPriority:
+    company_id: int
+    ticker: str
+    score: float
+    tier: str
+    last_synced_at: Optional[datetime]
+    last_attempt_at: Optional[datetime]
+    consecutive_failures: int
+    due_at: datetime
+
+
+def tier_for(score: float) -> SyncTier:
+    for tier in SYNC_TIERS:
+        if score >= tier.min_score:
+            return tier
+    return SYNC_TIERS[-1]
+
+
+def next_due(tier: SyncTier, last_synced_at, last_attempt_at, consecutive_failures: int, now: datetime) -> datetime:
+    """When a company is next due: a tier interval after its last attempt, backing off while syncs fail."""
+    last = max((t for t in (last_synced_at, last_attempt_at) if t), default=None)
+    # Never-attempted companies are due immediately
+    if last is None:
+        return now
+    if not consecutive_failures:
+        return last + tier.interval
+    return last + min(tier.interval * 2 ** consecutive_failures, MAX_FAILURE_BACKOFF)
+
+
+def record_sync_attempts(db: Session, outcomes: Dict[int, bool], now: Optional[datetime] = None) -> None:
+    """Record a sync attempt per company id (True if it went without errors). Does not commit."""
+    if not outcomes:
+        return
+    now = now or datetime.utcnow()
+    insert_ignoring_conflicts(db, CompanySyncAttempt, "company_id", [
+        {"company_id": company_id, "last_attempt_at": now, "consecutive_failures": 0} for company_id in outcomes
+    ])
+    for succeeded in (True, False):
+        company_ids = [company_id for company_id, ok in outcomes.items() if ok is succeeded]
+        if not company_ids:
+            continue
+        db.execute(
+            update(CompanySyncAttempt)
+            .where(CompanySyncAttempt.company_id.in_(company_ids))
+            .values(
+                last_attempt_at=now,
+                consecutive_failures=0 if succeeded else CompanySyncAttempt.consecutive_failures + 1,
+            )
+        )
+
+
+def popularity_scores(db: Session, today: date) -> Dict[str, float]:
+    """Score tickers by page views, interest searches and filing velocity."""
+    scores: Counter = Counter()
+
+    for ticker, day, views in db.query(TickerTraffic.ticker, TickerTraffic.day, TickerTraffic.views).filter(
+        TickerTraffic.day >= today - timedelta(days=7)
+    ):
+        scores[ticker] += views * VIEW_WEIGHT
+        if day == today:
+            scores[ticker] += views * RECENT_VIEW_WEIGHT
+
+    interest = (
+        db.query(func.upper(InterestLog.ticker), func.count(InterestLog.id))
+        .filter(InterestLog.searched_at >= datetime.combine(today - timedelta(days=30), datetime.min.time()))
+        .group_by(func.upper(InterestLog.ticker))
+    )
+    for ticker, count in interest:
+        scores[ticker] += count * INTEREST_WEIGHT
+
+    velocity = (
+        db.query(Company.ticker, func.count(Filing.id))
+        .join(Filing, Filing.company_id == Company.id)
+        .filter(Filing.filed_date >= today - timedelta(days=30))
+        .group_by(Company.ticker)
+    )
+    for ticker, count in velocity:
+        scores[ticker] += count * FILING_WEIGHT
+
+    return scores
+
+
+def company_priorities(db: Session, now: Optional[datetime] = None) -> List[CompanyPriority]:
+    """Every tracked company with its tier and next due time, most overdue and popular first."""
+    now = now or datetime.utcnow()
+    scores = popularity_scores(db, now.date())
+    rows = (
+        db.query(
+            Company.id,
+            Company.ticker,
+            CompanySyncState.last_success_at,
+            CompanySyncAttempt.last_attempt_at,
+            CompanySyncAttempt.consecutive_failures,
+        )
+        .outerjoin(CompanySyncState, CompanySyncState.company_id == Company.id)
+        .outerjoin(CompanySyncAttempt, CompanySyncAttempt.company_id == Company.id)
+        .all()
+    )
+
+    priorities = []
+    for company_id, ticker, last_synced_at, last_attempt_at, failures in rows:
+        score = scores.get(ticker, 0.0)
+        tier = tier_for(score)
+        priorities.append(CompanyPriority(
+            company_id=company_id,
+            ticker=ticker,
+            score=round(score, 1),
+            tier=tier.name,
+            last_synced_at=last_synced_at,
+            last_attempt_at=last_attempt_at,
+            consecutive_failures=failures or 0,
+            due_at=next_due(tier, last_synced_at, last_attempt_at, failures or 0, now),
+        ))
+    priorities.sort(key=lambda p: (p.due_at > now, -p.score, p.due_at))
+    return priorities
+
+
+def synced_last_hour(db: Session, now: datetime) -> int:
+    """Company syncs scheduled in the last hour, counted against the hourly budget."""
+    return (
+        db.query(func.count(SyncTask.id))
+        .join(SyncRun, SyncTask.run_id == SyncRun.id)
+        .filter(SyncRun.started_at >= now - timedelta(hours=1))
+        .scalar()
+    )
+
+
+def due_companies(db: Session, budget_per_hour: int, now: Optional[datetime] = None) -> List[CompanyPriority]:
+    """Companies whose tier interval (or failure backoff) has elapsed, hottest first, capped by what is left of the budget."""
+    now = now or datetime.utcnow()
+    remaining = max(budget_per_hour - synced_last_hour(db, now), 0)
+    due = [p for p in company_priorities(db, now) if p.due_at <= now]
+    return due[:remaining]
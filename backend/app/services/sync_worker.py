@@ -0,0 +1,250 @@
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+
+from ..config import get_settings
+from ..database import session_scope
+from ..models import Company
+from .leases import PROCESS_ID, acquire_lease, release_lease
+from .prices import NEW_YORK, is_trading_day, warm_price_store
+from .sync import new_sync_state, sync_companies
+from .sync_runs import (
+    ClaimedTasks,
+    claim_tasks,
+    complete_tasks,
+    finish_runs,
+    release_tasks,
+    renew_tasks,
+    start_run,
+)
+from .sync_tiers import due_companies
+from .traffic import traffic
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_LEASE = "sync-scheduler"
+
+
+class SyncWorker:
+    """Takes part in whichever sync run is in progress, on every replica.
+
+    A run is a set of per-company tasks in the database. Each replica leases
+    a few companies at a time until none are left, so replicas split a sync
+    instead of repeating it. One replica also holds the scheduler lease and
+    is the only one that schedules syncs.
+    """
+
+    def __init__(self):
+        self.owner = PROCESS_ID
+        self.is_leader = False
+        self._tasks: list[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._lead()), asyncio.create_task(self._work())]
+        logger.info(f"Sync worker started (owner {self.owner})")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.is_leader:
+            with session_scope() as db:
+                release_lease(db, SCHEDULER_LEASE, self.owner)
+            self.is_leader = False
+        logger.info("Sync worker stopped")
+
+    def wake(self) -> None:
+        """Look for sync work now instead of waiting for the next poll. Safe from any thread."""
+        if self._wake and self.running:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _lead(self) -> None:
+        settings = get_settings()
+        while True:
+            try:
+                with session_scope() as db:
+                    leader = acquire_lease(db, SCHEDULER_LEASE, self.owner, settings.sync_poll_seconds * 3)
+                if leader != self.is_leader:
+                    logger.info(f"Scheduler lease {'acquired' if leader else 'lost'} by {self.owner}")
+                self.is_leader = leader
+            except Exception as e:
+                logger.error(f"Scheduler lease renewal failed: {e}")
+            await asyncio.sleep(settings.sync_poll_seconds)
+
+    async def _work(self) -> None:
+        settings = get_settings()
+        while True:
+            try:
+                while await self._claim_and_sync():
+                    pass
+            except Exception as e:
+                logger.error(f"Sync worker failed: {e}")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.sync_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim_and_sync(self) -> bool:
+        """Sync one leased batch of companies. False when there is nothing left to claim."""
+        settings = get_settings()
+        with session_scope() as db:
+            tasks = claim_tasks(
+                db,
+                self.owner,
+                limit=settings.sync_batch_companies,
+                lease_seconds=settings.sync_lease_seconds,
+                max_attempts=settings.sync_max_attempts,
+            )
+            if tasks is not None and not tasks.companies:
+                # Other replicas may still be working; the last one to finish closes the run
+                finish_runs(db)
+        if not tasks or not tasks.companies:
+            return False
+
+        await self._sync(tasks)
+        return True
+
+    async def _heartbeat(self, tasks: ClaimedTasks) -> None:
+        """Keep the batch's leases from running out while it syncs, like _lead does for the scheduler lease."""
+        settings = get_settings()
+        while True:
+            await asyncio.sleep(settings.sync_lease_seconds / 3)
+            try:
+                with session_scope() as db:
+                    renewed = renew_tasks(db, tasks, settings.sync_lease_seconds)
+                if renewed < len(tasks.task_ids):
+                    logger.warning(f"{tasks.label}: renewed {renewed} of {len(tasks.task_ids)} task leases")
+            except Exception as e:
+                logger.error(f"Sync task lease renewal failed: {e}")
+
+    async def _sync(self, tasks: ClaimedTasks) -> None:
+        tickers = ", ".join(c.ticker for c in tasks.companies)
+        logger.info(f"{tasks.label}: syncing {tickers}")
+        state = new_sync_state()
+        heartbeat = asyncio.create_task(self._heartbeat(tasks))
+        try:
+            await sync_companies(
+                tasks.companies,
+                state,
+                limit=tasks.filing_limit,
+                since_date=tasks.since_date,
+                incremental=tasks.incremental,
+            )
+        except Exception as e:
+            logger.error(f"{tasks.label} failed for {tickers}: {e}")
+            with session_scope() as db:
+                lost = release_tasks(db, tasks, str(e), get_settings().sync_max_attempts)
+                finish_runs(db)
+            self._log_lost(tasks, lost)
+            return
+        finally:
+            heartbeat.cancel()
+
+        with session_scope() as db:
+            lost = complete_tasks(db, tasks, state)
+            if finish_runs(db):
+                logger.info(f"{tasks.label} complete")
+        self._log_lost(tasks, lost)
+        logger.info(
+            f"{tasks.label}: {tickers} done — {state['fetched']} new filings, "
+            f"{state['skipped']} already stored, {state['pr_fetched']} press releases"
+        )
+
+    @staticmethod
+    def _log_lost(tasks: ClaimedTasks, lost: List[int]) -> None:
+        if lost:
+            tickers = ", ".join(c.ticker for c in tasks.companies if c.id in lost)
+            logger.warning(f"{tasks.label}: lease lost for {tickers}, their outcome was not recorded")
+
+
+sync_worker = SyncWorker()
+
+
+def start_sync(
+    label: str,
+    *,
+    limit: int,
+    since_date=None,
+    incremental: bool = False,
+    company_ids: Optional[List[int]] = None,
+) -> Optional[int]:
+    """Start a sync run that all replicas work on. None if one is already running."""
+    with session_scope() as db:
+        run_id = start_run(
+            db,
+            label,
+            limit=limit,
+            since_date=since_date,
+            incremental=incremental,
+            company_ids=company_ids,
+        )
+    if run_id is not None:
+        sync_worker.wake()
+    return run_id
+
+
+async def sync_due_companies():
+    """Scheduler job: sync companies whose popularity tier says they are due.
+
+    It fires on every replica, but only the scheduler lease holder starts the
+    run; the others pick up their share through their SyncWorker.
+    """
+    settings = get_settings()
+    with session_scope() as db:
+        leader = acquire_lease(db, SCHEDULER_LEASE, PROCESS_ID, settings.sync_poll_seconds * 3)
+        due = due_companies(db, settings.sync_budget_per_hour) if leader else []
+    if not leader or not due:
+        return
+
+    tiers = Counter(p.tier for p in due)
+    run_id = start_sync(
+        "Scheduled sync",
+        limit=20,
+        incremental=True,
+        company_ids=[p.company_id for p in due],
+    )
+    if run_id is None:
+        logger.info("Scheduled sync: a sync is already running, skipping")
+        return
+    logger.info(
+        f"Scheduled sync: {len(due)} companies due "
+        f"({', '.join(f'{count} {tier}' for tier, count in tiers.items())})"
+    )
+
+
+def flush_traffic():
+    """Scheduler job: persist this replica's ticker view counts."""
+    with session_scope() as db:
+        traffic.flush(db)
+
+
+async def warm_prices():
+    """Scheduler job: after the close, top up the price store for every tracked company.
+
+    Like scheduled syncs, only the scheduler lease holder runs it; the
+    candles land in the shared database for every replica.
+    """
+    if not is_trading_day(datetime.now(NEW_YORK).date()):
+        return
+    settings = get_settings()
+    with session_scope() as db:
+        leader = acquire_lease(db, SCHEDULER_LEASE, PROCESS_ID, settings.sync_poll_seconds * 3)
+        tickers = [ticker for (ticker,) in db.query(Company.ticker).order_by(Company.ticker)] if leader else []
+    if not tickers:
+        return
+    refreshed = await asyncio.to_thread(warm_price_store, tickers)
+    logger.info(f"Price store: refreshed {refreshed} of {len(tickers)} tickers")
@@ -0,0 +1,357 @@
+import base64
+import binascii
+import heapq
+import json
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from datetime import date
+from itertools import islice
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Date, String, case, cast, delete, exists, func, insert, literal, select, tuple_, union_all, update
+from sqlalchemy.orm import Session
+
+from ..models import Company, Filing, PressRelease, TimelineEntry
+from .response_cache import mark_companies_changed
+
+FILING = "filing"
+PRESS_RELEASE = "press_release"
+EVENT_TYPES = (FILING, PRESS_RELEASE)
+
+FORM_DESCRIPTIONS = {
+    "10-K": "Annual Report",
+    "10-Q": "Quarterly Report",
+    "8-K": "Current Report",
+    "4": "Insider Trading",
+    "S-1": "IPO Registration",
+    "DEF 14A": "Proxy Statement",
+    "SC 13G": "Ownership Report",
+    "SC 13D": "Ownership Report",
+}
+PRESS_RELEASE_FORM_TYPE = "PR"
+PRESS_RELEASE_DESCRIPTION = "News"
+
+COUNT_EXACT = "exact"
+COUNT_APPROX = "approx"
+COUNT_NONE = "none"
+# count=approx stops counting here
+APPROX_COUNT_CAP = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def get_form_description(form_type: str) -> str:
+    return FORM_DESCRIPTIONS.get(form_type, form_type)
+
+
+@dataclass(frozen=True)
+class TimelineCursor:
+    """Position after the last event of a page, in (date, event type, id) descending order."""
+
+    event_date: date
+    event_type: str
+    id: int
+
+    def encode(self) -> str:
+        raw = json.dumps([self.event_date.isoformat(), self.event_type, self.id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "TimelineCursor":
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            event_date, event_type, id = json.loads(raw)
+            cursor = cls(date.fromisoformat(event_date), event_type, int(id))
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+            raise InvalidCursor(f"Invalid cursor: {e}") from e
+        if cursor.event_type not in EVENT_TYPES:
+            raise InvalidCursor(f"Invalid cursor event type: {cursor.event_type}")
+        return cursor
+
+
+@dataclass(frozen=True)
+class TimelineFilters:
+    ticker: Optional[str] = None
+    tickers: Optional[Tuple[str, ...]] = None  # watchlist: any of these (upper case)
+    form_type: Optional[str] = None  # "PR" selects press releases
+    exclude_form_types: Optional[List[str]] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+def _filtered(query, filters: TimelineFilters):
+    if filters.ticker:
+        query = query.where(TimelineEntry.ticker == filters.ticker.upper())
+    if filters.tickers:
+        query = query.where(TimelineEntry.ticker.in_(filters.tickers))
+    if filters.form_type:
+        query = query.where(TimelineEntry.form_type == filters.form_type)
+    if filters.exclude_form_types:
+        query = query.where(TimelineEntry.form_type.notin_(filters.exclude_form_types))
+    if filters.start_date:
+        query = query.where(TimelineEntry.event_date >= filters.start_date)
+    if filters.end_date:
+        query = query.where(TimelineEntry.event_date <= filters.end_date)
+    return query
+
+
+def _order_key():
+    return tuple_(TimelineEntry.event_date, TimelineEntry.event_type, TimelineEntry.source_id)
+
+
+def _page_query(filters: TimelineFilters, limit: int, cursor: Optional[TimelineCursor]):
+    query = _filtered(
+        select(
+            TimelineEntry.source_id.label("id"),
+            TimelineEntry.ticker,
+            TimelineEntry.company_name,
+            TimelineEntry.form_type,
+            TimelineEntry.form_type_description,
+            TimelineEntry.event_date,
+            TimelineEntry.headline,
+            TimelineEntry.document_url,
+            TimelineEntry.event_type,
+        ),
+        filters,
+    )
+    if cursor:
+        query = query.where(_order_key() < tuple_(
+            literal(cursor.event_date, Date), literal(cursor.event_type), literal(cursor.id),
+        ))
+    return query.order_by(
+        TimelineEntry.event_date.desc(),
+        TimelineEntry.event_type.desc(),
+        TimelineEntry.source_id.desc(),
+    ).limit(limit)
+
+
+def _event_key(row):
+    return row.event_date, row.event_type, row.id
+
+
+def _merged_rows(db: Session, filters: TimelineFilters, limit: int, cursor: Optional[TimelineCursor]) -> list:
+    """First `limit` events across `filters.tickers`, newest first.
+
+    Each ticker contributes at most `limit` events from a range scan over
+    ix_timeline_events_ticker_order (one UNION ALL round trip); the runs are
+    combined with a k-way heap merge, so only O(limit * log k) comparisons
+    happen instead of a sort over everything the tickers ever filed.
+    """
+    branches = [
+        _page_query(replace(filters, ticker=ticker, tickers=None), limit, cursor).subquery().select()
+        for ticker in filters.tickers
+    ]
+    runs = defaultdict(list)
+    for row in db.execute(union_all(*branches)).all():
+        runs[row.ticker].append(row)
+    # UNION ALL does not promise to keep each branch's order; re-sorting an
+    # already ordered run is linear
+    ordered = [sorted(run, key=_event_key, reverse=True) for run in runs.values()]
+    return list(islice(heapq.merge(*ordered, key=_event_key, reverse=True), limit))
+
+
+def timeline_page(
+    db: Session,
+    filters: TimelineFilters,
+    limit: int,
+    cursor: Optional[TimelineCursor] = None,
+) -> Tuple[list, Optional[TimelineCursor]]:
+    """The next `limit` events after `cursor`, and the cursor for the page after.
+
+    A range scan over one of the timeline_events order indexes: the cursor is
+    a row-value seek, so a page costs the same however deep it is. Watchlists
+    (`filters.tickers`) scan each ticker's index and merge the results.
+    """
+    if filters.tickers and len(filters.tickers) > 1:
+        rows = _merged_rows(db, filters, limit + 1, cursor)
+    else:
+        rows = db.execute(_page_query(filters, limit + 1, cursor)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, TimelineCursor(last.event_date, last.event_type, last.id)
+
+
+def timeline_total(db: Session, filters: TimelineFilters, mode: str = COUNT_EXACT) -> Tuple[Optional[int], bool]:
+    """Number of matching events and whether it is exact.
+
+    `approx` stops counting at APPROX_COUNT_CAP rows; `none` skips counting.
+    """
+    if mode == COUNT_NONE:
+        return None, False
+    query = _filtered(select(TimelineEntry.id), filters)
+    if mode == COUNT_APPROX:
+        query = query.limit(APPROX_COUNT_CAP + 1)
+    count = db.execute(select(func.count()).select_from(query.subquery())).scalar()
+    if mode == COUNT_APPROX and count > APPROX_COUNT_CAP:
+        return APPROX_COUNT_CAP, False
+    return count, True
+
+
+def timeline_facets(db: Session, filters: TimelineFilters) -> dict:
+    """TimelineFacetsResponse as plain dicts: one GROUP BY per facet.
+
+    A facet is counted without its own filter, so its counts are what picking
+    a different value for it would return.
+    """
+    count = func.count().label("count")
+
+    by_form = _filtered(
+        select(TimelineEntry.form_type, TimelineEntry.form_type_description, count),
+        replace(filters, form_type=None, exclude_form_types=None),
+    ).group_by(TimelineEntry.form_type, TimelineEntry.form_type_description)
+
+    # ISO dates on both SQLite (stored as text) and PostgreSQL (DateStyle ISO)
+    month = func.substr(cast(TimelineEntry.event_date, String), 1, 7).label("month")
+    by_month = _filtered(
+        select(month, count),
+        replace(filters, start_date=None, end_date=None),
+    ).group_by(month)
+
+    by_event_type = _filtered(select(TimelineEntry.event_type, count), filters).group_by(TimelineEntry.event_type)
+
+    form_types = {}
+    for form_type, description, n in db.execute(by_form):
+        # Descriptions only differ if FORM_DESCRIPTIONS changed since rows were written
+        facet = form_types.setdefault(form_type, {
+            "form_type": form_type, "form_type_description": description, "count": 0,
+        })
+        facet["count"] += n
+    event_types = [{"event_type": t, "count": n} for t, n in db.execute(by_event_type)]
+
+    return {
+        "total": sum(f["count"] for f in event_types),
+        "form_types": sorted(form_types.values(), key=lambda f: (-f["count"], f["form_type"])),
+        "months": [{"month": m, "count": n} for m, n in sorted(db.execute(by_month), reverse=True)],
+        "event_types": sorted(event_types, key=lambda f: f["event_type"]),
+    }
+
+
+def _companies(db: Session, company_ids) -> dict:
+    rows = db.query(Company.id, Company.ticker, Company.name).filter(Company.id.in_(set(company_ids)))
+    return {company_id: (ticker, name) for company_id, ticker, name in rows}
+
+
+def add_filing_entries(db: Session, filings: List[dict]) -> None:
+    """Mirror newly inserted filings (column dicts including "id"). Does not commit."""
+    if not filings:
+        return
+    companies = _companies(db, [f["company_id"] for f in filings])
+    db.execute(insert(TimelineEntry), [
+        {
+            "event_type": FILING,
+            "source_id": f["id"],
+            "company_id": f["company_id"],
+            "ticker": companies[f["company_id"]][0],
+            "company_name": companies[f["company_id"]][1],
+            "form_type": f["form_type"],
+            "form_type_description": get_form_description(f["form_type"]),
+            "event_date": f["filed_date"],
+            "headline": f.get("headline"),
+            "document_url": f["document_url"],
+        }
+        for f in filings
+    ])
+
+
+def add_press_release_entries(db: Session, press_releases: List[dict]) -> None:
+    """Mirror newly inserted press releases (column dicts including "id"). Does not commit."""
+    if not press_releases:
+        return
+    companies = _companies(db, [pr["company_id"] for pr in press_releases])
+    db.execute(insert(TimelineEntry), [
+        {
+            "event_type": PRESS_RELEASE,
+            "source_id": pr["id"],
+            "company_id": pr["company_id"],
+            "ticker": companies[pr["company_id"]][0],
+            "company_name": companies[pr["company_id"]][1],
+            "form_type": PRESS_RELEASE_FORM_TYPE,
+            "form_type_description": PRESS_RELEASE_DESCRIPTION,
+            "event_date": pr["published_at"].date(),
+            "headline": pr["headline"],
+            "document_url": pr["url"],
+        }
+        for pr in press_releases
+    ])
+
+
+def set_filing_headline(db: Session, filing_id: int, headline: Optional[str]) -> None:
+    db.execute(
+        update(TimelineEntry)
+        .where(TimelineEntry.event_type == FILING, TimelineEntry.source_id == filing_id)
+        .values(headline=headline)
+    )
+
+
+def delete_company_entries(db: Session, company_id: int) -> None:
+    db.execute(delete(TimelineEntry).where(TimelineEntry.company_id == company_id))
+
+
+def rebuild_timeline(db: Session, company_ids: Optional[List[int]] = None) -> int:
+    """Recreate timeline_events from filings and press releases with INSERT ... SELECT.
+
+    Limited to `company_ids` if given. Does not commit. Returns rows written.
+    """
+    clear = delete(TimelineEntry)
+    if company_ids:
+        clear = clear.where(TimelineEntry.company_id.in_(company_ids))
+    db.execute(clear)
+
+    filings = (
+        select(
+            literal(FILING),
+            Filing.id,
+            Filing.company_id,
+            Company.ticker,
+            Company.name,
+            Filing.form_type,
+            case(FORM_DESCRIPTIONS, value=Filing.form_type, else_=Filing.form_type),
+            Filing.filed_date,
+            Filing.headline,
+            Filing.document_url,
+        )
+        .join(Company, Filing.company_id == Company.id)
+    )
+    press_releases = (
+        select(
+            literal(PRESS_RELEASE),
+            PressRelease.id,
+            PressRelease.company_id,
+            Company.ticker,
+            Company.name,
+            literal(PRESS_RELEASE_FORM_TYPE),
+            literal(PRESS_RELEASE_DESCRIPTION),
+            # date() works on both SQLite and PostgreSQL
+            func.date(PressRelease.published_at, type_=Date),
+            PressRelease.headline,
+            PressRelease.url,
+        )
+        .join(Company, PressRelease.company_id == Company.id)
+    )
+    if company_ids:
+        filings = filings.where(Filing.company_id.in_(company_ids))
+        press_releases = press_releases.where(PressRelease.company_id.in_(company_ids))
+
+    columns = [
+        "event_type", "source_id", "company_id", "ticker", "company_name",
+        "form_type", "form_type_description", "event_date", "headline", "document_url",
+    ]
+    written = 0
+    for source in (filings, press_releases):
+        written += db.execute(insert(TimelineEntry).from_select(columns, source)).rowcount
+    mark_companies_changed(db, company_ids or [id for (id,) in db.query(Company.id)])
+    return written
+
+
+def ensure_timeline(db: Session) -> int:
+    """Build timeline_events on first start after upgrading; a no-op once it has rows."""
+    if db.query(exists().where(TimelineEntry.id.isnot(None))).scalar():
+        return 0
+    has_sources = db.query(exists().where(Filing.id.isnot(None))).scalar() or db.query(
+        exists().where(PressRelease.id.isnot(None))
+    ).scalar()
+    return rebuild_timeline(db) if has_sources else 0
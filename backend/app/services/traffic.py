@@ -0,0 +1,70 @@
+import threading
+from collections import Counter
+from datetime import date
+
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import Company, TickerTraffic
+
+
+class TrafficCounter:
+    """Counts ticker page views in memory; `flush` adds them to ticker_traffic.
+
+    Keeps a DB write off every request. Views recorded by a replica that dies
+    before its next flush are lost, which is fine for a popularity signal.
+    Views of tickers that aren't tracked companies (price lookups take any
+    symbol) are dropped at flush, so they neither grow the table nor skew tiers.
+    """
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()  # sync endpoints record from the threadpool
+
+    def record(self, ticker: str) -> None:
+        with self._lock:
+            self._counts[ticker.upper()] += 1
+
+    def flush(self, db: Session) -> int:
+        """Write pending counts for today. Does not commit. Returns the number of tickers written."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if counts:
+            tracked = {
+                ticker for (ticker,) in db.query(Company.ticker).filter(Company.ticker.in_(list(counts)))
+            }
+            counts = {ticker: views for ticker, views in counts.items() if ticker in tracked}
+        if not counts:
+            return 0
+
+        today = date.today()
+        rows = [{"ticker": ticker, "day": today, "views": views} for ticker, views in counts.items()]
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = dialect_insert(TickerTraffic).values(rows)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["ticker", "day"],
+                set_={"views": TickerTraffic.views + stmt.excluded.views},
+            ))
+            return len(rows)
+
+        # Other dialects: create the (ticker, day) row unless it exists, in a
+        # savepoint so a conflict only skips that insert, then add to it
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(TickerTraffic).values({**row, "views": 0}))
+            except IntegrityError:
+                pass
+            db.execute(
+                update(TickerTraffic)
+                .where(TickerTraffic.ticker == row["ticker"], TickerTraffic.day == today)
+                .values(views=TickerTraffic.views + row["views"])
+            )
+        return len(rows)
+
+
+traffic = TrafficCounter()
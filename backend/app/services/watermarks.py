@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from ..models import CompanySyncState
+from .ingest import insert_ignoring_conflicts
+
+
+@dataclass(frozen=True)
+class SyncWatermark:
+    last_accession_number: Optional[str]
+    submissions_last_modified: Optional[str]
+    last_news_at: Optional[datetime]
+    last_success_at: Optional[datetime]
+
+
+def load_sync_states(db: Session, company_ids: Iterable[int]) -> Dict[int, SyncWatermark]:
+    """Load watermarks for the given companies in one query, keyed by company id.
+
+    Returns plain snapshots so callers can close the session before awaiting.
+    """
+    ids = list(company_ids)
+    if not ids:
+        return {}
+    rows = db.query(CompanySyncState).filter(CompanySyncState.company_id.in_(ids)).all()
+    return {
+        row.company_id: SyncWatermark(
+            last_accession_number=row.last_accession_number,
+            submissions_last_modified=row.submissions_last_modified,
+            last_news_at=row.last_news_at,
+            last_success_at=row.last_success_at,
+        )
+        for row in rows
+    }
+
+
+def save_sync_states(db: Session, updates: Dict[int, dict]) -> None:
+    """Upsert watermark fields per company id. Does not commit.
+
+    Only the keys present in each update are written, so the filing and news
+    pipelines can each advance their own watermarks.
+    """
+    if not updates:
+        return
+    # Create missing rows race-free, then update only the given columns
+    insert_ignoring_conflicts(db, CompanySyncState, "company_id", [{"company_id": cid} for cid in updates])
+    for company_id, values in updates.items():
+        db.execute(
+            update(CompanySyncState)
+            .where(CompanySyncState.company_id == company_id)
+            .values(**values)
+        )
@@ -0,0 +1,34 @@
+"""List endpoints must run the same number of SQL statements however many rows they return.
+
+Seeds a fresh SQLite database with N and then 2N rows per table (the
+query_counts devtool's seed) and compares the statements each endpoint
+executes. A count that grows with the rows is an N+1.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp(prefix='query-counts-')) / 'counts.db'}"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.devtools.query_counts import ENDPOINTS, StatementLog, measure  # noqa: E402
+from app.main import app  # noqa: E402
+
+SIZE = 4
+
+
+@pytest.fixture(scope="module")
+def counts():
+    log = StatementLog(engine)
+    # Without the context manager the lifespan (scheduler, workers) does not start
+    client = TestClient(app)
+    return measure(client, log, SIZE, engine), measure(client, log, 2 * SIZE, engine)
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_statement_count_is_constant(counts, path):
+    small, large = counts
+    assert len(large[path]) == len(small[path]), "\n".join(large[path])